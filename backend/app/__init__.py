@@ -2,40 +2,78 @@ from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
+from app.utils.read_routing import RoutingSession
 
-# Initialize extensions
-db = SQLAlchemy()
+# Initialize extensions; the session routes GET reads to a replica when one is configured
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
 cors = CORS()
 
-def create_app(config_name='default'):
+def create_app(config_name='default', test_config=None):
     app = Flask(__name__)
     
     # Database configuration
     app.config['SECRET_KEY'] = 'cookeasy-working-2025-nowriafisda'
     app.config['JWT_SECRET_KEY'] = 'jwt-cookeasy-2025'
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = False
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///cookeasy.db'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     
+    # Engine settings (URL, pool, SQLite pragmas) come from config.py / the environment
+    from app.config import config
+    from app.utils.db_engine import load_database_settings, configure_engine_options, init_engines
+    from app.utils.read_routing import read_router
+    load_database_settings(app, config.get(config_name, config['default']))
+    
+    # Let tests override settings, e.g. point at an in-memory database
+    if test_config:
+        app.config.update(test_config)
+    
     # Initialize extensions with app
+    configure_engine_options(app)
     db.init_app(app)
+    init_engines(app, db)
+    read_router.init_app(app)
     jwt.init_app(app)
     cors.init_app(app, resources={
         r"/api/*": {
             "origins": ["http://localhost:3000", "http://127.0.0.1:3000"],
-            "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"]
+            "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+            "allow_headers": ["Content-Type", "Authorization", "If-Match"],
+            # PATCH answers carry the new recipe version only in ETag
+            "expose_headers": ["ETag"]
         }
     })
     
     # Import models to ensure they're registered
-    from app.models import User, Recipe, Category, Rating, Ingredient
+    from app import models
+    from app.services.view_counter import view_counter
+    from app.services.stats_service import stats_snapshot
+    from app.services import version_service  # registers the table version listeners
+    from app.utils.response_cache import response_cache
+    from app.utils.sql_instrumentation import sql_instrumentation
+    from app.utils.metrics import metrics
+    from app.services.auth_cache import auth_cache
+    from app.services.ingredient_resolver import ingredient_resolver
+    from app.services.password_service import password_service
+    from app.utils.limits import rate_limiter, load_shedder
     
-    # Create tables
-    with app.app_context():
-        db.create_all()
-        init_sample_data()
+    # Buffer recipe view counts and write them behind in batches
+    view_counter.init_app(app)
+    stats_snapshot.init_app(app)
+    response_cache.init_app(app)
+    sql_instrumentation.init_app(app)
+    metrics.init_app(app)
+    auth_cache.init_app(app)
+    ingredient_resolver.init_app(app)
+    password_service.init_app(app)
+    rate_limiter.init_app(app)
+    # Registered after metrics so shed requests still show up as 503s there
+    load_shedder.init_app(app)
+    
+    # No database I/O here: tables, search index and sample data are set up
+    # once with `flask bootstrap` / `flask seed` (see app/cli.py)
+    from app.cli import register_commands
+    register_commands(app)
     
     # Import and register routes
     from app.api.auth.routes import auth_bp
@@ -51,6 +89,9 @@ def create_app(config_name='default'):
 def init_sample_data():
     """Initialize database with sample data"""
     from app.models import User, Category, Recipe, Ingredient, Rating
+    from app.services.rating_service import RatingService
+    from app.services.search_service import SearchService
+    from app.services.slug_service import slugify
     from werkzeug.security import generate_password_hash
     
     # Check if data already exists
@@ -182,7 +223,7 @@ def init_sample_data():
     ]
     
     for recipe_data in recipes_data:
-        recipe_data['slug'] = recipe_data['title'].lower().replace(' ', '-').replace(',', '')
+        recipe_data['slug'] = slugify(recipe_data['title'])
         recipe_data['total_time'] = recipe_data['prep_time'] + recipe_data['cook_time']
         
         recipe = Recipe(**recipe_data)
@@ -202,6 +243,7 @@ def init_sample_data():
             is_verified=True
         )
         db.session.add(rating1)
+        RatingService.apply_rating_change(recipe.id, None, rating1.rating)
         
         # Rating from admin (if different recipe)
         if recipe.user_id != User.query.filter_by(username='admin').first().id:
@@ -214,6 +256,10 @@ def init_sample_data():
                 is_verified=False
             )
             db.session.add(rating2)
+            RatingService.apply_rating_change(recipe.id, None, rating2.rating)
     
     db.session.commit()
+    
+    # Index the sample recipes for full-text search
+    SearchService.rebuild_index()
     print("✅ Sample data initialized!")
\ No newline at end of file
@@ -1,10 +1,15 @@
-from flask import Blueprint, jsonify, request
+import gzip
+from datetime import datetime
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
-from app.models import User, Recipe, Category, Rating
+from app.models import User, Recipe, Category
 from app.utils.decorators import admin_required, role_required
-from datetime import datetime, timedelta
-from sqlalchemy import func, or_
+from app.services.stats_service import stats_snapshot
+from app.services.recipe_import import RecipeImporter, DEFAULT_CHUNK_SIZE
+from app.services.data_export import EXPORTS, EXPORT_FORMATS, export_rows, render, gzip_chunks, parse_export_date
+from app.utils.response_cache import response_cache, recipe_cache_tags
+from sqlalchemy import or_
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -14,42 +19,31 @@ admin_bp = Blueprint('admin', __name__)
 def get_dashboard_stats():
     """Get admin dashboard statistics"""
     try:
-        # Get basic counts
-        total_users = User.query.count()
-        total_recipes = Recipe.query.count()
-        total_categories = Category.query.count()
-        total_ratings = Rating.query.count()
+        # Served from the in-memory snapshot; as_of tells clients how fresh it is
+        counters, _, as_of = stats_snapshot.get()
         
-        # Get recent registrations (last 30 days)
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        recent_users = User.query.filter(User.created_at >= thirty_days_ago).count()
+        role_distribution = {
+            key.split(':', 1)[1]: count
+            for key, count in counters.items()
+            if key.startswith('role:') and count
+        }
         
-        # Get published recipes
-        published_recipes = Recipe.query.filter_by(is_published=True).count()
-        
-        # Get user role distribution
-        user_roles = db.session.query(
-            User.role, 
-            func.count(User.id).label('count')
-        ).group_by(User.role).all()
-        
-        role_distribution = {role: count for role, count in user_roles}
-        
-        # Get average rating
-        avg_rating = db.session.query(func.avg(Rating.rating)).scalar()
+        total_ratings = counters['ratings_total']
+        avg_rating = counters['ratings_sum'] / total_ratings if total_ratings else 0
         
         return jsonify({
             'message': 'Dashboard stats retrieved successfully',
             'stats': {
-                'total_users': total_users,
-                'total_recipes': total_recipes,
-                'total_categories': total_categories,
+                'total_users': counters['users_total'],
+                'total_recipes': counters['recipes_total'],
+                'total_categories': counters['categories_total'],
                 'total_ratings': total_ratings,
-                'published_recipes': published_recipes,
-                'recent_users': recent_users,
+                'published_recipes': counters['recipes_published'],
+                'recent_users': counters['users_recent'],
                 'role_distribution': role_distribution,
-                'average_rating': float(avg_rating) if avg_rating else 0
-            }
+                'average_rating': float(avg_rating)
+            },
+            'as_of': as_of.isoformat()
         }), 200
         
     except Exception as e:
@@ -126,6 +120,7 @@ def update_user_role(user_id):
         old_role = user.role
         user.role = new_role
         db.session.commit()
+        response_cache.evict(f'user:{user_id}')
         
         return jsonify({
             'message': f'User role updated from {old_role} to {new_role}',
@@ -151,6 +146,7 @@ def toggle_user_status(user_id):
         
         user.is_active = not user.is_active
         db.session.commit()
+        response_cache.evict(f'user:{user_id}')
         
         status = 'activated' if user.is_active else 'deactivated'
         
@@ -262,6 +258,7 @@ def toggle_recipe_featured(recipe_id):
         recipe = Recipe.query.get_or_404(recipe_id)
         recipe.is_featured = not recipe.is_featured
         db.session.commit()
+        response_cache.evict(*recipe_cache_tags(recipe))
         
         status = 'featured' if recipe.is_featured else 'unfeatured'
         
@@ -299,6 +296,7 @@ def create_category():
         
         db.session.add(category)
         db.session.commit()
+        response_cache.evict('categories')
         
         return jsonify({
             'message': 'Category created successfully',
@@ -329,6 +327,8 @@ def update_category(category_id):
             category.is_active = data['is_active']
         
         db.session.commit()
+        # Recipes embed their category's name
+        response_cache.evict('categories', f'category:{category_id}', 'recipe-list')
         
         return jsonify({
             'message': 'Category updated successfully',
@@ -338,3 +338,65 @@ def update_category(category_id):
     except Exception as e:
         db.session.rollback()
         return jsonify({'message': 'Failed to update category', 'error': str(e)}), 500
+
+@admin_bp.route('/recipes/import', methods=['POST'])
+@jwt_required()
+@admin_required
+def import_recipes():
+    """
+    Bulk-import recipes from an NDJSON body (one recipe per line, optionally
+    gzip Content-Encoding). The body is read line by line as it arrives.
+    Query: user_id (author of lines without "author", default the caller), chunk_size.
+    """
+    try:
+        user_id = request.args.get('user_id', type=int) or int(get_jwt_identity())
+        author = db.session.get(User, user_id)
+        if author is None:
+            return jsonify({'message': 'User not found'}), 404
+        # The same accounts a line's "author" may name
+        if author.role not in ('chef', 'admin'):
+            return jsonify({'message': 'Default author must be a chef or admin'}), 400
+        chunk_size = min(request.args.get('chunk_size', DEFAULT_CHUNK_SIZE, type=int), 5000)
+
+        stream = request.stream
+        if request.content_encoding == 'gzip':
+            stream = gzip.GzipFile(fileobj=stream)
+
+        report = RecipeImporter(user_id, chunk_size=chunk_size).run(stream)
+        return jsonify({'message': f"Imported {report['imported']} recipes", **report}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': 'Failed to import recipes', 'error': str(e)}), 500
+
+@admin_bp.route('/export/<entity>', methods=['GET'])
+@jwt_required()
+@admin_required
+def export_data(entity):
+    """
+    Stream recipes, users or ratings as NDJSON or CSV, read from the cursor in
+    batches. Query: format (ndjson|csv), gzip (1), since/until (ISO dates on
+    created_at, until exclusive), status (published|draft, recipes only).
+    """
+    if entity not in EXPORTS:
+        return jsonify({'message': f"Unknown export '{entity}'", 'exports': sorted(EXPORTS)}), 404
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'message': f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    try:
+        since = parse_export_date(request.args.get('since'))
+        until = parse_export_date(request.args.get('until'))
+    except ValueError:
+        return jsonify({'message': 'since and until must be ISO dates'}), 400
+    published = {'published': True, 'draft': False}.get(request.args.get('status', ''))
+    compress = request.args.get('gzip', '').lower() in ('1', 'true')
+
+    chunks = render(export_rows(entity, since=since, until=until, published=published), fmt)
+    filename = f"{entity}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{fmt}"
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    if compress:
+        chunks, filename, mimetype = gzip_chunks(chunks), filename + '.gz', 'application/gzip'
+
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
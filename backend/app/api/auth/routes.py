@@ -3,12 +3,21 @@ from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identi
 from app import db
 from app.models import User, Recipe  # Add Recipe import
 from app.utils.decorators import admin_required
+from app.utils.pagination import keyset_paginate, MAX_CURSOR_PAGE_SIZE
+from app.utils.http_cache import conditional_get
+from app.utils.response_cache import response_cache, recipe_list_tags, user_profile_tags
+from app.utils.sql_instrumentation import query_budget
+from app.utils.limits import rate_limiter
+from app.utils.db_engine import run_write_transaction
+from app.services.auth_cache import auth_claims
+from app.services.password_service import password_service, PasswordPoolBusy
 from sqlalchemy.orm import joinedload  # Add joinedload import
 import traceback
 
 auth_bp = Blueprint('auth', __name__)
 
 @auth_bp.route('/register', methods=['POST'])
+@rate_limiter.limit('auth')
 def register():
     try:
         data = request.get_json()
@@ -62,7 +71,7 @@ def register():
             print(f"User verification failed!")
         
         # Generate token
-        access_token = create_access_token(identity=str(user.id))
+        access_token = create_access_token(identity=str(user.id), additional_claims=auth_claims(user))
         
         return jsonify({
             'message': f'Welcome to CookEasy, {user.username}! 🎉',
@@ -70,6 +79,9 @@ def register():
             'user': user.to_dict(include_private=True)
         }), 201
         
+    except PasswordPoolBusy:
+        db.session.rollback()
+        return password_service.busy_response()
     except Exception as e:
         db.session.rollback()
         print(f"Registration error: {str(e)}")
@@ -77,6 +89,7 @@ def register():
         return jsonify({'message': 'Registration failed', 'error': str(e)}), 500
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limiter.limit('auth')
 def login():
     try:
         data = request.get_json()
@@ -92,8 +105,22 @@ def login():
         if not user.is_active:
             return jsonify({'message': 'Account is deactivated'}), 401
         
+        # Hash parameters changed since this hash was made; store one with the current ones
+        if password_service.needs_rehash(user.password_hash):
+            try:
+                # Hashed before the write transaction, which holds the write lock
+                password_hash = password_service.hash(data['password'])
+                user_id = user.id
+                def store_hash():
+                    db.session.get(User, user_id).password_hash = password_hash
+                    db.session.commit()
+                run_write_transaction(db.session, store_hash)
+            except Exception as e:
+                db.session.rollback()
+                print(f"Password rehash failed for user {user.id}: {str(e)}")
+        
         # Generate token
-        access_token = create_access_token(identity=str(user.id))
+        access_token = create_access_token(identity=str(user.id), additional_claims=auth_claims(user))
         
         return jsonify({
             'message': f'Welcome back, {user.username}!',
@@ -101,11 +128,15 @@ def login():
             'user': user.to_dict(include_private=True)
         }), 200
         
+    except PasswordPoolBusy:
+        db.session.rollback()
+        return password_service.busy_response()
     except Exception as e:
         print(f"Login error: {str(e)}")
         return jsonify({'message': 'Login failed', 'error': str(e)}), 500
 
 @auth_bp.route('/forgot-password', methods=['POST'])
+@rate_limiter.limit('auth')
 def forgot_password():
     """Reset password directly with email and new password"""
     try:
@@ -136,6 +167,9 @@ def forgot_password():
             'message': 'Password has been reset successfully. You can now login with your new password.'
         }), 200
         
+    except PasswordPoolBusy:
+        db.session.rollback()
+        return password_service.busy_response()
     except Exception as e:
         print(f"Password reset error: {str(e)}")
         return jsonify({'message': 'Failed to reset password', 'error': str(e)}), 500
@@ -172,6 +206,7 @@ def update_profile():
                 setattr(user, field, data[field])
         
         db.session.commit()
+        response_cache.evict(f'user:{user_id}')
         
         return jsonify({
             'message': 'Profile updated successfully',
@@ -183,6 +218,7 @@ def update_profile():
         return jsonify({'message': 'Failed to update profile', 'error': str(e)}), 500
 
 @auth_bp.route('/change-password', methods=['POST'])
+@rate_limiter.limit('auth')
 @jwt_required()
 def change_password():
     """Change user password"""
@@ -208,6 +244,9 @@ def change_password():
         
         return jsonify({'message': 'Password changed successfully'}), 200
         
+    except PasswordPoolBusy:
+        db.session.rollback()
+        return password_service.busy_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({'message': 'Failed to change password', 'error': str(e)}), 500
@@ -246,6 +285,7 @@ def update_user_role(user_id):
         old_role = user.role
         user.role = new_role
         db.session.commit()
+        response_cache.evict(f'user:{user_id}')
         
         return jsonify({
             'message': f'User role updated from {old_role} to {new_role}',
@@ -270,6 +310,7 @@ def update_user_status(user_id):
         
         user.is_active = bool(data['is_active'])
         db.session.commit()
+        response_cache.evict(f'user:{user_id}')
         
         status = 'activated' if user.is_active else 'deactivated'
         return jsonify({
@@ -295,6 +336,7 @@ def verify_user(user_id):
         
         user.is_verified = bool(data['is_verified'])
         db.session.commit()
+        response_cache.evict(f'user:{user_id}')
         
         status = 'verified' if user.is_verified else 'unverified'
         return jsonify({
@@ -352,6 +394,9 @@ def register_admin():
             'user': user.to_dict(include_private=True)
         }), 201
         
+    except PasswordPoolBusy:
+        db.session.rollback()
+        return password_service.busy_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({'message': 'User creation failed', 'error': str(e)}), 500
@@ -380,6 +425,7 @@ def debug_users_count():
         return jsonify({'error': str(e)}), 500
 
 @auth_bp.route('/debug/test-login', methods=['POST'])
+@rate_limiter.limit('auth')
 def test_login():
     """Test login endpoint with sample credentials"""
     try:
@@ -403,7 +449,7 @@ def test_login():
             return jsonify({'message': 'Test user not found or password mismatch'}), 401
         
         # Generate token
-        access_token = create_access_token(identity=str(user.id))
+        access_token = create_access_token(identity=str(user.id), additional_claims=auth_claims(user))
         
         return jsonify({
             'message': f'Test login successful as {role}',
@@ -420,6 +466,8 @@ def test_login():
 
 # User profile and recipes endpoints
 @auth_bp.route('/users/<int:user_id>', methods=['GET'])
+@conditional_get('users', 'recipes')
+@response_cache.cached(user_profile_tags)
 def get_user_profile(user_id):
     """Get user profile by ID"""
     try:
@@ -434,13 +482,15 @@ def get_user_profile(user_id):
 
 @auth_bp.route('/users/me/recipes', methods=['GET'])
 @jwt_required()
+@query_budget(6)
 def get_my_recipes():
     """Get current user's recipes (including drafts)"""
     try:
         current_user_id = get_jwt_identity()
         page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 12))
+        per_page = min(max(1, int(request.args.get('per_page', 12))), MAX_CURSOR_PAGE_SIZE)
         status = request.args.get('status', 'all')  # all, published, draft
+        cursor = request.args.get('cursor')  # opt-in keyset pagination, '' for the first page
         
         print(f"get_my_recipes called by user {current_user_id}, status={status}, page={page}")
         
@@ -457,6 +507,25 @@ def get_my_recipes():
             recipes_query = recipes_query.filter_by(is_published=False)
         # If status == 'all', show both published and draft recipes
         
+        if cursor is not None:
+            # Keyset pagination over ix_recipes_user_created, newest first
+            try:
+                items, next_cursor = keyset_paginate(
+                    recipes_query, (Recipe.created_at, Recipe.id), 'newest', cursor, per_page
+                )
+            except ValueError as e:
+                return jsonify({'message': str(e)}), 400
+            
+            return jsonify({
+                'message': 'User recipes retrieved successfully',
+                'recipes': Recipe.to_dict_list(items, current_user_id=int(current_user_id) if current_user_id else None),
+                'pagination': {
+                    'per_page': per_page,
+                    'next_cursor': next_cursor,
+                    'has_next': next_cursor is not None
+                }
+            }), 200
+        
         # Order by creation date (newest first)
         recipes_query = recipes_query.order_by(Recipe.created_at.desc())
         
@@ -470,7 +539,10 @@ def get_my_recipes():
         print(f"Found {paginated_recipes.total} total recipes for user {current_user_id}")
         print(f"Page {page}: {len(paginated_recipes.items)} recipes")
         
-        recipes_data = [recipe.to_dict(include_details=False, current_user_id=int(current_user_id) if current_user_id else None) for recipe in paginated_recipes.items]
+        recipes_data = Recipe.to_dict_list(
+            paginated_recipes.items,
+            current_user_id=int(current_user_id) if current_user_id else None
+        )
         for recipe in recipes_data:
             print(f"  - Recipe ID {recipe['id']}: {recipe['title']} (published: {recipe['is_published']})")
         
@@ -490,12 +562,15 @@ def get_my_recipes():
         return jsonify({'message': 'Failed to get user recipes', 'error': str(e)}), 500
 
 @auth_bp.route('/users/<int:user_id>/recipes', methods=['GET'])
+@response_cache.cached(recipe_list_tags, vary='user')
+@query_budget(10)
 def get_user_recipes_by_id(user_id):
     """Get recipes by specific user ID"""
     try:
         user = User.query.get_or_404(user_id)
         page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 12))
+        per_page = min(max(1, int(request.args.get('per_page', 12))), MAX_CURSOR_PAGE_SIZE)
+        cursor = request.args.get('cursor')  # opt-in keyset pagination, '' for the first page
         
         # Check if current user is viewing their own profile
         current_user_id = None
@@ -524,6 +599,26 @@ def get_user_recipes_by_id(user_id):
         if not is_own_profile:
             recipes_query = recipes_query.filter_by(is_published=True)
         
+        if cursor is not None:
+            # Keyset pagination over ix_recipes_user_created, newest first
+            try:
+                items, next_cursor = keyset_paginate(
+                    recipes_query, (Recipe.created_at, Recipe.id), 'newest', cursor, per_page
+                )
+            except ValueError as e:
+                return jsonify({'message': str(e)}), 400
+            
+            return jsonify({
+                'message': 'User recipes retrieved successfully',
+                'recipes': Recipe.to_dict_list(items, current_user_id=current_user_id),
+                'user': user.to_dict(),
+                'pagination': {
+                    'per_page': per_page,
+                    'next_cursor': next_cursor,
+                    'has_next': next_cursor is not None
+                }
+            }), 200
+        
         # Order by creation date (newest first)
         recipes_query = recipes_query.order_by(Recipe.created_at.desc())
         
@@ -536,7 +631,7 @@ def get_user_recipes_by_id(user_id):
         
         return jsonify({
             'message': 'User recipes retrieved successfully',
-            'recipes': [recipe.to_dict(include_details=False, current_user_id=current_user_id) for recipe in paginated_recipes.items],
+            'recipes': Recipe.to_dict_list(paginated_recipes.items, current_user_id=current_user_id),
             'user': user.to_dict(),
             'pagination': {
                 'page': page,
@@ -1,98 +1,79 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, make_response, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
-from app.models import Recipe, Category, Rating, User, Ingredient, RecipeIngredient
-from app.utils.decorators import chef_or_admin_required, admin_required
-from sqlalchemy import func, desc
+from app.models import Recipe, Category, Rating, User, Ingredient, RecipeIngredient, normalize_ingredient_name
+from app.utils.decorators import chef_or_admin_required, admin_required, current_auth_user
+from app.services.rating_service import RatingService
+from app.services.search_service import SearchService
+from app.services.view_counter import view_counter
+from app.services.stats_service import stats_snapshot
+from app.services.ingredient_resolver import ingredient_resolver
+from app.services.recipe_service import RecipeService, EDITABLE_FIELDS, NUTRITION_FIELDS
+from app.services.slug_service import save_with_slug
+from app.services.similar_service import SimilarRecipeService
+from app.utils.pagination import keyset_paginate, MAX_CURSOR_PAGE_SIZE
+from app.utils.http_cache import (
+    conditional_get, compute_validators, is_not_modified, not_modified, with_validators, versioned_etag, if_match_version
+)
+from app.utils.response_cache import response_cache, recipe_list_tags, category_list_tags, recipe_cache_tags, similar_recipe_tags
+from app.utils.sql_instrumentation import query_budget
+from app.utils.limits import rate_limiter
+from app.utils.db_engine import run_write_transaction
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.exc import StaleDataError
 
 recipes_bp = Blueprint('recipes', __name__)
 
+# Sort key columns for the recipe feed, all descending; id breaks ties
+FEED_SORT_COLUMNS = {
+    'newest': (Recipe.created_at, Recipe.id),
+    'popular': (Recipe.view_count, Recipe.id),
+    'rating': (Recipe.rating_avg, Recipe.id)
+}
+
 @recipes_bp.route('/stats', methods=['GET'])
+@rate_limiter.limit('stats')
 def get_platform_stats():
     """Get global platform statistics"""
     try:
-        # Calculate various statistics
-        total_recipes = Recipe.query.filter_by(is_published=True).count()
-        total_users = User.query.filter_by(is_active=True).count()
-        total_categories = Category.query.filter_by(is_active=True).count()
-        total_ratings = Rating.query.count()
-        
-        # Calculate total views across all recipes
-        total_views = db.session.query(func.sum(Recipe.view_count)).filter_by(is_published=True).scalar() or 0
-        
-        # Calculate total likes across all recipes
-        total_likes = db.session.query(func.sum(Recipe.like_count)).filter_by(is_published=True).scalar() or 0
-        
-        # Calculate average rating across all recipes
-        avg_rating = db.session.query(func.avg(Rating.rating)).scalar() or 0
-        
-        # Get top categories by recipe count
-        top_categories = db.session.query(
-            Category.name,
-            Category.icon,
-            func.count(Recipe.id).label('recipe_count')
-        ).join(Recipe).filter(
-            Recipe.is_published == True,
-            Category.is_active == True
-        ).group_by(Category.id).order_by(desc('recipe_count')).limit(3).all()
-        
-        # Get featured recipes count
-        featured_recipes = Recipe.query.filter_by(is_published=True, is_featured=True).count()
+        # Served from the in-memory snapshot; as_of tells clients how fresh it is
+        counters, top_categories, as_of = stats_snapshot.get()
+        total_ratings = counters['ratings_total']
+        avg_rating = counters['ratings_sum'] / total_ratings if total_ratings else 0
         
         return jsonify({
             'message': 'Platform statistics retrieved successfully',
             'stats': {
-                'total_recipes': total_recipes,
-                'total_users': total_users,
-                'total_categories': total_categories,
+                'total_recipes': counters['recipes_published'],
+                'total_users': counters['users_active'],
+                'total_categories': counters['categories_active'],
                 'total_ratings': total_ratings,
-                'total_views': int(total_views),
-                'total_likes': int(total_likes),
+                'total_views': int(counters['views_published']),
+                'total_likes': int(counters['likes_published']),
                 'average_rating': round(float(avg_rating), 1),
-                'featured_recipes': featured_recipes,
-                'top_categories': [
-                    {
-                        'name': cat.name,
-                        'icon': cat.icon,
-                        'recipe_count': cat.recipe_count
-                    } for cat in top_categories
-                ]
-            }
+                'featured_recipes': counters['recipes_featured'],
+                'top_categories': top_categories
+            },
+            'as_of': as_of.isoformat()
         }), 200
         
     except Exception as e:
         return jsonify({'message': 'Failed to get platform statistics', 'error': str(e)}), 500
 
 @recipes_bp.route('/categories', methods=['GET'])
+@conditional_get('categories', 'recipes')
+@response_cache.cached(category_list_tags)
+@query_budget(5)
 def get_categories():
     try:
         categories = Category.query.filter_by(is_active=True).order_by(Category.name).all()
         
-        # Add recipe count for each category
-        categories_with_count = []
-        for category in categories:
-            category_dict = category.to_dict()
-            # Count recipes from both many-to-many relationship and old single category
-            many_to_many_count = db.session.query(Recipe).filter(
-                Recipe.categories.any(Category.id == category.id),
-                Recipe.is_published == True
-            ).count()
-            single_category_count = Recipe.query.filter_by(
-                category_id=category.id, 
-                is_published=True
-            ).count()
-            # Use distinct count to avoid double counting
-            total_count = db.session.query(Recipe).filter(
-                db.or_(
-                    Recipe.categories.any(Category.id == category.id),
-                    Recipe.category_id == category.id
-                ),
-                Recipe.is_published == True
-            ).distinct().count()
-            
-            category_dict['recipe_count'] = total_count
-            categories_with_count.append(category_dict)
+        # Published recipe counts for all categories in one grouped query
+        recipe_counts = Category.get_published_recipe_counts()
+        categories_with_count = [
+            category.to_dict(recipe_count=recipe_counts.get(category.id, 0))
+            for category in categories
+        ]
         
         return jsonify({
             'message': 'Categories retrieved successfully',
@@ -104,14 +85,16 @@ def get_categories():
 
 @recipes_bp.route('', methods=['GET'])
 @recipes_bp.route('/', methods=['GET'])
+@query_budget(6)
 def get_recipes():
     try:
         # Get query parameters
         page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 12))
+        per_page = min(max(1, int(request.args.get('per_page', 12))), MAX_CURSOR_PAGE_SIZE)
         category_id = request.args.get('category_id')
         difficulty = request.args.get('difficulty')
         sort_by = request.args.get('sort_by', 'newest')  # newest, popular, rating
+        cursor = request.args.get('cursor')  # opt-in keyset pagination, '' for the first page
         
         # Use joinedload to eagerly load user and category data
         from sqlalchemy.orm import joinedload
@@ -135,19 +118,9 @@ def get_recipes():
         if difficulty:
             recipes_query = recipes_query.filter_by(difficulty=difficulty)
         
-        # Apply sorting
-        if sort_by == 'popular':
-            recipes_query = recipes_query.order_by(desc(Recipe.view_count))
-        elif sort_by == 'rating':
-            # Order by average rating
-            recipes_query = recipes_query.outerjoin(Rating).group_by(Recipe.id).order_by(desc(func.avg(Rating.rating)))
-        else:  # newest
-            recipes_query = recipes_query.order_by(Recipe.created_at.desc())
-        
-        # Paginate
-        recipes = recipes_query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        if sort_by not in FEED_SORT_COLUMNS:
+            sort_by = 'newest'
+        sort_columns = FEED_SORT_COLUMNS[sort_by]
         
         # Get current user ID if authenticated
         current_user_id = None
@@ -156,9 +129,34 @@ def get_recipes():
         except:
             pass
         
+        if cursor is not None:
+            # Keyset pagination: seek past the cursor, no OFFSET and no COUNT(*)
+            try:
+                items, next_cursor = keyset_paginate(recipes_query, sort_columns, sort_by, cursor, per_page)
+            except ValueError as e:
+                return jsonify({'message': str(e)}), 400
+            
+            return jsonify({
+                'message': 'Recipes retrieved successfully',
+                'recipes': Recipe.to_dict_list(items, current_user_id=current_user_id),
+                'pagination': {
+                    'per_page': per_page,
+                    'next_cursor': next_cursor,
+                    'has_next': next_cursor is not None
+                }
+            }), 200
+        
+        # Apply sorting
+        recipes_query = recipes_query.order_by(*[column.desc() for column in sort_columns])
+        
+        # Paginate
+        recipes = recipes_query.paginate(
+            page=page, per_page=per_page, error_out=False
+        )
+        
         return jsonify({
             'message': 'Recipes retrieved successfully',
-            'recipes': [recipe.to_dict(include_details=False, current_user_id=current_user_id) for recipe in recipes.items],
+            'recipes': Recipe.to_dict_list(recipes.items, current_user_id=current_user_id),
             'pagination': {
                 'page': page,
                 'per_page': per_page,
@@ -172,9 +170,25 @@ def get_recipes():
     except Exception as e:
         return jsonify({'message': 'Failed to get recipes', 'error': str(e)}), 500
 
+# Tables a full recipe representation is derived from
+RECIPE_DETAIL_TABLES = ('recipes', 'ratings', 'users', 'categories', 'recipe_ingredients', 'ingredients')
+
 @recipes_bp.route('/<int:recipe_id>', methods=['GET'])
+@query_budget(9)
 def get_recipe(recipe_id):
     try:
+        # Primary-key lookup: a missing or unpublished recipe is a 404 even for a
+        # client holding an old copy, and only published recipes count views.
+        # The ETag starts with the version, so it can also be PATCH's If-Match.
+        version = db.session.query(Recipe.version).filter_by(id=recipe_id, is_published=True).scalar()
+        if version is None:
+            return jsonify({'message': 'Recipe not found'}), 404
+        etag, last_modified = compute_validators(RECIPE_DETAIL_TABLES, per_user=True)
+        etag = versioned_etag(version, etag)
+        if is_not_modified(etag, last_modified):
+            view_counter.record(recipe_id)
+            return not_modified(etag, last_modified, per_user=True)
+        
         # Use joinedload to eagerly load user and category data
         from sqlalchemy.orm import joinedload
         recipe = Recipe.query.options(
@@ -185,9 +199,8 @@ def get_recipe(recipe_id):
         if not recipe or not recipe.is_published:
             return jsonify({'message': 'Recipe not found'}), 404
         
-        # Increment view count
-        recipe.view_count = (recipe.view_count or 0) + 1
-        db.session.commit()
+        # Count the view in the write-behind buffer; this request stays read-only
+        view_counter.record(recipe.id)
         
         # Get current user ID if authenticated
         current_user_id = None
@@ -196,10 +209,14 @@ def get_recipe(recipe_id):
         except:
             pass
         
-        return jsonify({
+        recipe_data = recipe.to_dict(include_details=True, current_user_id=current_user_id)
+        recipe_data['view_count'] = (recipe.view_count or 0) + view_counter.pending(recipe.id)
+        
+        response = jsonify({
             'message': 'Recipe retrieved successfully',
-            'recipe': recipe.to_dict(include_details=True, current_user_id=current_user_id)
-        }), 200
+            'recipe': recipe_data
+        })
+        return with_validators(response, etag, last_modified, per_user=True)
         
     except Exception as e:
         return jsonify({'message': 'Failed to get recipe', 'error': str(e)}), 500
@@ -220,17 +237,7 @@ def create_recipe():
             if not data.get(field):
                 return jsonify({'message': f'{field} is required'}), 400
         
-        # Create slug from title
-        slug = data['title'].lower().replace(' ', '-').replace(',', '').replace('.', '')
-        
-        # Check if slug already exists
-        existing_recipe = Recipe.query.filter_by(slug=slug).first()
-        if existing_recipe:
-            slug = f"{slug}-{Recipe.query.count() + 1}"
-        
         recipe = Recipe(
-            title=data['title'],
-            slug=slug,
             description=data['description'],
             instructions=data['instructions'],
             prep_time=data.get('prep_time', 0),
@@ -251,8 +258,8 @@ def create_recipe():
             fiber=data.get('nutrition', {}).get('fiber')
         )
         
-        db.session.add(recipe)
-        db.session.flush()  # Get the recipe ID before adding categories
+        # Adds and flushes the recipe (ID needed for categories) with a free slug
+        save_with_slug(recipe, data['title'])
         
         # Handle multiple categories
         category_ids = data.get('category_ids', [])
@@ -268,36 +275,28 @@ def create_recipe():
             if category:
                 recipe.categories.append(category)
         
-        # Handle ingredients
+        # Handle ingredients: found or created for the whole list at once
         ingredients_data = data.get('ingredients', [])
+        ingredient_lines = [item for item in ingredients_data if item.get('name') and item.get('quantity')]
+        resolved = ingredient_resolver.resolve(ingredient_lines)
         for i, ingredient_data in enumerate(ingredients_data):
             if ingredient_data.get('name') and ingredient_data.get('quantity'):
-                # Find or create ingredient
-                ingredient_name = ingredient_data['name'].strip()
-                ingredient = Ingredient.query.filter_by(name=ingredient_name).first()
-                
-                if not ingredient:
-                    # Create new ingredient
-                    ingredient = Ingredient(
-                        name=ingredient_name,
-                        unit=ingredient_data.get('unit', 'gram'),
-                        category='other'
-                    )
-                    db.session.add(ingredient)
-                    db.session.flush()  # Get ingredient ID
+                ingredient_id, default_unit = resolved[normalize_ingredient_name(ingredient_data['name'])]
                 
                 # Create recipe ingredient relationship
                 recipe_ingredient = RecipeIngredient(
                     recipe_id=recipe.id,
-                    ingredient_id=ingredient.id,
+                    ingredient_id=ingredient_id,
                     quantity=float(ingredient_data['quantity']),
-                    unit=ingredient_data.get('unit', ingredient.unit),
+                    unit=ingredient_data.get('unit', default_unit),
                     notes=ingredient_data.get('notes', ''),
                     order=i
                 )
                 db.session.add(recipe_ingredient)
         
+        SearchService.index_recipe(recipe.id)
         db.session.commit()
+        response_cache.evict(*recipe_cache_tags(recipe))
         
         return jsonify({
             'message': 'Recipe created successfully',
@@ -314,7 +313,7 @@ def update_recipe(recipe_id):
     """Update recipe - only recipe owner or admin can update"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = current_auth_user()
         recipe = Recipe.query.get_or_404(recipe_id)
         
         # Check permissions
@@ -323,86 +322,21 @@ def update_recipe(recipe_id):
         
         data = request.get_json()
         
-        # Update fields
-        updateable_fields = ['title', 'description', 'instructions', 'prep_time', 
-                           'cook_time', 'total_time', 'servings', 'difficulty', 
-                           'image_url', 'is_published', 'is_featured', 'category_id',
-                           'calories_per_serving', 'protein', 'carbs', 'fat', 'fiber']
-        
-        for field in updateable_fields:
-            if field in data:
-                setattr(recipe, field, data[field])
+        # Categories the recipe is leaving also need their cached counts evicted
+        previous_category_ids = {category.id for category in recipe.categories}
+        if recipe.category_id:
+            previous_category_ids.add(recipe.category_id)
         
+        changes = dict(data)
         # Handle nutrition data separately
         if 'nutrition' in data:
-            nutrition = data['nutrition']
-            recipe.calories_per_serving = nutrition.get('calories_per_serving')
-            recipe.protein = nutrition.get('protein')
-            recipe.carbs = nutrition.get('carbs')
-            recipe.fat = nutrition.get('fat')
-            recipe.fiber = nutrition.get('fiber')
-        
-        # Handle multiple categories update
-        if 'category_ids' in data:
-            # Clear existing categories and add new ones
-            recipe.categories.clear()
-            category_ids = data['category_ids']
-            for category_id in category_ids:
-                category = Category.query.get(category_id)
-                if category:
-                    recipe.categories.append(category)
-        elif 'category_id' in data:
-            # Fallback: handle single category update for backward compatibility
-            recipe.categories.clear()
-            if data['category_id']:
-                category = Category.query.get(data['category_id'])
-                if category:
-                    recipe.categories.append(category)
-        
-        # Handle ingredients update
-        if 'ingredients' in data:
-            # Remove existing ingredients
-            RecipeIngredient.query.filter_by(recipe_id=recipe.id).delete()
-            
-            # Add new ingredients
-            ingredients_data = data['ingredients']
-            for i, ingredient_data in enumerate(ingredients_data):
-                if ingredient_data.get('name') and ingredient_data.get('quantity'):
-                    # Find or create ingredient
-                    ingredient_name = ingredient_data['name'].strip()
-                    ingredient = Ingredient.query.filter_by(name=ingredient_name).first()
-                    
-                    if not ingredient:
-                        # Create new ingredient
-                        ingredient = Ingredient(
-                            name=ingredient_name,
-                            unit=ingredient_data.get('unit', 'gram'),
-                            category='other'
-                        )
-                        db.session.add(ingredient)
-                        db.session.flush()  # Get ingredient ID
-                    
-                    # Create recipe ingredient relationship
-                    recipe_ingredient = RecipeIngredient(
-                        recipe_id=recipe.id,
-                        ingredient_id=ingredient.id,
-                        quantity=float(ingredient_data['quantity']),
-                        unit=ingredient_data.get('unit', ingredient.unit),
-                        notes=ingredient_data.get('notes', ''),
-                        order=i
-                    )
-                    db.session.add(recipe_ingredient)
-        
-        # Update slug if title changed
-        if 'title' in data:
-            new_slug = data['title'].lower().replace(' ', '-').replace(',', '').replace('.', '')
-            if new_slug != recipe.slug:
-                existing = Recipe.query.filter_by(slug=new_slug).filter(Recipe.id != recipe_id).first()
-                if existing:
-                    new_slug = f"{new_slug}-{recipe_id}"
-                recipe.slug = new_slug
+            nutrition = data['nutrition'] or {}
+            changes.update({field: nutrition.get(field) for field in NUTRITION_FIELDS})
         
+        # Only what differs from the stored recipe is written
+        RecipeService.apply_changes(recipe, changes)
         db.session.commit()
+        response_cache.evict(*recipe_cache_tags(recipe, previous_category_ids))
         
         return jsonify({
             'message': 'Recipe updated successfully',
@@ -413,21 +347,113 @@ def update_recipe(recipe_id):
         db.session.rollback()
         return jsonify({'message': 'Failed to update recipe', 'error': str(e)}), 500
 
+@recipes_bp.route('/<int:recipe_id>', methods=['PATCH'])
+@jwt_required()
+def patch_recipe(recipe_id):
+    """
+    Partial update with an RFC 7396 JSON Merge Patch (e.g. draft autosave).
+    Requires If-Match with the recipe's version: '"<version>"' from the
+    'version' in the recipe JSON (what the frontend's recipes.patch sends),
+    or any ETag of the recipe, which all start with it (see versioned_etag).
+    Answers 204 with the new version as ETag, 412 if the recipe changed
+    meanwhile. Members set to null are cleared, 'nutrition'
+    is merged member by member, 'category_ids' and 'ingredients' replace
+    the current lists.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        user = current_auth_user()
+        recipe = Recipe.query.get_or_404(recipe_id)
+
+        # Check permissions
+        if recipe.user_id != user_id and user.role != 'admin':
+            return jsonify({'message': 'Insufficient permissions'}), 403
+
+        if not request.if_match:
+            return jsonify({'message': 'If-Match with the recipe version is required'}), 428
+        if not if_match_version(recipe.version):
+            return _version_conflict(recipe)
+
+        patch = request.get_json(silent=True)
+        if not isinstance(patch, dict):
+            return jsonify({'message': 'Body must be a JSON merge patch object'}), 400
+        unknown = set(patch) - set(EDITABLE_FIELDS) - {'nutrition', 'category_ids', 'ingredients'}
+        if unknown:
+            return jsonify({'message': f"Fields cannot be patched: {', '.join(sorted(unknown))}"}), 400
+        for field in ('title', 'instructions'):
+            if field in patch and not patch[field]:
+                return jsonify({'message': f'{field} cannot be empty'}), 400
+
+        changes = {field: value for field, value in patch.items() if field != 'nutrition'}
+        if 'nutrition' in patch:
+            nutrition = patch['nutrition']
+            if nutrition is None:
+                changes.update({field: None for field in NUTRITION_FIELDS})
+            elif isinstance(nutrition, dict):
+                changes.update({field: nutrition[field] for field in NUTRITION_FIELDS if field in nutrition})
+            else:
+                return jsonify({'message': 'nutrition must be an object or null'}), 400
+
+        def save_patch():
+            # Re-read under the write lock: the precondition holds until the commit
+            recipe = db.session.get(Recipe, recipe_id)
+            if not if_match_version(recipe.version):
+                return recipe, None, None
+            previous_category_ids = {category.id for category in recipe.categories}
+            if recipe.category_id:
+                previous_category_ids.add(recipe.category_id)
+
+            version = recipe.version
+            if RecipeService.apply_changes(recipe, changes):
+                db.session.flush()
+                version = recipe.version  # read before the commit expires it
+                db.session.commit()
+                return recipe, version, previous_category_ids
+            return recipe, version, None
+
+        recipe, version, previous_category_ids = run_write_transaction(db.session, save_patch)
+        if version is None:
+            return _version_conflict(recipe)
+        if previous_category_ids is not None:
+            response_cache.evict(*recipe_cache_tags(recipe, previous_category_ids))
+
+        response = make_response('', 204)
+        response.set_etag(versioned_etag(version))
+        return response
+
+    except StaleDataError:
+        # Another save won between our read and our UPDATE
+        db.session.rollback()
+        return _version_conflict(db.session.get(Recipe, recipe_id))
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': 'Failed to update recipe', 'error': str(e)}), 500
+
+def _version_conflict(recipe):
+    response = jsonify({'message': 'Recipe was changed by another save', 'version': recipe.version})
+    response.status_code = 412
+    response.set_etag(versioned_etag(recipe.version))
+    return response
+
 @recipes_bp.route('/<int:recipe_id>', methods=['DELETE'])
 @jwt_required()
 def delete_recipe(recipe_id):
     """Delete recipe - only recipe owner or admin can delete"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = current_auth_user()
         recipe = Recipe.query.get_or_404(recipe_id)
         
         # Check permissions
         if recipe.user_id != user_id and user.role != 'admin':
             return jsonify({'message': 'Insufficient permissions'}), 403
         
+        cache_tags = recipe_cache_tags(recipe)
+        SearchService.remove_recipe(recipe.id)
+        SimilarRecipeService.remove_recipe(recipe.id)
         db.session.delete(recipe)
         db.session.commit()
+        response_cache.evict(*cache_tags)
         
         return jsonify({'message': 'Recipe deleted successfully'}), 200
         
@@ -435,20 +461,44 @@ def delete_recipe(recipe_id):
         db.session.rollback()
         return jsonify({'message': 'Failed to delete recipe', 'error': str(e)}), 500
 
+@recipes_bp.route('/<int:recipe_id>/similar', methods=['GET'])
+@conditional_get('recipe_similar', 'recipes', 'users', 'categories')
+@response_cache.cached(similar_recipe_tags)
+@query_budget(5)
+def get_similar_recipes(recipe_id):
+    """Recipes sharing ingredients and categories, precomputed by `flask similar-recipes`"""
+    try:
+        if not db.session.query(Recipe.id).filter_by(id=recipe_id, is_published=True).scalar():
+            return jsonify({'message': 'Recipe not found'}), 404
+        
+        limit = min(int(request.args.get('limit', 6)), 20)
+        recipes = SimilarRecipeService.similar_to(recipe_id, limit=limit)
+        
+        return jsonify({
+            'message': 'Similar recipes retrieved successfully',
+            'recipes': [recipe.to_dict(include_details=False) for recipe in recipes]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'message': 'Failed to get similar recipes', 'error': str(e)}), 500
+
 # Rating endpoints
 @recipes_bp.route('/<int:recipe_id>/ratings', methods=['GET'])
+@query_budget(5)
 def get_recipe_ratings(recipe_id):
     """Get all ratings for a recipe"""
     try:
         recipe = Recipe.query.get_or_404(recipe_id)
-        ratings = Rating.query.filter_by(recipe_id=recipe_id).order_by(Rating.created_at.desc()).all()
+        ratings = Rating.query.options(
+            joinedload(Rating.user)
+        ).filter_by(recipe_id=recipe_id).order_by(Rating.created_at.desc()).all()
         
         return jsonify({
             'message': 'Ratings retrieved successfully',
             'ratings': [rating.to_dict() for rating in ratings],
-            'average_rating': Rating.get_average_rating(recipe_id),
+            'average_rating': round(recipe.average_rating, 1),
             'total_ratings': len(ratings),
-            'rating_distribution': Rating.get_rating_distribution(recipe_id)
+            'rating_distribution': recipe.rating_distribution
         }), 200
         
     except Exception as e:
@@ -463,34 +513,25 @@ def rate_recipe(recipe_id):
         recipe = Recipe.query.get_or_404(recipe_id)
         data = request.get_json()
         
-        # Validate rating
-        if not data.get('rating') or not isinstance(data['rating'], int) or not (1 <= data['rating'] <= 5):
+        # Validate rating (JSON true would pass as the int 1)
+        if isinstance(data.get('rating'), bool) or not isinstance(data.get('rating'), int) \
+                or not (1 <= data['rating'] <= 5):
             return jsonify({'message': 'Rating must be an integer between 1 and 5'}), 400
         
-        # Check if user already rated this recipe
-        existing_rating = Rating.query.filter_by(user_id=user_id, recipe_id=recipe_id).first()
-        
-        if existing_rating:
-            # Update existing rating
-            existing_rating.rating = data['rating']
-            existing_rating.review = data.get('review', '')
-            existing_rating.is_verified = data.get('is_verified', False)
-            
-            db.session.commit()
+        def save_rating():
+            # Check if user already rated this recipe
+            existing_rating = Rating.query.filter_by(user_id=user_id, recipe_id=recipe_id).first()
             
-            # Get updated recipe stats
-            average_rating = Rating.get_average_rating(recipe_id)
-            rating_count = Rating.query.filter_by(recipe_id=recipe_id).count()
+            if existing_rating:
+                # Update existing rating
+                old_rating = existing_rating.rating
+                existing_rating.rating = data['rating']
+                existing_rating.review = data.get('review', '')
+                existing_rating.is_verified = data.get('is_verified', False)
+                RatingService.apply_rating_change(recipe_id, old_rating, data['rating'])
+                db.session.commit()
+                return existing_rating, False
             
-            return jsonify({
-                'message': 'Rating updated successfully',
-                'rating': existing_rating.to_dict(),
-                'recipe_stats': {
-                    'average_rating': average_rating,
-                    'rating_count': rating_count
-                }
-            }, 200)
-        else:
             # Create new rating
             rating = Rating(
                 user_id=user_id,
@@ -499,33 +540,41 @@ def rate_recipe(recipe_id):
                 review=data.get('review', ''),
                 is_verified=data.get('is_verified', False)
             )
-            
             db.session.add(rating)
+            RatingService.apply_rating_change(recipe_id, None, data['rating'])
             db.session.commit()
-            
-            # Get updated recipe stats
-            average_rating = Rating.get_average_rating(recipe_id)
-            rating_count = Rating.query.filter_by(recipe_id=recipe_id).count()
-            
+            return rating, True
+        
+        rating, created = run_write_transaction(db.session, save_rating)
+        response_cache.evict(f'recipe:{recipe_id}')
+        
+        if not created:
             return jsonify({
-                'message': 'Rating added successfully',
+                'message': 'Rating updated successfully',
                 'rating': rating.to_dict(),
-                'recipe_stats': {
-                    'average_rating': average_rating,
-                    'rating_count': rating_count
-                }
-            }, 201)
+                'recipe_stats': RatingService.get_recipe_stats(recipe_id)
+            }, 200)
+        return jsonify({
+            'message': 'Rating added successfully',
+            'rating': rating.to_dict(),
+            'recipe_stats': RatingService.get_recipe_stats(recipe_id)
+        }, 201)
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'message': 'Failed to rate recipe', 'error': str(e)}), 500
 
 @recipes_bp.route('/user/<int:user_id>', methods=['GET'])
+@response_cache.cached(recipe_list_tags)
+@query_budget(8)
 def get_user_recipes(user_id):
     """Get recipes by specific user"""
     try:
         user = User.query.get_or_404(user_id)
-        recipes = Recipe.query.filter_by(user_id=user_id, is_published=True).order_by(Recipe.created_at.desc()).all()
+        recipes = Recipe.query.options(
+            joinedload(Recipe.user),
+            joinedload(Recipe.category)
+        ).filter_by(user_id=user_id, is_published=True).order_by(Recipe.created_at.desc()).all()
         
         # Get current user ID if authenticated
         current_user_id = None
@@ -536,7 +585,7 @@ def get_user_recipes(user_id):
         
         return jsonify({
             'message': 'User recipes retrieved successfully',
-            'recipes': [recipe.to_dict(include_details=False, current_user_id=current_user_id) for recipe in recipes],
+            'recipes': Recipe.to_dict_list(recipes, current_user_id=current_user_id),
             'user': user.to_dict(),
             'total': len(recipes)
         }), 200
@@ -545,40 +594,75 @@ def get_user_recipes(user_id):
         return jsonify({'message': 'Failed to get user recipes', 'error': str(e)}), 500
 
 @recipes_bp.route('/search', methods=['GET'])
+@rate_limiter.limit('search')
+@query_budget(6)
 def search_recipes():
-    """Search recipes by title, description, or category"""
+    """Search recipes by title, description, instructions or ingredients"""
     try:
         query = request.args.get('q', '').strip()
         category_id = request.args.get('category_id')
         difficulty = request.args.get('difficulty')
+        page = max(1, int(request.args.get('page', 1)))
+        per_page = min(max(1, int(request.args.get('per_page', 12))), MAX_CURSOR_PAGE_SIZE)
         
         if not query and not category_id and not difficulty:
             return jsonify({'message': 'Search query or filter required'}), 400
         
-        recipes_query = Recipe.query.filter_by(is_published=True)
-        
         if query:
-            recipes_query = recipes_query.filter(
-                Recipe.title.contains(query) | 
-                Recipe.description.contains(query)
+            # Full-text search: BM25-ranked ids and highlights from the FTS5 index
+            hits, total = SearchService.search(
+                query, page=page, per_page=per_page,
+                category_id=int(category_id) if category_id else None,
+                difficulty=difficulty
             )
-        
-        if category_id:
-            recipes_query = recipes_query.filter_by(category_id=int(category_id))
-        
-        if difficulty:
-            recipes_query = recipes_query.filter_by(difficulty=difficulty)
-        
-        recipes = recipes_query.order_by(Recipe.created_at.desc()).all()
+            recipes_by_id = {
+                recipe.id: recipe for recipe in Recipe.query.options(
+                    joinedload(Recipe.user),
+                    joinedload(Recipe.category)
+                ).filter(Recipe.id.in_([hit['id'] for hit in hits])).all()
+            }
+            recipes = [recipes_by_id[hit['id']] for hit in hits if hit['id'] in recipes_by_id]
+            recipes_data = Recipe.to_dict_list(recipes)
+            highlights = {hit['id']: hit for hit in hits}
+            for recipe_data in recipes_data:
+                hit = highlights[recipe_data['id']]
+                recipe_data['search_highlight'] = {
+                    'title': hit['title_highlight'],
+                    'snippet': hit['snippet']
+                }
+        else:
+            # Filter-only search, newest first
+            recipes_query = Recipe.query.options(
+                joinedload(Recipe.user),
+                joinedload(Recipe.category)
+            ).filter_by(is_published=True)
+            
+            if category_id:
+                recipes_query = recipes_query.filter_by(category_id=int(category_id))
+            
+            if difficulty:
+                recipes_query = recipes_query.filter_by(difficulty=difficulty)
+            
+            paginated = recipes_query.order_by(Recipe.created_at.desc()).paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+            recipes_data = Recipe.to_dict_list(paginated.items)
+            total = paginated.total
         
         return jsonify({
             'message': 'Search completed successfully',
-            'recipes': [recipe.to_dict(include_details=False) for recipe in recipes],
-            'total': len(recipes),
+            'recipes': recipes_data,
+            'total': total,
             'search_query': query,
             'filters': {
                 'category_id': category_id,
                 'difficulty': difficulty
+            },
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'total': total,
+                'pages': (total + per_page - 1) // per_page
             }
         }), 200
         
@@ -586,6 +670,9 @@ def search_recipes():
         return jsonify({'message': 'Search failed', 'error': str(e)}), 500
 
 @recipes_bp.route('/featured', methods=['GET'])
+@conditional_get('recipes', 'users', 'categories')
+@response_cache.cached(recipe_list_tags)
+@query_budget(5)
 def get_featured_recipes():
     try:
         from sqlalchemy.orm import joinedload
@@ -603,6 +690,10 @@ def get_featured_recipes():
         return jsonify({'message': 'Failed to get featured recipes', 'error': str(e)}), 500
 
 @recipes_bp.route('/popular', methods=['GET'])
+@conditional_get('recipes', 'recipe_views', 'users', 'categories')
+# Short TTL: view counts are written behind and never evict
+@response_cache.cached(recipe_list_tags, ttl=60)
+@query_budget(5)
 def get_popular_recipes():
     try:
         from sqlalchemy.orm import joinedload
@@ -622,12 +713,16 @@ def get_popular_recipes():
 
 @recipes_bp.route('/favorites', methods=['GET'])
 @jwt_required()
+@query_budget(5)
 def get_user_favorites():
     try:
         user_id = int(get_jwt_identity())
         
         # Get user's favorite recipes via ratings with high score
-        favorites_query = db.session.query(Recipe).join(Rating).filter(
+        favorites_query = db.session.query(Recipe).options(
+            joinedload(Recipe.user),
+            joinedload(Recipe.category)
+        ).join(Rating).filter(
             Rating.user_id == user_id,
             Rating.rating >= 4,
             Recipe.is_published == True
@@ -637,7 +732,7 @@ def get_user_favorites():
         
         return jsonify({
             'message': 'Favorite recipes retrieved successfully',
-            'recipes': [recipe.to_dict(include_details=False, current_user_id=user_id) for recipe in favorites],
+            'recipes': Recipe.to_dict_list(favorites, current_user_id=user_id),
             'total': len(favorites)
         }), 200
         
@@ -651,35 +746,43 @@ def toggle_favorite(recipe_id):
         user_id = int(get_jwt_identity())
         recipe = Recipe.query.get_or_404(recipe_id)
         
-        # Check if user already has a rating for this recipe
-        existing_rating = Rating.query.filter_by(user_id=user_id, recipe_id=recipe_id).first()
-        
-        if existing_rating:
-            # Toggle favorite status by rating (4-5 = favorite, 1-3 = not favorite)
-            if existing_rating.rating >= 4:
-                # Remove from favorites by setting rating to 3
-                existing_rating.rating = 3
-                message = 'Recipe removed from favorites'
-                is_favorited = False
+        def save_favorite():
+            # Check if user already has a rating for this recipe
+            existing_rating = Rating.query.filter_by(user_id=user_id, recipe_id=recipe_id).first()
+            
+            if existing_rating:
+                old_rating = existing_rating.rating
+                # Toggle favorite status by rating (4-5 = favorite, 1-3 = not favorite)
+                if existing_rating.rating >= 4:
+                    # Remove from favorites by setting rating to 3
+                    existing_rating.rating = 3
+                    message = 'Recipe removed from favorites'
+                    is_favorited = False
+                else:
+                    # Add to favorites by setting rating to 5
+                    existing_rating.rating = 5
+                    message = 'Recipe added to favorites'
+                    is_favorited = True
+                RatingService.apply_rating_change(recipe_id, old_rating, existing_rating.rating)
             else:
-                # Add to favorites by setting rating to 5
-                existing_rating.rating = 5
+                # Create new rating as favorite
+                rating = Rating(
+                    user_id=user_id,
+                    recipe_id=recipe_id,
+                    rating=5,
+                    review='',
+                    is_verified=False
+                )
+                db.session.add(rating)
+                RatingService.apply_rating_change(recipe_id, None, 5)
                 message = 'Recipe added to favorites'
                 is_favorited = True
-        else:
-            # Create new rating as favorite
-            rating = Rating(
-                user_id=user_id,
-                recipe_id=recipe_id,
-                rating=5,
-                review='',
-                is_verified=False
-            )
-            db.session.add(rating)
-            message = 'Recipe added to favorites'
-            is_favorited = True
+            
+            db.session.commit()
+            return message, is_favorited
         
-        db.session.commit()
+        message, is_favorited = run_write_transaction(db.session, save_favorite)
+        response_cache.evict(f'recipe:{recipe_id}')
         
         return jsonify({
             'message': message,
@@ -691,6 +794,7 @@ def toggle_favorite(recipe_id):
         return jsonify({'message': 'Failed to toggle favorite', 'error': str(e)}), 500
 
 @recipes_bp.route('/ingredients', methods=['GET'])
+@conditional_get('ingredients')
 def get_ingredients():
     try:
         ingredients = Ingredient.query.filter_by(is_active=True).order_by(Ingredient.name).all()
@@ -709,7 +813,7 @@ def toggle_recipe_publish(recipe_id):
     """Toggle recipe published status - only recipe owner or admin can do this"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = current_auth_user()
         recipe = Recipe.query.get_or_404(recipe_id)
         
         # Check permissions
@@ -719,6 +823,7 @@ def toggle_recipe_publish(recipe_id):
         # Toggle published status
         recipe.is_published = not recipe.is_published
         db.session.commit()
+        response_cache.evict(*recipe_cache_tags(recipe))
         
         status = 'published' if recipe.is_published else 'unpublished'
         return jsonify({
@@ -737,7 +842,7 @@ def get_recipe_for_edit(recipe_id):
     """Get recipe details for editing - includes all data including ingredients"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = current_auth_user()
         
         # Get recipe with all relationships loaded
         recipe = Recipe.query.options(
@@ -752,10 +857,12 @@ def get_recipe_for_edit(recipe_id):
         if recipe.user_id != user_id and user.role != 'admin':
             return jsonify({'message': 'Insufficient permissions'}), 403
         
-        return jsonify({
+        response = jsonify({
             'message': 'Recipe details retrieved successfully',
             'recipe': recipe.to_dict(include_details=True, current_user_id=user_id)
-        }), 200
+        })
+        response.set_etag(versioned_etag(recipe.version))
+        return response
         
     except Exception as e:
         return jsonify({'message': 'Failed to get recipe details', 'error': str(e)}), 500
\ No newline at end of file
@@ -0,0 +1,110 @@
+import gzip
+import click
+from app import db
+
+def bootstrap_database(seed=False):
+    """Create missing tables and the search index; optionally load the sample data"""
+    from app import init_sample_data
+    from app.services.search_service import SearchService
+
+    db.create_all()
+    SearchService.ensure_index()
+    if seed:
+        init_sample_data()
+
+def register_commands(app):
+    """
+    Database setup runs once from the command line instead of in every
+    create_app() call (and so every worker process):
+
+        flask --app run bootstrap [--seed]
+        flask --app run seed
+        flask --app run import-recipes recipes.ndjson[.gz] --user chef@example.com
+        flask --app run export recipes --format csv --output recipes.csv.gz
+    """
+
+    @app.cli.command('bootstrap')
+    @click.option('--seed', is_flag=True, help='Also load the sample data into an empty database.')
+    def bootstrap_command(seed):
+        """Create missing tables and the search index."""
+        bootstrap_database(seed=seed)
+        click.echo('✅ Database bootstrapped')
+
+    @app.cli.command('seed')
+    def seed_command():
+        """Load the sample data into an empty database."""
+        from app import init_sample_data
+
+        init_sample_data()
+        click.echo('✅ Sample data in place')
+
+    @app.cli.command('import-recipes')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False, allow_dash=True))
+    @click.option('--user', 'user', required=True, help='Email or username of the author for lines without "author".')
+    @click.option('--chunk-size', default=500, show_default=True, help='Recipes per insert batch.')
+    def import_recipes_command(path, user, chunk_size):
+        """Bulk-import recipes from an NDJSON file ('-' reads stdin)."""
+        from sqlalchemy import or_
+        from app.models import User
+        from app.services.recipe_import import RecipeImporter
+
+        author = User.query.filter(or_(User.email == user, User.username == user)).first()
+        if author is None:
+            raise click.ClickException(f'No user {user}')
+
+        if path == '-':
+            report = RecipeImporter(author.id, chunk_size=chunk_size).run(click.get_binary_stream('stdin'))
+        else:
+            with (gzip.open if path.endswith('.gz') else open)(path, 'rb') as f:
+                report = RecipeImporter(author.id, chunk_size=chunk_size).run(f)
+
+        for error in report['errors']:
+            click.echo(f"   line {error['line']}: {error['error']}", err=True)
+        rate = report['imported'] / report['seconds'] if report['seconds'] else 0
+        click.echo(f"✅ Imported {report['imported']} recipes, {report['failed']} failed "
+                   f"({report['lines']} lines in {report['seconds']}s, {rate:.0f} recipes/s)")
+
+    @app.cli.command('export')
+    @click.argument('entity', type=click.Choice(['recipes', 'users', 'ratings']))
+    @click.option('--format', 'fmt', type=click.Choice(['ndjson', 'csv']), default='ndjson', show_default=True)
+    @click.option('--output', '-o', default='-', help="File to write ('.gz' compresses); default stdout.")
+    @click.option('--since', help='Only rows created on or after this ISO date.')
+    @click.option('--until', help='Only rows created before this ISO date.')
+    @click.option('--status', type=click.Choice(['published', 'draft']), help='Recipes only.')
+    @click.option('--batch-size', default=1000, show_default=True, help='Rows fetched per cursor batch.')
+    def export_command(entity, fmt, output, since, until, status, batch_size):
+        """Stream recipes, users or ratings as NDJSON or CSV."""
+        from app.services.data_export import export_rows, render, gzip_chunks, parse_export_date
+
+        try:
+            since, until = parse_export_date(since), parse_export_date(until)
+        except ValueError:
+            raise click.BadParameter('since and until must be ISO dates')
+        published = {'published': True, 'draft': False}.get(status)
+        chunks = render(export_rows(entity, since=since, until=until, published=published,
+                                    batch_size=batch_size), fmt)
+
+        if output == '-':
+            for chunk in chunks:
+                click.echo(chunk, nl=False)
+            return
+        with open(output, 'wb') as f:
+            if output.endswith('.gz'):
+                for data in gzip_chunks(chunks):
+                    f.write(data)
+            else:
+                for chunk in chunks:
+                    f.write(chunk.encode('utf-8'))
+        click.echo(f'✅ Exported {entity} to {output}', err=True)
+
+    @app.cli.command('similar-recipes')
+    @click.option('--full', is_flag=True, help='Recompute every recipe, not only changed ones.')
+    @click.option('--top-k', default=20, show_default=True, help='Neighbours stored per recipe.')
+    @click.option('--batch-size', default=100, show_default=True, help='Recipes computed per transaction.')
+    def similar_recipes_command(full, top_k, batch_size):
+        """Recompute the precomputed similar-recipes lists."""
+        from app.services.similar_service import SimilarRecipeService
+
+        report = SimilarRecipeService.refresh(full=full, top_k=top_k, batch_size=batch_size)
+        click.echo(f"✅ Recomputed similar recipes for {report['recomputed']} of {report['recipes']} recipes, "
+                   f"{report['removed']} deleted ({report['seconds']}s)")
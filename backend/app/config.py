@@ -13,6 +13,38 @@ class Config:
     # Database (using in-memory for now)
     DATABASE_TYPE = 'memory'
     
+    # Engine: DATABASE_URL overrides the bundled SQLite file (relative paths live in instance/)
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///cookeasy.db'
+    
+    # Connection pool (ignored for in-memory SQLite, which shares one connection)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 3600))
+    
+    # SQLite pragmas applied to every new connection; WAL lets readers run during a write.
+    # SQLITE_TUNING=0 falls back to stock pysqlite behaviour (no pragmas, BEGIN handling or retries)
+    SQLITE_TUNING = os.environ.get('SQLITE_TUNING', '1') not in ('0', 'false', 'False')
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),  # ms
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,  # negative = KiB, i.e. 64 MiB
+        'temp_store': 'MEMORY'
+    }
+    
+    # Retry "database is locked" when opening a write transaction
+    DB_LOCK_RETRIES = int(os.environ.get('DB_LOCK_RETRIES', 5))
+    DB_LOCK_RETRY_BACKOFF = float(os.environ.get('DB_LOCK_RETRY_BACKOFF', 0.05))  # seconds, doubled per attempt
+    
+    # Reads of GET requests go to a replica (DATABASE_READ_URL) or a read-only snapshot of the
+    # SQLite file refreshed every DB_READ_SNAPSHOT_INTERVAL seconds; writers read the primary for a while
+    DATABASE_READ_URL = os.environ.get('DATABASE_READ_URL')
+    DB_READ_SNAPSHOT = os.environ.get('DB_READ_SNAPSHOT', '0') in ('1', 'true', 'True')
+    DB_READ_SNAPSHOT_INTERVAL = float(os.environ.get('DB_READ_SNAPSHOT_INTERVAL', 5))
+    DB_READ_AFTER_WRITE_PIN = float(os.environ.get('DB_READ_AFTER_WRITE_PIN', 10))  # seconds
+    
 class DevelopmentConfig(Config):
     DEBUG = True
     ENV = 'development'
@@ -2,14 +2,18 @@ from .user import User
 from .recipe import Recipe
 from .category import Category
 from .rating import Rating, RatingHelpful
-from .ingredient import Ingredient, RecipeIngredient
+from .ingredient import Ingredient, RecipeIngredient, normalize_ingredient_name
 from .recipe_category import recipe_categories
+from .recipe_similar import recipe_similar, recipe_similar_state
+from .table_version import TableVersion
 
 __all__ = [
     'User',
     'Recipe',
     'Category',
     'Rating', 'RatingHelpful',
-    'Ingredient', 'RecipeIngredient',
-    'recipe_categories'
+    'Ingredient', 'RecipeIngredient', 'normalize_ingredient_name',
+    'recipe_categories',
+    'recipe_similar', 'recipe_similar_state',
+    'TableVersion'
 ]
\ No newline at end of file
@@ -1,5 +1,7 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import func, select, union
+from .recipe_category import recipe_categories
 
 class Category(db.Model):
     __tablename__ = 'categories'
@@ -22,10 +24,35 @@ class Category(db.Model):
     
     @property
     def total_recipe_count(self):
-        """Calculate total recipes in this category from many-to-many relationship"""
-        return len(self.recipes)  # This will use the backref from Recipe model
+        """Count recipes in this category from the many-to-many table (without loading them)"""
+        return db.session.query(func.count()).select_from(recipe_categories).filter(
+            recipe_categories.c.category_id == self.id
+        ).scalar()
     
-    def to_dict(self):
+    @staticmethod
+    def get_published_recipe_counts():
+        """
+        Published recipe count for every category in one grouped query.
+        A recipe counts once per category whether it is linked through
+        recipe_categories, the legacy recipes.category_id, or both.
+        """
+        from .recipe import Recipe
+        linked = union(
+            select(recipe_categories.c.category_id, recipe_categories.c.recipe_id)
+            .join(Recipe, Recipe.id == recipe_categories.c.recipe_id)
+            .where(Recipe.is_published == True),
+            select(Recipe.category_id, Recipe.id)
+            .where(Recipe.is_published == True, Recipe.category_id.isnot(None))
+        ).subquery()
+        
+        rows = db.session.query(
+            linked.c.category_id,
+            func.count()
+        ).group_by(linked.c.category_id).all()
+        
+        return {category_id: count for category_id, count in rows}
+    
+    def to_dict(self, recipe_count=None):
         return {
             'id': self.id,
             'name': self.name,
@@ -36,7 +63,7 @@ class Category(db.Model):
             'image_url': self.image_url,
             'is_active': self.is_active,
             'is_featured': self.is_featured,
-            'recipe_count': self.total_recipe_count,  # Use calculated count
+            'recipe_count': self.total_recipe_count if recipe_count is None else recipe_count,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
\ No newline at end of file
@@ -1,11 +1,22 @@
+import unicodedata
 from app import db
 from datetime import datetime
+from sqlalchemy.orm import validates
+
+def normalize_ingredient_name(name):
+    """Key shared by every spelling of one ingredient: NFKC, single spaces, casefolded"""
+    return ' '.join(unicodedata.normalize('NFKC', name or '').split()).casefold()
+
+def _name_key_default(context):
+    # Core inserts that only pass a name still get their key
+    return normalize_ingredient_name(context.get_current_parameters().get('name'))
 
 class Ingredient(db.Model):
     __tablename__ = 'ingredients'
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False, unique=True)
+    name_key = db.Column(db.String(100), default=_name_key_default)  # see normalize_ingredient_name
     description = db.Column(db.Text)
     unit = db.Column(db.String(20), default='gram')  # gram, ml, piece, cup, etc.
     category = db.Column(db.String(50))  # protein, vegetable, spice, etc.
@@ -13,9 +24,19 @@ class Ingredient(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # "Garlic" and "garlic " are one ingredient
+        db.Index('ux_ingredients_name_key', 'name_key', unique=True),
+    )
+    
     # Relationships
     recipe_ingredients = db.relationship('RecipeIngredient', backref='ingredient', cascade='all, delete-orphan')
     
+    @validates('name')
+    def _update_name_key(self, key, name):
+        self.name_key = normalize_ingredient_name(name)
+        return name
+    
     def __repr__(self):
         return f'<Ingredient {self.name}>'
     
@@ -35,7 +56,7 @@ class RecipeIngredient(db.Model):
     __tablename__ = 'recipe_ingredients'
     
     id = db.Column(db.Integer, primary_key=True)
-    recipe_id = db.Column(db.Integer, db.ForeignKey('recipes.id'), nullable=False)
+    recipe_id = db.Column(db.Integer, db.ForeignKey('recipes.id'), nullable=False, index=True)
     ingredient_id = db.Column(db.Integer, db.ForeignKey('ingredients.id'), nullable=False)
     quantity = db.Column(db.Float, nullable=False)
     unit = db.Column(db.String(20), nullable=False)  # Override ingredient default unit if needed
@@ -20,6 +20,17 @@ class Recipe(db.Model):
     is_featured = db.Column(db.Boolean, default=False)
     view_count = db.Column(db.Integer, default=0)
     like_count = db.Column(db.Integer, default=0)
+    
+    # Denormalized rating aggregates, maintained by RatingService
+    rating_sum = db.Column(db.Integer, default=0)
+    rating_count = db.Column(db.Integer, default=0)
+    rating_avg = db.Column(db.Float, default=0.0)
+    rating_1_count = db.Column(db.Integer, default=0)
+    rating_2_count = db.Column(db.Integer, default=0)
+    rating_3_count = db.Column(db.Integer, default=0)
+    rating_4_count = db.Column(db.Integer, default=0)
+    rating_5_count = db.Column(db.Integer, default=0)
+    
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey('categories.id'))  # Keep for backward compatibility
     
@@ -32,6 +43,18 @@ class Recipe(db.Model):
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped by every ORM update; PATCH /api/recipes/<id> takes it as If-Match
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    
+    __mapper_args__ = {'version_id_col': version}
+    
+    # Composite indexes backing the keyset-paginated feeds
+    __table_args__ = (
+        db.Index('ix_recipes_published_created', 'is_published', 'created_at', 'id'),
+        db.Index('ix_recipes_published_views', 'is_published', 'view_count', 'id'),
+        db.Index('ix_recipes_published_rating', 'is_published', 'rating_avg', 'id'),
+        db.Index('ix_recipes_user_created', 'user_id', 'created_at', 'id'),
+    )
     
     # Relationships
     ratings = db.relationship('Rating', backref='recipe', lazy='dynamic', cascade='all, delete-orphan')
@@ -43,18 +66,39 @@ class Recipe(db.Model):
     
     @property
     def average_rating(self):
-        """Calculate average rating for this recipe"""
-        ratings = self.ratings.all()
-        if not ratings:
-            return 0.0
-        return sum(rating.rating for rating in ratings) / len(ratings)
+        """Average rating from the stored aggregates (no ratings query)"""
+        return self.rating_avg or 0.0
     
     @property
-    def rating_count(self):
-        """Get number of ratings for this recipe"""
-        return self.ratings.count()
+    def rating_distribution(self):
+        """Per-star histogram from the stored aggregates"""
+        return {star: getattr(self, f'rating_{star}_count') or 0 for star in range(1, 6)}
+    
+    @classmethod
+    def to_dict_list(cls, recipes, current_user_id=None, include_details=False):
+        """
+        Serialize a page of recipes, resolving is_favorited for the whole page
+        with one query instead of one per recipe
+        """
+        favorited_ids = set()
+        if current_user_id and recipes:
+            from .rating import Rating
+            rows = db.session.query(Rating.recipe_id).filter(
+                Rating.user_id == current_user_id,
+                Rating.recipe_id.in_([recipe.id for recipe in recipes]),
+                Rating.rating >= 4
+            ).all()
+            favorited_ids = {row.recipe_id for row in rows}
+        
+        return [
+            recipe.to_dict(
+                include_details=include_details,
+                current_user_id=current_user_id,
+                favorited_ids=favorited_ids
+            ) for recipe in recipes
+        ]
     
-    def to_dict(self, include_details=True, current_user_id=None):
+    def to_dict(self, include_details=True, current_user_id=None, favorited_ids=None):
         data = {
             'id': self.id,
             'title': self.title,
@@ -71,12 +115,13 @@ class Recipe(db.Model):
             'view_count': self.view_count,
             'like_count': self.like_count,
             'average_rating': self.average_rating,
-            'rating_count': self.rating_count,
+            'rating_count': self.rating_count or 0,
             'user_id': self.user_id,
             'category_id': self.category_id,  # Keep for backward compatibility
             'categories': [{'id': cat.id, 'name': cat.name, 'slug': cat.slug, 'icon': cat.icon} for cat in self.categories],
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'version': self.version,
             # Add nutrition fields at recipe level for frontend compatibility
             'calories_per_serving': self.calories_per_serving,
             'protein': self.protein,
@@ -86,7 +131,10 @@ class Recipe(db.Model):
         }
         
         # Check if current user has favorited this recipe
-        if current_user_id:
+        if favorited_ids is not None:
+            # Resolved up front for the whole page by to_dict_list
+            data['is_favorited'] = self.id in favorited_ids
+        elif current_user_id:
             from .rating import Rating
             user_rating = Rating.query.filter_by(
                 user_id=current_user_id, 
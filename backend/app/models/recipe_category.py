@@ -4,5 +4,7 @@ from app import db
 recipe_categories = db.Table('recipe_categories',
     db.Column('recipe_id', db.Integer, db.ForeignKey('recipes.id'), primary_key=True),
     db.Column('category_id', db.Integer, db.ForeignKey('categories.id'), primary_key=True),
-    db.Column('created_at', db.DateTime, default=db.func.current_timestamp())
+    db.Column('created_at', db.DateTime, default=db.func.current_timestamp()),
+    # The primary key covers recipe -> categories; this covers category -> recipes
+    db.Index('ix_recipe_categories_category_id', 'category_id')
 )
@@ -0,0 +1,21 @@
+from app import db
+
+# Precomputed nearest neighbours of each recipe (app/services/similar_service.py).
+# A recipe's list is one range of the primary key, already in rank order.
+recipe_similar = db.Table('recipe_similar',
+    # SimilarRecipeService.remove_recipe deletes both sides where foreign keys are not enforced
+    db.Column('recipe_id', db.Integer, db.ForeignKey('recipes.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('rank', db.Integer, primary_key=True),
+    db.Column('similar_recipe_id', db.Integer, db.ForeignKey('recipes.id', ondelete='CASCADE'), nullable=False),
+    db.Column('score', db.Float, nullable=False),
+    # Finds the lists a changed or deleted recipe appears in
+    db.Index('ix_recipe_similar_similar_recipe_id', 'similar_recipe_id')
+)
+
+# Ingredients and categories each recipe's list was computed from, as a hash;
+# recipes whose hash no longer matches are recomputed
+recipe_similar_state = db.Table('recipe_similar_state',
+    db.Column('recipe_id', db.Integer, primary_key=True),
+    db.Column('signature', db.String(32), nullable=False),
+    db.Column('computed_at', db.DateTime, nullable=False)
+)
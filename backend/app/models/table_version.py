@@ -0,0 +1,22 @@
+from app import db
+from datetime import datetime
+
+class TableVersion(db.Model):
+    """Per-table change counter, bumped in the same transaction as every write to that table"""
+    __tablename__ = 'table_versions'
+    
+    table_name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<TableVersion {self.table_name} v{self.version}>'
+    
+    @staticmethod
+    def get_versions(table_names):
+        """Return {table_name: (version, updated_at)} for the given tables in one query"""
+        rows = db.session.query(TableVersion).filter(TableVersion.table_name.in_(table_names)).all()
+        versions = {name: (0, None) for name in table_names}
+        for row in rows:
+            versions[row.table_name] = (row.version, row.updated_at)
+        return versions
@@ -1,5 +1,5 @@
 from app import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.services.password_service import password_service
 from datetime import datetime
 
 class User(db.Model):
@@ -15,6 +15,8 @@ class User(db.Model):
     profile_image = db.Column(db.String(500))
     is_active = db.Column(db.Boolean, default=True)
     is_verified = db.Column(db.Boolean, default=False)
+    # Bumped whenever role/is_active/is_verified change (see app/services/auth_cache.py)
+    auth_version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -23,10 +25,10 @@ class User(db.Model):
     ratings = db.relationship('Rating', backref='user', lazy='dynamic')
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_service.hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_service.verify(self.password_hash, password)
     
     def to_dict(self, include_private=False):
         # Calculate recipe count
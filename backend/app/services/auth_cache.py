@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import namedtuple
+from flask import g
+from sqlalchemy import event, inspect
+from app import db
+from app.models import User
+from app.utils.read_routing import on_primary
+
+# Columns that decide what a user may do; changing one bumps users.auth_version
+AUTH_FIELDS = ('role', 'is_active', 'is_verified')
+
+AuthState = namedtuple('AuthState', ['id', 'role', 'is_active', 'is_verified', 'auth_version'])
+
+def auth_claims(user):
+    """Extra JWT claims describing the user's authorization state when the token was issued"""
+    return {
+        'role': user.role,
+        'active': bool(user.is_active),
+        'verified': bool(user.is_verified),
+        'auth_version': user.auth_version or 1
+    }
+
+class AuthStateCache:
+    """
+    Per-process TTL cache of each user's role/active/verified flags, so the
+    authorization decorators need no query once a user has been seen.
+
+    Commits that change AUTH_FIELDS bump users.auth_version and evict the
+    user here (see the session listeners below). Other worker processes
+    notice within AUTH_CACHE_TTL seconds, or at once when a token carries
+    a newer auth_version claim than their cached entry.
+
+    Config:
+        AUTH_CACHE_TTL          seconds an entry is trusted (default 30; 0 disables the cache)
+        AUTH_CACHE_MAX_ENTRIES  bound on cached users (default 10000)
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.ttl = 30
+        self.max_entries = 10000
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('AUTH_CACHE_TTL', 30)
+        app.config.setdefault('AUTH_CACHE_MAX_ENTRIES', 10000)
+        self.ttl = float(app.config['AUTH_CACHE_TTL'])
+        self.max_entries = int(app.config['AUTH_CACHE_MAX_ENTRIES'])
+        self.clear()
+        app.teardown_request(_forget_request_user)
+        app.extensions['auth_cache'] = self
+
+    def get(self, user_id, min_version=None):
+        """AuthState of a user (None if the user does not exist), loading it on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is not None:
+            state, expires = entry
+            if expires > now and (min_version is None or state.auth_version >= min_version):
+                return state
+
+        # A lagging replica could put a just-revoked role back into the cache
+        with on_primary():
+            row = db.session.query(
+                User.id, User.role, User.is_active, User.is_verified, User.auth_version
+            ).filter(User.id == user_id).first()
+        if row is None:
+            self.invalidate(user_id)
+            return None
+
+        state = AuthState(row.id, row.role, bool(row.is_active), bool(row.is_verified), row.auth_version or 1)
+        if self.ttl > 0:
+            with self._lock:
+                if len(self._entries) >= self.max_entries:
+                    self._entries = {key: value for key, value in self._entries.items() if value[1] > now}
+                    if len(self._entries) >= self.max_entries:
+                        self._entries.clear()
+                self._entries[user_id] = (state, now + self.ttl)
+        return state
+
+    def invalidate(self, *user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+auth_cache = AuthStateCache()
+
+def _forget_request_user(error=None):
+    # g outlives the request when the caller pushed the app context (tests, scripts)
+    g.pop('auth_user', None)
+
+@event.listens_for(db.session, 'before_flush')
+def _bump_auth_versions(session, flush_context, instances):
+    changed = session.info.setdefault('auth_changed_users', set())
+    for obj in session.dirty:
+        if isinstance(obj, User) and any(inspect(obj).attrs[key].history.has_changes() for key in AUTH_FIELDS):
+            obj.auth_version = (obj.auth_version or 1) + 1
+            changed.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            changed.add(obj.id)
+
+@event.listens_for(db.session, 'after_commit')
+def _evict_changed_users(session):
+    auth_cache.invalidate(*session.info.pop('auth_changed_users', ()))
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_changed_users(session):
+    session.info.pop('auth_changed_users', None)
@@ -1,6 +1,7 @@
 from typing import Dict, Optional
 from flask_jwt_extended import create_access_token, create_refresh_token
 from app.models.user import User
+from app.services.auth_cache import auth_claims
 from app.utils.validators import validate_email, validate_password
 
 class AuthService:
@@ -44,7 +45,7 @@ class AuthService:
             raise ValueError("Invalid email or password")
         
         # Generate tokens
-        access_token = create_access_token(identity=user.id)
+        access_token = create_access_token(identity=user.id, additional_claims=auth_claims(user))
         refresh_token = create_refresh_token(identity=user.id)
         
         return {
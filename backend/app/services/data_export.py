@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from sqlalchemy import select, func
+from app import db
+from app.models import User, Recipe, Category, Rating, Ingredient, RecipeIngredient, recipe_categories
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+# Rows fetched from the cursor per batch; also the unit of output written at once
+DEFAULT_BATCH_SIZE = 1000
+
+# Columns holding JSON arrays built by SQLite; nested as-is in NDJSON, kept as text in CSV
+JSON_COLUMNS = {'categories', 'ingredients'}
+
+def _recipe_columns():
+    # Recipe lines use the import format (author, categories, ingredients), so an
+    # export can be fed back into POST /api/admin/recipes/import
+    categories = select(func.json_group_array(Category.name)).select_from(
+        recipe_categories.join(Category, Category.id == recipe_categories.c.category_id)
+    ).where(recipe_categories.c.recipe_id == Recipe.id).scalar_subquery()
+    ingredients = select(func.json_group_array(func.json_object(
+        'name', Ingredient.name, 'quantity', RecipeIngredient.quantity,
+        'unit', RecipeIngredient.unit, 'notes', RecipeIngredient.notes
+    ))).select_from(
+        RecipeIngredient.__table__.join(Ingredient, Ingredient.id == RecipeIngredient.ingredient_id)
+    ).where(RecipeIngredient.recipe_id == Recipe.id).scalar_subquery()
+
+    return [
+        Recipe.id, Recipe.slug, Recipe.title, Recipe.description, Recipe.instructions,
+        Recipe.prep_time, Recipe.cook_time, Recipe.total_time, Recipe.servings, Recipe.difficulty,
+        Recipe.image_url, Recipe.is_published, Recipe.is_featured, Recipe.view_count, Recipe.like_count,
+        Recipe.rating_count, Recipe.rating_avg, Recipe.user_id,
+        select(User.email).where(User.id == Recipe.user_id).scalar_subquery().label('author'),
+        categories.label('categories'), ingredients.label('ingredients'),
+        Recipe.calories_per_serving, Recipe.protein, Recipe.carbs, Recipe.fat, Recipe.fiber,
+        Recipe.created_at, Recipe.updated_at
+    ]
+
+# What each export reads. Users never include password hashes.
+EXPORTS = {
+    'recipes': (Recipe, _recipe_columns),
+    'users': (User, lambda: [
+        User.id, User.username, User.email, User.full_name, User.role,
+        User.is_active, User.is_verified, User.created_at, User.updated_at
+    ]),
+    'ratings': (Rating, lambda: [
+        Rating.id, Rating.user_id, Rating.recipe_id, Rating.rating, Rating.review,
+        Rating.is_verified, Rating.helpful_count, Rating.created_at, Rating.updated_at
+    ])
+}
+
+def parse_export_date(value):
+    """'2024-01-31' or an ISO timestamp -> datetime; None passes through"""
+    return datetime.fromisoformat(value) if value else None
+
+def export_rows(entity, since=None, until=None, published=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Yield batches of row mappings for `entity`, ordered by id, streamed from
+    the cursor `batch_size` rows at a time. Nothing is loaded into the ORM
+    session, so memory stays flat however large the table is.
+
+    since/until filter on created_at (until is exclusive); published only
+    applies to recipes.
+    """
+    model, columns = EXPORTS[entity]
+    statement = select(*columns()).order_by(model.id)
+    if since is not None:
+        statement = statement.where(model.created_at >= since)
+    if until is not None:
+        statement = statement.where(model.created_at < until)
+    if published is not None and entity == 'recipes':
+        statement = statement.where(Recipe.is_published == published)
+
+    result = db.session.execute(statement.execution_options(yield_per=batch_size))
+    for batch in result.mappings().partitions():
+        yield batch
+
+def render(batches, fmt):
+    """Turn row batches into text chunks of NDJSON or CSV (with a header row)"""
+    header_written = False
+    for batch in batches:
+        buffer = io.StringIO()
+        if fmt == 'csv':
+            writer = csv.writer(buffer)
+            if not header_written:
+                writer.writerow(batch[0].keys())
+                header_written = True
+            writer.writerows([_csv_value(value) for value in row.values()] for row in batch)
+        else:
+            for row in batch:
+                buffer.write(_ndjson_line(row))
+                buffer.write('\n')
+        yield buffer.getvalue()
+
+def gzip_chunks(chunks):
+    """Gzip a stream of text chunks on the fly"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip header and trailer
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+def _ndjson_line(row):
+    values = dict(row)
+    # SQLite already built these as JSON text; splice them in instead of decoding and re-encoding
+    raw = [(key, values.pop(key)) for key in JSON_COLUMNS if key in values]
+    line = json.dumps(values, default=_json_default, ensure_ascii=False)
+    if raw:
+        line = line[:-1] + ''.join(f', "{key}": {value or "[]"}' for key, value in raw) + '}'
+    return line
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'{value.__class__.__name__} is not JSON serializable')
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return value
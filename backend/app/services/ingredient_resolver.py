@@ -0,0 +1,123 @@
+import threading
+from sqlalchemy import event, insert, select
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import Ingredient, normalize_ingredient_name
+from app.services.version_service import bump_versions
+from app.utils.read_routing import on_primary
+
+# Inserts that lose a race with another worker are retried this often
+CREATE_ATTEMPTS = 3
+
+class IngredientResolver:
+    """
+    Find-or-create for whole ingredient lists. Names are matched on
+    ingredients.name_key (normalize_ingredient_name), first through a
+    per-process name_key -> (id, unit) cache, then with one IN query for
+    the misses; ingredients still missing are created with one bulk insert
+    in the caller's transaction.
+
+    Ingredients are never renamed or deleted by the API, so entries stay
+    valid; created ones enter the cache only once their transaction commits.
+    Restart the workers after scripts/merge_duplicate_ingredients.py.
+
+    Config:
+        INGREDIENT_CACHE_MAX_ENTRIES  bound on cached names (default 50000)
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.max_entries = 50000
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('INGREDIENT_CACHE_MAX_ENTRIES', 50000)
+        self.max_entries = int(app.config['INGREDIENT_CACHE_MAX_ENTRIES'])
+        self.clear()
+        app.extensions['ingredient_resolver'] = self
+
+    def resolve(self, ingredients):
+        """
+        {name_key: (ingredient id, default unit)} for a list of {'name', 'unit'}
+        dicts, creating the ingredients that do not exist yet (unit from the
+        first line naming them, category 'other')
+        """
+        wanted = {}
+        for item in ingredients:
+            key = normalize_ingredient_name(item.get('name'))
+            if key and key not in wanted:
+                wanted[key] = item
+
+        with self._lock:
+            resolved = {key: self._entries[key] for key in wanted if key in self._entries}
+        missing = [key for key in wanted if key not in resolved]
+
+        for attempt in range(CREATE_ATTEMPTS):
+            if not missing:
+                break
+            found = self._lookup(missing)
+            resolved.update(found)
+            missing = [key for key in missing if key not in found]
+            if not missing:
+                break
+            try:
+                resolved.update(self._create(missing, wanted))
+                missing = []
+            except IntegrityError:
+                # Another worker created some of them since the lookup
+                if attempt == CREATE_ATTEMPTS - 1:
+                    raise
+        return resolved
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, keys):
+        # A lagging replica would make us create a duplicate
+        with on_primary():
+            rows = db.session.execute(
+                select(Ingredient.name_key, Ingredient.id, Ingredient.unit).where(Ingredient.name_key.in_(keys))
+            )
+            found = {key: (ingredient_id, unit) for key, ingredient_id, unit in rows}
+        self._remember(found)
+        return found
+
+    def _create(self, keys, wanted):
+        rows = [{
+            'name': ' '.join(wanted[key]['name'].split()),
+            'name_key': key,
+            'unit': wanted[key].get('unit') or 'gram',
+            'category': 'other',
+            'is_active': True
+        } for key in keys]
+        with db.session.begin_nested():
+            ids = db.session.execute(
+                insert(Ingredient.__table__).returning(Ingredient.__table__.c.id, sort_by_parameter_order=True),
+                rows
+            ).scalars().all()
+            # Core inserts skip the ORM listeners that bump table versions
+            bump_versions(db.session.connection(), ['ingredients'])
+        created = {row['name_key']: (ingredient_id, row['unit']) for row, ingredient_id in zip(rows, ids)}
+        db.session.info.setdefault('created_ingredients', {}).update(created)
+        return created
+
+    def _remember(self, entries):
+        if not entries:
+            return
+        with self._lock:
+            if len(self._entries) + len(entries) > self.max_entries:
+                self._entries.clear()
+            self._entries.update(entries)
+
+ingredient_resolver = IngredientResolver()
+
+@event.listens_for(db.session, 'after_commit')
+def _cache_created_ingredients(session):
+    ingredient_resolver._remember(session.info.pop('created_ingredients', None))
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_created_ingredients(session):
+    session.info.pop('created_ingredients', None)
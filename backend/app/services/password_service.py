@@ -0,0 +1,117 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from flask import jsonify
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Werkzeug method string for each algorithm; PASSWORD_HASH_COST fills in the work factor
+HASH_METHODS = {
+    'scrypt': 'scrypt:{cost}:8:1',        # cost = N (CPU/memory cost, a power of two)
+    'pbkdf2:sha256': 'pbkdf2:sha256:{cost}',  # cost = iterations
+    'pbkdf2:sha512': 'pbkdf2:sha512:{cost}'
+}
+
+DEFAULT_COSTS = {
+    'scrypt': 2 ** 15,
+    'pbkdf2:sha256': 1_000_000,
+    'pbkdf2:sha512': 1_000_000
+}
+
+class PasswordPoolBusy(Exception):
+    """More hashing work is queued than PASSWORD_POOL_MAX_PENDING allows"""
+
+class PasswordService:
+    """
+    Password hashing with a configurable algorithm and cost.
+
+    Hashing is CPU-bound for tens to hundreds of milliseconds. With
+    PASSWORD_POOL_WORKERS > 0 it runs in a process pool, so the request
+    thread only waits (without the GIL) and other requests keep being
+    served; at most PASSWORD_POOL_MAX_PENDING jobs may be queued, beyond
+    that callers get PasswordPoolBusy (a 503 for the client).
+
+    Hashes made with other parameters still verify; needs_rehash() tells
+    login to store a fresh hash with the current ones.
+
+    Config:
+        PASSWORD_HASH_ALGORITHM     'scrypt' (default), 'pbkdf2:sha256' or 'pbkdf2:sha512'
+        PASSWORD_HASH_COST          scrypt N or pbkdf2 iterations (default: Werkzeug's)
+        PASSWORD_POOL_WORKERS       hashing processes; 0 hashes on the request thread (default)
+        PASSWORD_POOL_MAX_PENDING   queued + running jobs before rejecting (default 4 per worker)
+        PASSWORD_POOL_TIMEOUT       seconds to wait for a job (default 10)
+    """
+
+    def __init__(self, app=None):
+        self.method = None
+        self.workers = 0
+        self.timeout = 10.0
+        self._pool = None
+        self._slots = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PASSWORD_HASH_ALGORITHM', 'scrypt')
+        app.config.setdefault('PASSWORD_HASH_COST', None)
+        app.config.setdefault('PASSWORD_POOL_WORKERS', 0)
+        app.config.setdefault('PASSWORD_POOL_MAX_PENDING', None)
+        app.config.setdefault('PASSWORD_POOL_TIMEOUT', 10)
+
+        algorithm = app.config['PASSWORD_HASH_ALGORITHM']
+        if algorithm not in HASH_METHODS:
+            raise ValueError(f"Unsupported PASSWORD_HASH_ALGORITHM: {algorithm}")
+        cost = int(app.config['PASSWORD_HASH_COST'] or DEFAULT_COSTS[algorithm])
+        self.method = HASH_METHODS[algorithm].format(cost=cost)
+
+        self.shutdown()
+        self.workers = int(app.config['PASSWORD_POOL_WORKERS'])
+        self.timeout = float(app.config['PASSWORD_POOL_TIMEOUT'])
+        max_pending = app.config['PASSWORD_POOL_MAX_PENDING'] or self.workers * 4
+        self._slots = threading.BoundedSemaphore(max_pending) if self.workers > 0 else None
+        app.extensions['password_service'] = self
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        if not password_hash:
+            return False
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if the hash was made with another algorithm or cost than configured"""
+        return bool(password_hash) and password_hash.split('$', 1)[0] != self.method
+
+    def busy_response(self):
+        response = jsonify({'message': 'Server is busy, please try again shortly'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '1'
+        return response
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, function, *args):
+        if self._slots is None:
+            return function(*args)
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolBusy()
+        try:
+            return self._executor().submit(function, *args).result(timeout=self.timeout)
+        finally:
+            self._slots.release()
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                # forkserver: workers start from a clean process, not a fork of a threaded server
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._pool
+
+password_service = PasswordService()
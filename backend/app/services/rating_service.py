@@ -0,0 +1,99 @@
+from typing import Optional
+from sqlalchemy import bindparam, func, case
+from app import db
+from app.models.rating import Rating
+from app.models.recipe import Recipe
+
+class RatingService:
+
+    @staticmethod
+    def apply_rating_change(recipe_id: int, old_rating: Optional[int] = None, new_rating: Optional[int] = None):
+        """
+        Adjust the denormalized aggregates on a recipe for one rating change.
+        Pass old_rating=None for a new rating and new_rating=None for a removed one.
+        Runs as a single relative UPDATE so concurrent raters don't overwrite each other.
+        """
+        if old_rating == new_rating:
+            return
+
+        sum_delta = (new_rating or 0) - (old_rating or 0)
+        count_delta = (new_rating is not None) - (old_rating is not None)
+
+        values = {
+            Recipe.rating_sum: Recipe.rating_sum + sum_delta,
+            Recipe.rating_count: Recipe.rating_count + count_delta,
+            # SET expressions see the pre-update row, so apply the deltas here as well
+            Recipe.rating_avg: func.coalesce(
+                (Recipe.rating_sum + sum_delta) * 1.0 / func.nullif(Recipe.rating_count + count_delta, 0),
+                0.0
+            )
+        }
+        if old_rating is not None:
+            column = getattr(Recipe, f'rating_{old_rating}_count')
+            values[column] = column - 1
+        if new_rating is not None:
+            column = getattr(Recipe, f'rating_{new_rating}_count')
+            values[column] = column + 1
+
+        db.session.query(Recipe).filter(Recipe.id == recipe_id).update(values, synchronize_session=False)
+
+    @staticmethod
+    def get_recipe_stats(recipe_id: int) -> dict:
+        """Read the current aggregates for a recipe straight from the recipes row"""
+        row = db.session.query(Recipe.rating_avg, Recipe.rating_count).filter(Recipe.id == recipe_id).one()
+        return {
+            'average_rating': round(float(row.rating_avg or 0), 1),
+            'rating_count': row.rating_count or 0
+        }
+
+    @staticmethod
+    def rebuild_aggregates() -> int:
+        """
+        Recompute every recipe's aggregates from the ratings table in one grouped pass.
+        Recipes without ratings are reset to zero. Returns the number of recipes updated.
+        """
+        star_columns = [
+            func.sum(case((Rating.rating == star, 1), else_=0)).label(f'rating_{star}_count')
+            for star in range(1, 6)
+        ]
+        totals = db.session.query(
+            Rating.recipe_id,
+            func.sum(Rating.rating).label('rating_sum'),
+            func.count(Rating.id).label('rating_count'),
+            *star_columns
+        ).group_by(Rating.recipe_id).all()
+
+        db.session.query(Recipe).update({
+            Recipe.rating_sum: 0,
+            Recipe.rating_count: 0,
+            Recipe.rating_avg: 0.0,
+            Recipe.rating_1_count: 0,
+            Recipe.rating_2_count: 0,
+            Recipe.rating_3_count: 0,
+            Recipe.rating_4_count: 0,
+            Recipe.rating_5_count: 0
+        }, synchronize_session=False)
+
+        rows = []
+        for row in totals:
+            rows.append({
+                'recipe_id': row.recipe_id,
+                'rating_sum': row.rating_sum,
+                'rating_count': row.rating_count,
+                'rating_avg': row.rating_sum / row.rating_count if row.rating_count else 0.0,
+                **{f'rating_{star}_count': getattr(row, f'rating_{star}_count') for star in range(1, 6)}
+            })
+
+        if rows:
+            # Core UPDATE by primary key (executemany); aggregates are not edits,
+            # so they leave the recipe's version (If-Match) alone
+            recipes = Recipe.__table__
+            db.session.execute(
+                recipes.update().where(recipes.c.id == bindparam('recipe_id')).values(
+                    {column: bindparam(column) for column in rows[0] if column != 'recipe_id'}
+                ),
+                rows
+            )
+
+        db.session.commit()
+        return len(rows)
@@ -0,0 +1,289 @@
+import json
+import time
+from collections import ChainMap
+from datetime import datetime
+from sqlalchemy import insert, select
+from app import db
+from app.models import User, Recipe, Category, RecipeIngredient, recipe_categories, normalize_ingredient_name
+from app.services.ingredient_resolver import ingredient_resolver
+from app.services.search_service import SearchService
+from app.services.slug_service import slugify, highest_suffix
+from app.services.stats_service import stats_snapshot
+from app.services.version_service import bump_versions
+from app.utils.response_cache import response_cache
+
+DEFAULT_CHUNK_SIZE = 500
+
+# The report lists at most this many line errors; the counts stay exact
+MAX_REPORTED_ERRORS = 100
+
+RECIPE_FIELDS = ('prep_time', 'cook_time', 'total_time', 'servings')
+NUTRITION_FIELDS = ('calories_per_serving', 'protein', 'carbs', 'fat', 'fiber')
+
+class ImportLineError(ValueError):
+    """A line that cannot become a recipe; reported with its line number"""
+
+class RecipeImporter:
+    """
+    Bulk import of recipes from NDJSON, one recipe object per line in the
+    shape POST /api/recipes accepts:
+
+        {"title": "...", "description": "...", "instructions": "...",
+         "prep_time": 10, "cook_time": 20, "servings": 4, "difficulty": "Easy",
+         "is_published": true, "nutrition": {"calories_per_serving": 320},
+         "categories": ["Makanan Utama"],            # names or slugs, or "category_ids": [1, 2]
+         "ingredients": [{"name": "Bawang Merah", "quantity": 5, "unit": "piece", "notes": "sliced"}],
+         "author": "chef@example.com"}               # optional email or username of a chef/admin
+
+    Lines are parsed as they are read and written with Core executemany in
+    chunks, one transaction and savepoint per chunk. Categories and authors
+    resolve through name -> id maps loaded once, ingredients through
+    ingredient_resolver (one lookup and one bulk insert of the unknown ones
+    per chunk). When a chunk fails in the database it
+    is retried line by line, so one bad line costs only itself. Problems are
+    reported per line and never stop the import.
+    """
+
+    def __init__(self, user_id, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.user_id = user_id
+        self.chunk_size = max(1, int(chunk_size))
+        self.report = {'lines': 0, 'imported': 0, 'failed': 0, 'errors': []}
+        self._categories = None
+        self._category_ids = None
+        self._authors = None
+        self._suffixes = {}
+        self._touched = {'recipe-list', 'categories'}
+
+    def run(self, lines):
+        """Import an iterable of NDJSON lines (str or bytes); returns the report"""
+        started = time.perf_counter()
+        self._load_maps()
+
+        chunk = []
+        for number, line in enumerate(lines, start=1):
+            self.report['lines'] = number
+            if isinstance(line, bytes):
+                line = line.decode('utf-8', errors='replace')
+            if not line.strip():
+                continue
+            try:
+                chunk.append((number, self._parse(line)))
+            except ImportLineError as e:
+                self._fail(number, str(e))
+            if len(chunk) >= self.chunk_size:
+                self._write_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._write_chunk(chunk)
+
+        # Core inserts bypass the ORM listeners that evict caches
+        if self.report['imported']:
+            response_cache.evict(*self._touched)
+            stats_snapshot.invalidate()
+
+        self.report['seconds'] = round(time.perf_counter() - started, 3)
+        return self.report
+
+    def _load_maps(self):
+        self._categories = {}
+        self._category_ids = set()
+        for category_id, name, slug in db.session.execute(select(Category.id, Category.name, Category.slug)):
+            self._categories[normalize_ingredient_name(name)] = category_id
+            self._categories[slug] = category_id
+            self._category_ids.add(category_id)
+
+    def _author_id(self, author):
+        if self._authors is None:
+            # Only accounts that may create recipes through the API
+            self._authors = {}
+            rows = db.session.execute(
+                select(User.id, User.email, User.username).where(User.role.in_(['chef', 'admin']))
+            )
+            for user_id, email, username in rows:
+                self._authors[email.lower()] = user_id
+                self._authors[username.lower()] = user_id
+        user_id = self._authors.get(str(author).strip().lower())
+        if user_id is None:
+            raise ImportLineError(f"unknown author '{author}' (must be a chef or admin)")
+        return user_id
+
+    def _parse(self, line):
+        """Validate one line; returns (recipe row, category ids, ingredient specs)"""
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            raise ImportLineError(f'invalid JSON: {e}')
+        if not isinstance(data, dict):
+            raise ImportLineError('expected a JSON object')
+
+        for field in ('title', 'description', 'instructions'):
+            if not data.get(field) or not isinstance(data[field], str):
+                raise ImportLineError(f'{field} is required')
+
+        try:
+            numbers = {field: int(data[field]) for field in RECIPE_FIELDS if data.get(field) is not None}
+            nutrition = data.get('nutrition') or {}
+            # Every row carries every column: executemany compiles the statement from the first row
+            nutrition = {field: float(nutrition[field]) if nutrition.get(field) is not None else None
+                         for field in NUTRITION_FIELDS}
+        except (TypeError, ValueError, AttributeError):
+            raise ImportLineError('times, servings and nutrition must be numbers')
+
+        # bool("false") is True; only JSON booleans are taken
+        if not isinstance(data.get('is_published', False), bool):
+            raise ImportLineError('is_published must be true or false')
+
+        prep_time, cook_time = numbers.get('prep_time', 0), numbers.get('cook_time', 0)
+        now = datetime.utcnow()
+        row = {
+            'title': data['title'].strip(),
+            'slug': slugify(data['title'].strip()),
+            'description': data['description'],
+            'instructions': data['instructions'],
+            'prep_time': prep_time,
+            'cook_time': cook_time,
+            'total_time': numbers.get('total_time', prep_time + cook_time),
+            'servings': numbers.get('servings', 4),
+            'difficulty': data.get('difficulty') or 'Medium',
+            'image_url': data.get('image_url') or '',
+            'is_published': data.get('is_published', False),
+            'is_featured': False,
+            'user_id': self._author_id(data['author']) if data.get('author') else self.user_id,
+            'created_at': now,
+            'updated_at': now,
+            **nutrition
+        }
+
+        category_values = data.get('category_ids') or data.get('categories') or []
+        if not isinstance(category_values, list):
+            raise ImportLineError('categories must be a list')
+        category_ids = []
+        for value in category_values:
+            if isinstance(value, int):
+                category_id = value if value in self._category_ids else None
+            else:
+                category_id = self._categories.get(normalize_ingredient_name(str(value)))
+            if category_id is None:
+                raise ImportLineError(f"unknown category '{value}'")
+            if category_id not in category_ids:
+                category_ids.append(category_id)
+        row['category_id'] = category_ids[0] if category_ids else None
+
+        if not isinstance(data.get('ingredients') or [], list):
+            raise ImportLineError('ingredients must be a list')
+        ingredients = []
+        for item in data.get('ingredients') or []:
+            if not isinstance(item, dict) or not item.get('name') or not item.get('quantity'):
+                continue  # create_recipe skips these too
+            try:
+                quantity = float(item['quantity'])
+            except (TypeError, ValueError):
+                raise ImportLineError(f"quantity of '{item['name']}' must be a number")
+            ingredients.append({
+                'name': ' '.join(str(item['name']).split()),
+                'quantity': quantity,
+                'unit': item.get('unit'),
+                'notes': item.get('notes', '')
+            })
+
+        return row, category_ids, ingredients
+
+    def _write_chunk(self, chunk):
+        try:
+            # Outside the chunk's savepoint: ingredients stay even if some recipes fail
+            resolved = ingredient_resolver.resolve(
+                [item for _, (_, _, items) in chunk for item in items]
+            )
+        except Exception as e:
+            db.session.rollback()
+            for number, _ in chunk:
+                self._fail(number, f'database error: {e.__class__.__name__}: {e}')
+            return
+
+        try:
+            with db.session.begin_nested():
+                suffixes = self._insert(chunk, resolved)
+            self._suffixes.update(suffixes)
+            imported = chunk
+        except Exception:
+            # Find the offending lines: each one again in its own savepoint
+            imported = []
+            for item in chunk:
+                try:
+                    with db.session.begin_nested():
+                        suffixes = self._insert([item], resolved)
+                    self._suffixes.update(suffixes)
+                    imported.append(item)
+                except Exception as e:
+                    self._fail(item[0], f'database error: {e.__class__.__name__}: {e}')
+
+        if imported:
+            bump_versions(db.session.connection(), ['recipes', 'recipe_categories', 'recipe_ingredients'])
+        db.session.commit()
+        self.report['imported'] += len(imported)
+        for _, (row, category_ids, _) in imported:
+            self._touched.add(f"user:{row['user_id']}")
+            self._touched.update(f'category:{category_id}' for category_id in category_ids)
+
+    def _insert(self, chunk, resolved):
+        """Write a chunk; returns the slug suffixes it used (see _allocate_slugs)"""
+        slugs, suffixes = self._allocate_slugs([row['slug'] for _, (row, _, _) in chunk])
+        rows = [dict(row, slug=slug) for (_, (row, _, _)), slug in zip(chunk, slugs)]
+
+        recipe_ids = db.session.execute(
+            insert(Recipe.__table__).returning(Recipe.__table__.c.id, sort_by_parameter_order=True),
+            rows
+        ).scalars().all()
+
+        category_rows, ingredient_rows = [], []
+        for recipe_id, (_, (_, category_ids, ingredients)) in zip(recipe_ids, chunk):
+            category_rows.extend({'recipe_id': recipe_id, 'category_id': category_id}
+                                 for category_id in category_ids)
+            for order, item in enumerate(ingredients):
+                ingredient_id, default_unit = resolved[normalize_ingredient_name(item['name'])]
+                ingredient_rows.append({
+                    'recipe_id': recipe_id,
+                    'ingredient_id': ingredient_id,
+                    'quantity': item['quantity'],
+                    'unit': item['unit'] or default_unit or 'gram',
+                    'notes': item['notes'],
+                    'order': order
+                })
+        if category_rows:
+            db.session.execute(insert(recipe_categories), category_rows)
+        if ingredient_rows:
+            db.session.execute(insert(RecipeIngredient.__table__), ingredient_rows)
+        SearchService.index_recipes(recipe_ids)
+        return suffixes
+
+    def _allocate_slugs(self, bases):
+        """
+        One free slug per base: the base itself, else base-<n> above the
+        highest suffix in use. Bare bases are checked with one IN query per
+        chunk; a base that clashes costs one range scan (highest_suffix) the
+        first time, after which its suffix is counted here, across chunks.
+
+        Returns (slugs, suffixes used). The caller merges the suffixes into
+        self._suffixes only once the savepoint holding the rows is released,
+        so the slugs of a failed chunk are free again for its retry.
+        """
+        taken = set(db.session.execute(
+            select(Recipe.slug).where(Recipe.slug.in_(set(bases)))
+        ).scalars())
+        suffixes = ChainMap({}, self._suffixes)
+        slugs = []
+        for base in bases:
+            if base not in taken and base not in suffixes:
+                suffixes[base] = None  # bare base used; suffixes unknown yet
+                slugs.append(base)
+                continue
+            if suffixes.get(base) is None:
+                suffixes[base] = max(highest_suffix(base), 1)
+            suffixes[base] += 1
+            slugs.append(f'{base}-{suffixes[base]}')
+        return slugs, suffixes.maps[0]
+
+    def _fail(self, line, message):
+        self.report['failed'] += 1
+        if len(self.report['errors']) < MAX_REPORTED_ERRORS:
+            self.report['errors'].append({'line': line, 'error': message})
@@ -0,0 +1,137 @@
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Dict, List, Tuple
+from app import db
+from app.models import Category, RecipeIngredient, normalize_ingredient_name
+from app.models.recipe import Recipe
+from app.services.ingredient_resolver import ingredient_resolver
+from app.services.search_service import SearchService
+from app.services.slug_service import save_with_slug
+
+# Recipe columns the owner may change through PUT / PATCH
+EDITABLE_FIELDS = ['title', 'description', 'instructions', 'prep_time', 'cook_time', 'total_time',
+                   'servings', 'difficulty', 'image_url', 'is_published', 'is_featured', 'category_id',
+                   'calories_per_serving', 'protein', 'carbs', 'fat', 'fiber']
+
+NUTRITION_FIELDS = ['calories_per_serving', 'protein', 'carbs', 'fat', 'fiber']
+
+# Columns copied into the search index
+SEARCHABLE_FIELDS = ('title', 'description', 'instructions')
+
+class RecipeService:
+
+    @staticmethod
+    def apply_changes(recipe: Recipe, changes: Dict) -> bool:
+        """
+        Apply an API change set to `recipe`: EDITABLE_FIELDS, 'category_ids'
+        (or the legacy 'category_id') and 'ingredients'. Only values that
+        differ are written, so editing one field is one UPDATE; the lookups
+        run under no_autoflush so all changes go out in a single flush; a new
+        title is saved first, on its own, together with its slug.
+        Refreshes the search index when its inputs changed.
+        Returns True if anything changed.
+        """
+        with db.session.no_autoflush:
+            indexed_before = tuple(getattr(recipe, field) for field in SEARCHABLE_FIELDS)
+            changed = False
+            if changes.get('title') and changes['title'] != recipe.title:
+                save_with_slug(recipe, changes['title'])
+                changed = True
+            for field in EDITABLE_FIELDS:
+                if field in changes and getattr(recipe, field) != changes[field]:
+                    setattr(recipe, field, changes[field])
+                    changed = True
+
+            # Categories and ingredients are diffed against the stored ones
+            children_changed = False
+            if 'category_ids' in changes:
+                children_changed |= RecipeService.sync_categories(recipe, changes['category_ids'] or [])
+            elif 'category_id' in changes:
+                # Fallback: single category update for backward compatibility
+                children_changed |= RecipeService.sync_categories(recipe, [changes['category_id']])
+
+            ingredients_added_or_removed = False
+            if 'ingredients' in changes:
+                lines_changed, ingredients_added_or_removed = RecipeService.sync_ingredients(
+                    recipe, changes['ingredients'] or []
+                )
+                children_changed |= lines_changed
+
+            if children_changed and not changed:
+                # The recipe row carries the version, so child edits must bump it too
+                recipe.updated_at = datetime.utcnow()
+
+        if ingredients_added_or_removed or tuple(getattr(recipe, field) for field in SEARCHABLE_FIELDS) != indexed_before:
+            SearchService.index_recipe(recipe.id)
+        return changed or children_changed
+
+    @staticmethod
+    def sync_categories(recipe: Recipe, category_ids: List[int]) -> bool:
+        """
+        Make the recipe's categories exactly `category_ids` (unknown ids are
+        ignored) by removing and adding only the links that differ.
+        Returns True if any link changed.
+        """
+        wanted = list(dict.fromkeys(int(category_id) for category_id in category_ids if category_id))
+        current = {category.id: category for category in recipe.categories}
+
+        changed = False
+        for category_id, category in current.items():
+            if category_id not in wanted:
+                recipe.categories.remove(category)
+                changed = True
+
+        to_add = [category_id for category_id in wanted if category_id not in current]
+        if to_add:
+            for category in Category.query.filter(Category.id.in_(to_add)):
+                recipe.categories.append(category)
+                changed = True
+        return changed
+
+    @staticmethod
+    def sync_ingredients(recipe: Recipe, ingredients_data: List[Dict]) -> Tuple[bool, bool]:
+        """
+        Make the recipe's ingredient lines match `ingredients_data` (the API
+        payload; lines without name or quantity are skipped, and a line's
+        order is its index in the payload).
+
+        Stored lines are matched to incoming ones by ingredient, in order;
+        matched lines are updated only where a value differs, the rest are
+        inserted or deleted. The flush sends each kind as one executemany.
+        Returns (any line changed, lines added or removed); the latter
+        changes the ingredient names in the search index.
+        """
+        lines = [(order, item) for order, item in enumerate(ingredients_data)
+                 if item.get('name') and item.get('quantity')]
+        resolved = ingredient_resolver.resolve([item for _, item in lines])
+
+        stored = defaultdict(deque)
+        for row in RecipeIngredient.query.filter_by(recipe_id=recipe.id).order_by(
+                RecipeIngredient.order, RecipeIngredient.id):
+            stored[row.ingredient_id].append(row)
+
+        added = updated = False
+        for order, item in lines:
+            ingredient_id, default_unit = resolved[normalize_ingredient_name(item['name'])]
+            values = {
+                'quantity': float(item['quantity']),
+                'unit': item.get('unit', default_unit),
+                'notes': item.get('notes', ''),
+                'order': order
+            }
+            if stored[ingredient_id]:
+                row = stored[ingredient_id].popleft()
+                for field, value in values.items():
+                    if getattr(row, field) != value:
+                        setattr(row, field, value)
+                        updated = True
+            else:
+                db.session.add(RecipeIngredient(recipe_id=recipe.id, ingredient_id=ingredient_id, **values))
+                added = True
+
+        removed = False
+        for rows in stored.values():
+            for row in rows:
+                db.session.delete(row)
+                removed = True
+        return added or removed or updated, added or removed
@@ -0,0 +1,142 @@
+import html
+import re
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import bindparam, text
+from app import db
+
+# BM25 column weights: title, description, instructions, ingredients
+BM25_WEIGHTS = (10.0, 4.0, 1.0, 3.0)
+
+# One row per recipe, rowid = recipes.id. Publish state and filters are applied
+# by joining back to recipes, so toggling publish needs no reindex.
+CREATE_INDEX_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5(
+        title, description, instructions, ingredients,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+"""
+
+INDEX_ROWS_SQL = """
+    INSERT INTO recipes_fts (rowid, title, description, instructions, ingredients)
+    SELECT r.id, r.title, coalesce(r.description, ''), coalesce(r.instructions, ''),
+           coalesce((SELECT group_concat(i.name, ', ')
+                     FROM recipe_ingredients ri
+                     JOIN ingredients i ON i.id = ri.ingredient_id
+                     WHERE ri.recipe_id = r.id), '')
+    FROM recipes r
+"""
+
+# highlight()/snippet() wrap matches in these; the text is HTML-escaped
+# before they become <mark> tags (private-use characters, not in recipes)
+MATCH_START = '\ue000'
+MATCH_END = '\ue001'
+
+class SearchService:
+
+    @staticmethod
+    def ensure_index():
+        """Create the FTS5 table if it does not exist yet"""
+        db.session.execute(text(CREATE_INDEX_SQL))
+        db.session.commit()
+
+    @staticmethod
+    def index_recipe(recipe_id: int):
+        """
+        (Re)index one recipe inside the caller's transaction.
+        Call after the recipe and its ingredients have been added.
+        """
+        db.session.flush()
+        db.session.execute(text("DELETE FROM recipes_fts WHERE rowid = :id"), {'id': recipe_id})
+        db.session.execute(text(INDEX_ROWS_SQL + " WHERE r.id = :id"), {'id': recipe_id})
+
+    @staticmethod
+    def index_recipes(recipe_ids: List[int]):
+        """(Re)index many recipes with one statement, inside the caller's transaction"""
+        if not recipe_ids:
+            return
+        params = {'ids': list(recipe_ids)}
+        db.session.execute(
+            text("DELETE FROM recipes_fts WHERE rowid IN :ids").bindparams(bindparam('ids', expanding=True)), params
+        )
+        db.session.execute(
+            text(INDEX_ROWS_SQL + " WHERE r.id IN :ids").bindparams(bindparam('ids', expanding=True)), params
+        )
+
+    @staticmethod
+    def remove_recipe(recipe_id: int):
+        """Drop a recipe from the index inside the caller's transaction"""
+        db.session.execute(text("DELETE FROM recipes_fts WHERE rowid = :id"), {'id': recipe_id})
+
+    @staticmethod
+    def rebuild_index() -> int:
+        """Rebuild the whole index from the recipes tables in one pass"""
+        db.session.execute(text(CREATE_INDEX_SQL))
+        db.session.execute(text("DELETE FROM recipes_fts"))
+        result = db.session.execute(text(INDEX_ROWS_SQL))
+        db.session.execute(text("INSERT INTO recipes_fts (recipes_fts) VALUES ('optimize')"))
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def build_match_query(query: str) -> Optional[str]:
+        """
+        Turn free user input into a safe FTS5 MATCH expression: every word is
+        quoted (so FTS syntax characters are inert) and the last one is a prefix.
+        """
+        terms = re.findall(r'\w+', query, re.UNICODE)
+        if not terms:
+            return None
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += '*'
+        return ' '.join(quoted)
+
+    @staticmethod
+    def search(query: str, page: int = 1, per_page: int = 12, category_id: Optional[int] = None,
+               difficulty: Optional[str] = None) -> Tuple[List[Dict], int]:
+        """
+        BM25-ranked search over published recipes.
+        Returns ([{'id', 'title_highlight', 'snippet'}, ...], total) for the requested page.
+        Highlights are HTML: recipe text escaped, matches wrapped in <mark>.
+        """
+        match = SearchService.build_match_query(query)
+        if not match:
+            return [], 0
+
+        filters = "recipes_fts MATCH :match AND r.is_published = 1"
+        params = {'match': match}
+        if category_id:
+            filters += " AND r.category_id = :category_id"
+            params['category_id'] = category_id
+        if difficulty:
+            filters += " AND r.difficulty = :difficulty"
+            params['difficulty'] = difficulty
+
+        # CROSS JOIN pins the FTS table as the outer loop; otherwise SQLite may scan
+        # published recipes and run one full-text lookup per row
+        total = db.session.execute(text(
+            f"SELECT count(*) FROM recipes_fts CROSS JOIN recipes r ON r.id = recipes_fts.rowid WHERE {filters}"
+        ), params).scalar()
+
+        weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+        rows = db.session.execute(text(f"""
+            SELECT recipes_fts.rowid AS id,
+                   highlight(recipes_fts, 0, :match_start, :match_end) AS title_highlight,
+                   snippet(recipes_fts, -1, :match_start, :match_end, '…', 16) AS snippet
+            FROM recipes_fts
+            CROSS JOIN recipes r ON r.id = recipes_fts.rowid
+            WHERE {filters}
+            ORDER BY bm25(recipes_fts, {weights})
+            LIMIT :limit OFFSET :offset
+        """), {**params, 'match_start': MATCH_START, 'match_end': MATCH_END,
+               'limit': per_page, 'offset': (page - 1) * per_page}).mappings().all()
+
+        return [{
+            'id': row['id'],
+            'title_highlight': _marked_html(row['title_highlight']),
+            'snippet': _marked_html(row['snippet'])
+        } for row in rows], total
+
+def _marked_html(value: Optional[str]) -> str:
+    """Escape highlighted recipe text, then turn the match markers into <mark> tags"""
+    escaped = html.escape(value or '')
+    return escaped.replace(MATCH_START, '<mark>').replace(MATCH_END, '</mark>')
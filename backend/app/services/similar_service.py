@@ -0,0 +1,234 @@
+import hashlib
+import math
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.orm import joinedload
+from app import db
+from app.models import Recipe, RecipeIngredient, recipe_categories, recipe_similar, recipe_similar_state
+from app.services.version_service import bump_versions
+from app.utils.response_cache import response_cache
+
+# Neighbours stored per recipe; the API shows a prefix of them
+TOP_K = 20
+
+# Recipes whose neighbours are computed and written per transaction
+DEFAULT_BATCH_SIZE = 100
+
+# A shared category counts for this fraction of a shared ingredient of equal IDF
+CATEGORY_WEIGHT = 0.5
+
+# Best ingredient matches per recipe that categories get to re-rank, per stored neighbour
+CANDIDATE_FACTOR = 3
+
+# Ingredients in more than this share of all recipes (and more than
+# COMMON_INGREDIENT_MIN_RECIPES of them), like salt or oil, say little about
+# similarity but would make every recipe a candidate for every other; ignored
+COMMON_INGREDIENT_SHARE = 0.1
+COMMON_INGREDIENT_MIN_RECIPES = 100
+
+# Ids per IN (...) when looking up or deleting lists
+LOOKUP_CHUNK = 500
+
+# Vector rows per executemany into the temp table
+WRITE_CHUNK = 10000
+
+# Unit-length TF-IDF vectors, one row per (recipe, feature); lives on the job's connection
+CREATE_FEATURES_SQL = [
+    "DROP TABLE IF EXISTS temp.similar_features",
+    "CREATE TEMP TABLE similar_features (recipe_id INTEGER NOT NULL, feature INTEGER NOT NULL, weight REAL NOT NULL)",
+]
+INDEX_FEATURES_SQL = [
+    "CREATE INDEX temp.ix_similar_features_recipe ON similar_features (recipe_id, feature, weight)",
+    "CREATE INDEX temp.ix_similar_features_feature ON similar_features (feature, recipe_id, weight)",
+]
+
+# Cosine similarity is the dot product of unit vectors: joining a recipe's
+# rows to every row with the same feature and summing the weight products is
+# its row of the sparse product (features x recipes)^T . (features x recipes),
+# done by SQLite. Candidates are the recipes sharing an ingredient; categories,
+# which every recipe shares with thousands of others, only re-rank the best
+# :candidates of them. Run with executemany, one parameter set per recipe.
+TOP_K_SQL = """
+    INSERT INTO recipe_similar (recipe_id, rank, similar_recipe_id, score)
+    SELECT :recipe_id, row_number() OVER (ORDER BY score DESC, similar_recipe_id), similar_recipe_id, score
+    FROM (
+        SELECT similar_recipe_id,
+               score + coalesce((
+                   SELECT sum(a.weight * b.weight)
+                   FROM similar_features a
+                   JOIN similar_features b ON b.recipe_id = candidates.similar_recipe_id AND b.feature = a.feature
+                   WHERE a.recipe_id = :recipe_id AND a.feature < 0
+               ), 0) AS score
+        FROM (
+            SELECT c.recipe_id AS similar_recipe_id, sum(q.weight * c.weight) AS score
+            FROM similar_features q
+            JOIN similar_features c ON c.feature = q.feature AND c.recipe_id != q.recipe_id
+            WHERE q.recipe_id = :recipe_id AND q.feature > 0
+            GROUP BY c.recipe_id
+            ORDER BY score DESC, c.recipe_id
+            LIMIT :candidates
+        ) AS candidates
+    )
+    ORDER BY score DESC, similar_recipe_id
+    LIMIT :top_k
+"""
+
+class SimilarRecipeService:
+    """
+    "Similar recipes" from ingredient and category overlap. Each recipe is a
+    sparse TF-IDF vector over its ingredients and categories (binary term
+    frequency, smoothed IDF, categories scaled by CATEGORY_WEIGHT, the most
+    common ingredients left out); its TOP_K cosine neighbours are stored in
+    recipe_similar by an offline job (`flask similar-recipes`), so the API
+    reads one index range.
+
+    Runs are incremental: only recipes whose ingredients or categories changed
+    since their list was computed, plus the recipes whose lists mention a
+    changed or deleted recipe, are recomputed. Lists that should now gain a
+    changed recipe, and IDF drift as the corpus grows, are picked up by a
+    periodic `--full` run.
+    """
+
+    @staticmethod
+    def refresh(full: bool = False, top_k: int = TOP_K, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict:
+        """Recompute stale neighbour lists; returns {'recipes', 'recomputed', 'removed', 'seconds'}"""
+        started = time.perf_counter()
+        with db.engine.connect() as conn:
+            features = SimilarRecipeService._load_features(conn)
+            signatures = {recipe_id: _signature(terms) for recipe_id, terms in features.items()}
+            stored = dict(conn.execute(select(recipe_similar_state.c.recipe_id, recipe_similar_state.c.signature)).all())
+
+            removed = [recipe_id for recipe_id in stored if recipe_id not in features]
+            if full:
+                stale = list(features)
+            else:
+                changed = [recipe_id for recipe_id, signature in signatures.items() if stored.get(recipe_id) != signature]
+                mentioning = SimilarRecipeService._lists_mentioning(conn, changed + removed)
+                stale = sorted(set(changed) | {recipe_id for recipe_id in mentioning if recipe_id in features})
+
+            if removed:
+                SimilarRecipeService._delete_lists(conn, removed)
+                bump_versions(conn, ['recipe_similar'])
+            if stale:
+                SimilarRecipeService._write_vectors(conn, features)
+                now = datetime.utcnow()
+                for start in range(0, len(stale), batch_size):
+                    batch = stale[start:start + batch_size]
+                    SimilarRecipeService._delete_lists(conn, batch)
+                    conn.execute(text(TOP_K_SQL), [
+                        {'recipe_id': recipe_id, 'top_k': top_k, 'candidates': top_k * CANDIDATE_FACTOR}
+                        for recipe_id in batch
+                    ])
+                    conn.execute(insert(recipe_similar_state), [
+                        {'recipe_id': recipe_id, 'signature': signatures[recipe_id], 'computed_at': now}
+                        for recipe_id in batch
+                    ])
+                    # Core writes skip the ORM listeners that bump table versions
+                    bump_versions(conn, ['recipe_similar'])
+                    conn.commit()
+                conn.execute(text("DROP TABLE temp.similar_features"))
+            conn.commit()
+
+        if stale or removed:
+            response_cache.evict('recipe-similar')
+        return {
+            'recipes': len(features),
+            'recomputed': len(stale),
+            'removed': len(removed),
+            'seconds': round(time.perf_counter() - started, 2)
+        }
+
+    @staticmethod
+    def similar_to(recipe_id: int, limit: int = 6) -> List[Recipe]:
+        """Published neighbours of a recipe, most similar first"""
+        return Recipe.query.options(
+            joinedload(Recipe.user),
+            joinedload(Recipe.category)
+        ).join(recipe_similar, recipe_similar.c.similar_recipe_id == Recipe.id).filter(
+            recipe_similar.c.recipe_id == recipe_id,
+            Recipe.is_published.is_(True)
+        ).order_by(recipe_similar.c.rank).limit(limit).all()
+
+    @staticmethod
+    def remove_recipe(recipe_id: int):
+        """
+        Drop a deleted recipe from the lists inside the caller's transaction:
+        its own list, and its rows in other lists, which would otherwise point
+        at a rowid SQLite may give to a new recipe. The lists it was removed
+        from keep their other neighbours (rank gaps are fine) and lose their
+        state rows, so the next run recomputes them.
+        """
+        mentioning = select(recipe_similar.c.recipe_id).where(recipe_similar.c.similar_recipe_id == recipe_id)
+        db.session.execute(delete(recipe_similar_state).where(
+            (recipe_similar_state.c.recipe_id == recipe_id) | recipe_similar_state.c.recipe_id.in_(mentioning)
+        ))
+        db.session.execute(delete(recipe_similar).where(
+            (recipe_similar.c.recipe_id == recipe_id) | (recipe_similar.c.similar_recipe_id == recipe_id)
+        ))
+
+    @staticmethod
+    def _load_features(conn) -> Dict[int, frozenset]:
+        # Ingredient ids as they are, category ids negated
+        features = {recipe_id: set() for recipe_id in conn.execute(select(Recipe.id)).scalars()}
+        for recipe_id, ingredient_id in conn.execute(
+                select(RecipeIngredient.recipe_id, RecipeIngredient.ingredient_id)):
+            if recipe_id in features:
+                features[recipe_id].add(ingredient_id)
+        for recipe_id, category_id in conn.execute(
+                select(recipe_categories.c.recipe_id, recipe_categories.c.category_id)):
+            if recipe_id in features:
+                features[recipe_id].add(-category_id)
+        return {recipe_id: frozenset(terms) for recipe_id, terms in features.items()}
+
+    @staticmethod
+    def _write_vectors(conn, features):
+        document_frequency = Counter(term for terms in features.values() for term in terms)
+        total = len(features)
+        common = max(COMMON_INGREDIENT_SHARE * total, COMMON_INGREDIENT_MIN_RECIPES)
+        idf = {
+            term: (math.log((1 + total) / (1 + count)) + 1) * (CATEGORY_WEIGHT if term < 0 else 1.0)
+            for term, count in document_frequency.items()
+            if term < 0 or count <= common
+        }
+
+        for statement in CREATE_FEATURES_SQL:
+            conn.execute(text(statement))
+        statement = text("INSERT INTO similar_features (recipe_id, feature, weight) VALUES (:recipe_id, :feature, :weight)")
+        rows = []
+        for recipe_id, terms in features.items():
+            terms = [term for term in terms if term in idf]
+            norm = math.sqrt(sum(idf[term] ** 2 for term in terms))
+            rows.extend({'recipe_id': recipe_id, 'feature': term, 'weight': idf[term] / norm} for term in terms)
+            if len(rows) >= WRITE_CHUNK:
+                conn.execute(statement, rows)
+                rows = []
+        if rows:
+            conn.execute(statement, rows)
+        # Indexed after the bulk insert, which is faster than maintaining them row by row
+        for statement in INDEX_FEATURES_SQL:
+            conn.execute(text(statement))
+
+    @staticmethod
+    def _lists_mentioning(conn, recipe_ids) -> set:
+        mentioning = set()
+        for start in range(0, len(recipe_ids), LOOKUP_CHUNK):
+            mentioning.update(conn.execute(
+                select(recipe_similar.c.recipe_id).distinct().where(
+                    recipe_similar.c.similar_recipe_id.in_(recipe_ids[start:start + LOOKUP_CHUNK])
+                )
+            ).scalars())
+        return mentioning
+
+    @staticmethod
+    def _delete_lists(conn, recipe_ids):
+        """Delete the lists and state rows of `recipe_ids`"""
+        for start in range(0, len(recipe_ids), LOOKUP_CHUNK):
+            chunk = recipe_ids[start:start + LOOKUP_CHUNK]
+            conn.execute(delete(recipe_similar).where(recipe_similar.c.recipe_id.in_(chunk)))
+            conn.execute(delete(recipe_similar_state).where(recipe_similar_state.c.recipe_id.in_(chunk)))
+
+def _signature(terms) -> str:
+    return hashlib.md5(','.join(map(str, sorted(terms))).encode()).hexdigest()
@@ -0,0 +1,76 @@
+import re
+import unicodedata
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.recipe import Recipe
+
+# recipes.slug is VARCHAR(250); leave room for a '-<n>' suffix
+SLUG_MAX_LENGTH = 240
+
+# Saves that lose a slug to a concurrent save are retried this often
+SLUG_ATTEMPTS = 5
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+def slugify(title, fallback='recipe'):
+    """
+    URL slug for a title: accents folded ('Soto Ayam Bétawi' -> 'soto-ayam-betawi'),
+    punctuation and whitespace runs collapsed into single dashes, lower case.
+    Letters without an ASCII form (e.g. CJK) are kept as they are.
+    """
+    decomposed = unicodedata.normalize('NFKD', title or '')
+    folded = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    slug = _NON_WORD.sub('-', unicodedata.normalize('NFC', folded).casefold()).strip('-')
+    return slug[:SLUG_MAX_LENGTH].rstrip('-') or fallback
+
+def highest_suffix(base, exclude_id=None):
+    """
+    Highest suffix in use for `base`: 0 if neither base nor base-<n> exists,
+    1 if only the bare base does, n for base-<n>. One indexed range scan over
+    slug >= 'base' AND slug < 'base.' (every slug starting with 'base-'),
+    which unlike LIKE 'base%' can use the unique index on slug in SQLite.
+    """
+    statement = select(Recipe.slug).where(Recipe.slug >= base, Recipe.slug < base + '.')
+    if exclude_id is not None:
+        statement = statement.where(Recipe.id != exclude_id)
+
+    highest = 0
+    for slug in db.session.execute(statement).scalars():
+        match = _match_base(base, slug)
+        if match:
+            highest = max(highest, int(match.group(1)) if match.group(1) else 1)
+    return highest
+
+def next_free_slug(base, exclude_id=None):
+    """base if it is free, else base-<n> with n one above the highest in use"""
+    highest = highest_suffix(base, exclude_id)
+    return base if highest == 0 else f'{base}-{highest + 1}'
+
+def save_with_slug(recipe, title):
+    """
+    Give `recipe` a free slug for `title` and flush it. Free slugs are not
+    reserved, so another save may take ours first; the unique constraint
+    then fails inside a savepoint and we retry with the next suffix.
+
+    The savepoint rollback expires the recipe, so call this before making
+    other changes in the session (create_recipe adds the recipe first,
+    RecipeService.apply_changes saves the title first).
+    """
+    base = slugify(title)
+    for attempt in range(SLUG_ATTEMPTS):
+        try:
+            with db.session.begin_nested():
+                # A saved recipe keeps its slug while the title still maps to it
+                if not (inspect(recipe).persistent and _match_base(base, recipe.slug)):
+                    recipe.slug = next_free_slug(base, exclude_id=recipe.id)
+                recipe.title = title
+                db.session.add(recipe)
+                db.session.flush()
+            return recipe.slug
+        except IntegrityError as e:
+            if 'slug' not in str(e.orig) or attempt == SLUG_ATTEMPTS - 1:
+                raise
+
+def _match_base(base, slug):
+    return re.fullmatch(re.escape(base) + r'(?:-(\d+))?', slug)
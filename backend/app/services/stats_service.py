@@ -0,0 +1,181 @@
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import event, func, case, desc, inspect
+from app import db
+from app.models import User, Recipe, Category, Rating
+from app.utils.read_routing import on_primary
+
+RECENT_USER_DAYS = 30
+
+class StatsSnapshot:
+    """
+    In-memory snapshot of the platform statistics shown by /api/recipes/stats
+    and /api/admin/dashboard.
+
+    Committed ORM writes adjust the counters incrementally (see the session
+    listeners below); the whole snapshot is recomputed from the database once
+    it is older than STATS_REFRESH_INTERVAL seconds, which also picks up writes
+    made by other worker processes. `as_of` is the time of the last full recompute.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._counters = Counter()
+        self._top_categories = []
+        self.as_of = None
+        self.refresh_interval = 300
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('STATS_REFRESH_INTERVAL', 300)
+        self.refresh_interval = int(app.config['STATS_REFRESH_INTERVAL'])
+        self.invalidate()
+        app.extensions['stats_snapshot'] = self
+
+    def get(self):
+        """Return (counters, top_categories, as_of), recomputing first if the snapshot is stale"""
+        if self._is_stale() and self._refresh_lock.acquire(blocking=self.as_of is None):
+            # One thread recomputes; the others keep serving the previous snapshot
+            try:
+                if self._is_stale():
+                    # Committed deltas are folded in on top, so the base must not lag behind them
+                    with on_primary():
+                        self.recompute()
+            finally:
+                self._refresh_lock.release()
+
+        with self._lock:
+            return Counter(self._counters), list(self._top_categories), self.as_of
+
+    def apply(self, deltas):
+        """Fold committed deltas into the snapshot"""
+        if not deltas:
+            return
+        with self._lock:
+            if self.as_of is not None:
+                self._counters.update(deltas)
+
+    def invalidate(self):
+        with self._lock:
+            self.as_of = None
+
+    def recompute(self):
+        """Rebuild every counter from the database"""
+        recent_since = datetime.utcnow() - timedelta(days=RECENT_USER_DAYS)
+        counters = Counter()
+
+        users = db.session.query(
+            func.count(User.id),
+            func.sum(case((User.is_active == True, 1), else_=0)),
+            func.sum(case((User.created_at >= recent_since, 1), else_=0))
+        ).one()
+        counters['users_total'], counters['users_active'], counters['users_recent'] = [value or 0 for value in users]
+
+        for role, count in db.session.query(User.role, func.count(User.id)).group_by(User.role):
+            counters[f'role:{role}'] = count
+
+        recipes = db.session.query(
+            func.count(Recipe.id),
+            func.sum(case((Recipe.is_published == True, 1), else_=0)),
+            func.sum(case(((Recipe.is_published == True) & (Recipe.is_featured == True), 1), else_=0)),
+            func.sum(case((Recipe.is_published == True, Recipe.view_count), else_=0)),
+            func.sum(case((Recipe.is_published == True, Recipe.like_count), else_=0))
+        ).one()
+        (counters['recipes_total'], counters['recipes_published'], counters['recipes_featured'],
+         counters['views_published'], counters['likes_published']) = [value or 0 for value in recipes]
+
+        categories = db.session.query(
+            func.count(Category.id),
+            func.sum(case((Category.is_active == True, 1), else_=0))
+        ).one()
+        counters['categories_total'], counters['categories_active'] = [value or 0 for value in categories]
+
+        ratings = db.session.query(func.count(Rating.id), func.sum(Rating.rating)).one()
+        counters['ratings_total'], counters['ratings_sum'] = [value or 0 for value in ratings]
+
+        top_categories = db.session.query(
+            Category.name,
+            Category.icon,
+            func.count(Recipe.id).label('recipe_count')
+        ).join(Recipe).filter(
+            Recipe.is_published == True,
+            Category.is_active == True
+        ).group_by(Category.id).order_by(desc('recipe_count')).limit(3).all()
+
+        with self._lock:
+            self._counters = counters
+            self._top_categories = [
+                {'name': cat.name, 'icon': cat.icon, 'recipe_count': cat.recipe_count}
+                for cat in top_categories
+            ]
+            self.as_of = datetime.utcnow()
+
+    def _is_stale(self):
+        return self.as_of is None or datetime.utcnow() - self.as_of > timedelta(seconds=self.refresh_interval)
+
+stats_snapshot = StatsSnapshot()
+
+def _contribution(obj, get):
+    """What one row adds to the counters, reading attribute values through `get`"""
+    counters = Counter()
+    if isinstance(obj, User):
+        counters['users_total'] += 1
+        if get('is_active') is not False:
+            counters['users_active'] += 1
+        created_at = get('created_at')
+        if created_at and created_at >= datetime.utcnow() - timedelta(days=RECENT_USER_DAYS):
+            counters['users_recent'] += 1
+        counters[f"role:{get('role') or 'user'}"] += 1
+    elif isinstance(obj, Recipe):
+        counters['recipes_total'] += 1
+        if get('is_published'):
+            counters['recipes_published'] += 1
+            counters['views_published'] += get('view_count') or 0
+            counters['likes_published'] += get('like_count') or 0
+            if get('is_featured'):
+                counters['recipes_featured'] += 1
+    elif isinstance(obj, Category):
+        counters['categories_total'] += 1
+        if get('is_active') is not False:
+            counters['categories_active'] += 1
+    elif isinstance(obj, Rating):
+        counters['ratings_total'] += 1
+        counters['ratings_sum'] += get('rating') or 0
+    return counters
+
+def _previous_value(obj, key):
+    attribute = inspect(obj).attrs[key]
+    history = attribute.history
+    return history.deleted[0] if history.deleted else attribute.value
+
+@event.listens_for(db.session, 'after_flush')
+def _collect_stats_deltas(session, flush_context):
+    try:
+        _collect_flush_deltas(session, session.info.setdefault('stats_deltas', Counter()))
+    except Exception as e:
+        # Never fail a write over statistics; fall back to a full recompute
+        current_app.logger.warning('Stats delta collection failed: %s', e)
+        stats_snapshot.invalidate()
+
+def _collect_flush_deltas(session, deltas):
+    for obj in session.new:
+        deltas.update(_contribution(obj, lambda key: getattr(obj, key)))
+    for obj in session.deleted:
+        deltas.subtract(_contribution(obj, lambda key: getattr(obj, key)))
+    for obj in session.dirty:
+        if not session.is_modified(obj):
+            continue
+        deltas.update(_contribution(obj, lambda key: getattr(obj, key)))
+        deltas.subtract(_contribution(obj, lambda key: _previous_value(obj, key)))
+
+@event.listens_for(db.session, 'after_commit')
+def _apply_stats_deltas(session):
+    stats_snapshot.apply(session.info.pop('stats_deltas', None))
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_stats_deltas(session):
+    session.info.pop('stats_deltas', None)
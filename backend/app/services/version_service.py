@@ -0,0 +1,81 @@
+from datetime import datetime
+from sqlalchemy import event, update
+from sqlalchemy.dialects import postgresql, sqlite
+from app import db
+from app.models.table_version import TableVersion
+
+# Writes to these tables never bump a version (the counter table itself)
+UNVERSIONED_TABLES = {TableVersion.__tablename__}
+
+# Dialects with a single-statement upsert (INSERT ... ON CONFLICT DO UPDATE)
+UPSERT_INSERTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+def bump_versions(connection, table_names):
+    """Increment the version of each table on `connection`, inside the caller's transaction"""
+    table_names = sorted(set(table_names) - UNVERSIONED_TABLES)
+    if not table_names:
+        return
+
+    now = datetime.utcnow()
+    table = TableVersion.__table__
+    insert = UPSERT_INSERTS.get(connection.dialect.name)
+    if insert is None:
+        # No portable upsert: bump the existing rows, then create the missing ones
+        connection.execute(
+            update(table).where(table.c.table_name.in_(table_names))
+            .values(version=table.c.version + 1, updated_at=now)
+        )
+        existing = set(connection.execute(
+            table.select().with_only_columns(table.c.table_name).where(table.c.table_name.in_(table_names))
+        ).scalars())
+        missing = [name for name in table_names if name not in existing]
+        if missing:
+            connection.execute(table.insert(), [
+                {'table_name': name, 'version': 1, 'updated_at': now} for name in missing
+            ])
+        return
+
+    statement = insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[TableVersion.table_name],
+        set_={
+            'version': table.c.version + 1,
+            'updated_at': statement.excluded.updated_at
+        }
+    )
+    connection.execute(statement, [
+        {'table_name': name, 'version': 1, 'updated_at': now} for name in table_names
+    ])
+
+def _written_tables(session):
+    return session.info.setdefault('versioned_tables', set())
+
+@event.listens_for(db.session, 'after_flush')
+def _collect_flushed_tables(session, flush_context):
+    tables = _written_tables(session)
+    for obj in list(session.new) + list(session.deleted):
+        tables.add(obj.__table__.name)
+    for obj in session.dirty:
+        if session.is_modified(obj):
+            tables.add(obj.__table__.name)
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _collect_bulk_tables(orm_execute_state):
+    # ORM bulk UPDATE/DELETE (e.g. query.update()) bypasses the flush
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and orm_execute_state.bind_mapper:
+        _written_tables(orm_execute_state.session).add(orm_execute_state.bind_mapper.local_table.name)
+
+@event.listens_for(db.session, 'before_commit')
+def _bump_committed_tables(session):
+    # Commit flushes after this hook; flush now so every write of the transaction is counted
+    session.flush()
+    tables = session.info.pop('versioned_tables', None)
+    if tables:
+        # Once per table per commit, however many flushes and bulk statements wrote to it
+        bump_versions(session.connection(), tables)
+
+@event.listens_for(db.session, 'after_transaction_end')
+def _forget_tables(session, transaction):
+    # A rolled back transaction's writes never happened
+    if transaction.parent is None:
+        session.info.pop('versioned_tables', None)
@@ -0,0 +1,108 @@
+import atexit
+import threading
+from collections import Counter
+from sqlalchemy import bindparam, func
+from app import db
+from app.services.stats_service import stats_snapshot
+from app.services.version_service import bump_versions
+
+class ViewCounterBuffer:
+    """
+    Write-behind buffer for recipe view counts.
+
+    Request threads only bump an in-process counter; a background thread
+    folds the pending increments into recipes.view_count with one batched
+    UPDATE every VIEW_COUNT_FLUSH_INTERVAL seconds, or sooner once
+    VIEW_COUNT_FLUSH_THRESHOLD views are pending. Pending views are flushed
+    on interpreter shutdown, so a crash loses at most one window.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._events = 0
+        self._wakeup = threading.Event()
+        self._thread = None
+        self.interval = 5.0
+        self.threshold = 100
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('VIEW_COUNT_FLUSH_INTERVAL', 5.0)
+        app.config.setdefault('VIEW_COUNT_FLUSH_THRESHOLD', 100)
+        self.app = app
+        self.interval = float(app.config['VIEW_COUNT_FLUSH_INTERVAL'])
+        self.threshold = int(app.config['VIEW_COUNT_FLUSH_THRESHOLD'])
+        app.extensions['view_counter'] = self
+
+    def record(self, recipe_id):
+        """Count one view of a recipe without touching the database"""
+        with self._lock:
+            self._pending[recipe_id] += 1
+            self._events += 1
+            if self._thread is None:
+                self._start()
+            if self._events >= self.threshold:
+                self._wakeup.set()
+
+    def pending(self, recipe_id):
+        """Views recorded for a recipe but not yet written"""
+        with self._lock:
+            return self._pending.get(recipe_id, 0)
+
+    @property
+    def depth(self):
+        """Number of views waiting to be flushed"""
+        with self._lock:
+            return self._events
+
+    def flush(self):
+        """Write all pending increments in one batched UPDATE; returns the number of recipes touched"""
+        with self._lock:
+            batch, self._pending = self._pending, Counter()
+            self._events = 0
+        if not batch or self.app is None:
+            return 0
+
+        recipes = db.Model.metadata.tables['recipes']
+        statement = recipes.update().where(
+            recipes.c.id == bindparam('recipe_id')
+        ).values(view_count=func.coalesce(recipes.c.view_count, 0) + bindparam('delta'))
+        rows = [{'recipe_id': recipe_id, 'delta': delta} for recipe_id, delta in batch.items()]
+
+        try:
+            with self.app.app_context():
+                try:
+                    db.session.execute(statement, rows)
+                    # Lets view-ordered responses (e.g. /popular) revalidate without
+                    # invalidating every other recipe response
+                    bump_versions(db.session.connection(), ['recipe_views'])
+                    db.session.commit()
+                finally:
+                    db.session.remove()
+        except Exception as e:
+            # Put the increments back so the next flush retries them
+            with self._lock:
+                self._pending.update(batch)
+                self._events += sum(batch.values())
+            self.app.logger.warning('View counter flush failed: %s', e)
+            return 0
+
+        # Only published recipes are viewable, so every flushed view counts towards the platform total
+        stats_snapshot.apply({'views_published': sum(batch.values())})
+        return len(rows)
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name='view-counter-flush', daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+view_counter = ViewCounterBuffer()
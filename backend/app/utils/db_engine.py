@@ -0,0 +1,169 @@
+import time
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import scoped_session
+
+# Requests with these methods only read; read routing sends them to a replica
+READ_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+# A transaction whose first statement is one of these begins IMMEDIATE
+WRITE_STATEMENTS = {'INSERT', 'UPDATE', 'DELETE', 'REPLACE'}
+
+DATABASE_SETTINGS = [
+    'SQLALCHEMY_DATABASE_URI',
+    'DB_POOL_SIZE', 'DB_MAX_OVERFLOW', 'DB_POOL_TIMEOUT', 'DB_POOL_RECYCLE',
+    'SQLITE_TUNING', 'SQLITE_PRAGMAS', 'DB_LOCK_RETRIES', 'DB_LOCK_RETRY_BACKOFF',
+    'DATABASE_READ_URL', 'DB_READ_SNAPSHOT', 'DB_READ_SNAPSHOT_INTERVAL', 'DB_READ_AFTER_WRITE_PIN'
+]
+
+# Pragmas that change the database file; skipped on read-only (mode=ro) connections
+WRITE_PRAGMAS = {'journal_mode', 'synchronous'}
+
+def load_database_settings(app, settings):
+    """Copy the database section of a config.py class onto the app config"""
+    for key in DATABASE_SETTINGS:
+        if hasattr(settings, key):
+            app.config[key] = getattr(settings, key)
+
+def is_memory_sqlite(url):
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+def configure_engine_options(app):
+    """Build SQLALCHEMY_ENGINE_OPTIONS from the pool settings (call before db.init_app)"""
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if not is_memory_sqlite(app.config['SQLALCHEMY_DATABASE_URI']):
+        options.setdefault('pool_size', app.config.get('DB_POOL_SIZE', 10))
+        options.setdefault('max_overflow', app.config.get('DB_MAX_OVERFLOW', 20))
+        options.setdefault('pool_timeout', app.config.get('DB_POOL_TIMEOUT', 30))
+        options.setdefault('pool_recycle', app.config.get('DB_POOL_RECYCLE', 3600))
+        options.setdefault('pool_pre_ping', True)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+def init_engines(app, db):
+    """Tune every engine of the app (call after db.init_app); see tune_sqlite_engine"""
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        tune_sqlite_engine(app, engine)
+    # One session serves every app
+    if not event.contains(db.session, 'after_begin', _begin_immediate):
+        event.listen(db.session, 'after_begin', _begin_immediate)
+
+def _begin_immediate(session, transaction, connection):
+    # Set by run_write_transaction; read when the first statement runs
+    if session.info.pop('sqlite_begin_immediate', False):
+        connection.info['sqlite_begin_immediate'] = True
+
+def tune_sqlite_engine(app, engine):
+    """
+    Attach the SQLite connection setup to an engine. Creating the listeners
+    does not open a connection.
+
+    Each new connection gets SQLITE_PRAGMAS; read-only (mode=ro) engines
+    skip WRITE_PRAGMAS. pysqlite's implicit BEGIN is replaced by our own,
+    emitted just before a transaction's first statement: IMMEDIATE if that
+    statement writes, so a pure writer waits for the lock up front (where
+    busy_timeout applies), DEFERRED otherwise. A transaction that reads
+    first takes the write lock only at its first write, so requests never
+    hold it through work that is not database work (e.g. password hashing).
+    "database is locked" at BEGIN is retried DB_LOCK_RETRIES times with
+    exponential backoff. Units of work that read before they write should
+    use run_write_transaction, which begins IMMEDIATE and retries them.
+    """
+    if not app.config.get('SQLITE_TUNING', True) or engine.dialect.name != 'sqlite':
+        return
+
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    if engine.url.query.get('mode') == 'ro':
+        pragmas = {name: value for name, value in pragmas.items() if name not in WRITE_PRAGMAS}
+    retries = int(app.config.get('DB_LOCK_RETRIES', 5))
+    backoff = float(app.config.get('DB_LOCK_RETRY_BACKOFF', 0.05))
+
+    @event.listens_for(engine, 'connect')
+    def _configure_connection(dbapi_connection, connection_record):
+        # Autocommit at the driver level; _begin_before_first_statement emits BEGIN itself
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                try:
+                    cursor.execute(f'PRAGMA {name}={value}')
+                except Exception as e:
+                    # e.g. journal_mode on a read-only database file
+                    print(f"Could not apply PRAGMA {name}: {str(e)}")
+        finally:
+            cursor.close()
+
+    @event.listens_for(engine, 'begin')
+    def _begin(connection):
+        # The first statement decides the kind of transaction
+        connection.info['sqlite_begin_pending'] = True
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _begin_before_first_statement(connection, cursor, statement, parameters, context, executemany):
+        immediate = connection.info.pop('sqlite_begin_immediate', False)
+        if not connection.info.pop('sqlite_begin_pending', False):
+            return
+        words = statement.split(None, 1)
+        if immediate or (words and words[0].upper() in WRITE_STATEMENTS):
+            begin = 'BEGIN IMMEDIATE'
+        else:
+            begin = 'BEGIN'
+        for attempt in range(retries + 1):
+            try:
+                cursor.execute(begin)
+                return
+            except Exception as e:
+                if not is_locked_error(e) or attempt == retries:
+                    raise
+                time.sleep(backoff * (2 ** attempt))
+
+    @event.listens_for(engine, 'commit')
+    @event.listens_for(engine, 'rollback')
+    def _end(connection):
+        # A transaction that never ran a statement never sent BEGIN
+        connection.info.pop('sqlite_begin_pending', None)
+        connection.info.pop('sqlite_begin_immediate', None)
+
+def run_write_transaction(session, work):
+    """
+    Run `work()`, a unit of work that reads and then writes through `session`
+    and commits, in a transaction that takes the write lock at BEGIN
+    (IMMEDIATE). A DEFERRED transaction that read a snapshot another writer
+    has since replaced cannot upgrade (SQLite answers "database is locked"
+    at once, without waiting); an IMMEDIATE one reads the current state.
+    If the lock still cannot be had, the unit is rolled back and run again,
+    DB_LOCK_RETRIES times with exponential backoff, so `work` must load what
+    it changes itself and have no effects outside the session.
+
+    An open read transaction on `session` is committed first, and so is the
+    unit's if `work` returns without committing; call this with no pending
+    changes. Returns what `work` returns.
+    """
+    if isinstance(session, scoped_session):
+        session = session()
+    retries = int(current_app.config.get('DB_LOCK_RETRIES', 5))
+    backoff = float(current_app.config.get('DB_LOCK_RETRY_BACKOFF', 0.05))
+    for attempt in range(retries + 1):
+        if session.in_transaction():
+            session.commit()
+        session.info['sqlite_begin_immediate'] = True
+        try:
+            result = work()
+            # A unit that found nothing to write still holds the lock
+            if session.in_transaction():
+                session.commit()
+            return result
+        except OperationalError as e:
+            session.rollback()
+            if not is_locked_error(e) or attempt == retries:
+                raise
+            time.sleep(backoff * (2 ** attempt))
+        finally:
+            session.info.pop('sqlite_begin_immediate', None)
+
+def is_locked_error(error):
+    return 'database is locked' in str(error) or 'database table is locked' in str(error)
@@ -1,7 +1,18 @@
 from functools import wraps
-from flask import jsonify
-from flask_jwt_extended import get_jwt_identity
-from app.models import User
+from flask import jsonify, g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from app.services.auth_cache import auth_cache
+
+def current_auth_user():
+    """
+    Authorization state (AuthState) of the caller, from the per-process auth
+    cache; None if the user no longer exists. Kept in flask.g, so the
+    decorators and the handler share one lookup per request.
+    """
+    if 'auth_user' not in g:
+        user_id = int(get_jwt_identity())
+        g.auth_user = auth_cache.get(user_id, min_version=get_jwt().get('auth_version'))
+    return g.auth_user
 
 def role_required(*allowed_roles):
     """
@@ -12,8 +23,7 @@ def role_required(*allowed_roles):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             try:
-                user_id = int(get_jwt_identity())
-                user = User.query.get(user_id)
+                user = current_auth_user()
                 
                 if not user:
                     return jsonify({'message': 'User not found'}), 401
@@ -48,8 +58,7 @@ def verified_user_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         try:
-            user_id = int(get_jwt_identity())
-            user = User.query.get(user_id)
+            user = current_auth_user()
             
             if not user:
                 return jsonify({'message': 'User not found'}), 401
@@ -0,0 +1,87 @@
+import hashlib
+from functools import wraps
+from flask import request, make_response
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from app.models.table_version import TableVersion
+
+def compute_validators(tables, per_user=False):
+    """
+    Build (etag, last_modified) for the current request from the version
+    counters of the tables its response is derived from. One primary-key
+    lookup on table_versions; nothing is serialized.
+    """
+    versions = TableVersion.get_versions(tables)
+
+    identity = ''
+    if per_user:
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity() or ''
+        except Exception:
+            identity = ''
+
+    key = '|'.join([request.full_path, str(identity)] + [
+        f'{name}:{versions[name][0]}' for name in sorted(versions)
+    ])
+    etag = hashlib.sha1(key.encode()).hexdigest()[:20]
+
+    timestamps = [updated_at for _, updated_at in versions.values() if updated_at]
+    last_modified = max(timestamps).replace(microsecond=0) if timestamps else None
+    return etag, last_modified
+
+def versioned_etag(version, etag=None):
+    """
+    ETag for a row with a version counter (e.g. recipes.version): '<version>',
+    or '<version>.<etag>' for a representation that also depends on other
+    tables. Every ETag of the row starts with its version, so a client can
+    send any of them as If-Match (see if_match_version).
+    """
+    return f'{version}.{etag}' if etag else str(version)
+
+def if_match_version(version):
+    """True if If-Match is '*' or names `version` in one of its tags (see versioned_etag)"""
+    if request.if_match.star_tag:
+        return True
+    return any(tag.split('.', 1)[0] == str(version) for tag in request.if_match)
+
+def is_not_modified(etag, last_modified):
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against the validators"""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+def with_validators(response, etag, last_modified, per_user=False):
+    """Attach validators to a 200 response and ask clients to revalidate before reuse"""
+    if response.status_code in (200, 304):
+        response.set_etag(etag)
+        if last_modified:
+            response.last_modified = last_modified
+        response.headers['Cache-Control'] = 'private, no-cache' if per_user else 'no-cache'
+        if per_user:
+            response.vary.add('Authorization')
+    return response
+
+def not_modified(etag, last_modified, per_user=False):
+    return with_validators(make_response('', 304), etag, last_modified, per_user)
+
+def conditional_get(*tables, per_user=False):
+    """
+    Decorator for read endpoints: answers 304 Not Modified without running the
+    view when the client's validators still match the given tables' versions.
+    Use per_user=True when the body depends on the caller (e.g. is_favorited).
+    Usage: @conditional_get('recipes', 'users')
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            etag, last_modified = compute_validators(tables, per_user)
+            if is_not_modified(etag, last_modified):
+                return not_modified(etag, last_modified, per_user)
+
+            response = make_response(f(*args, **kwargs))
+            return with_validators(response, etag, last_modified, per_user)
+
+        return decorated_function
+    return decorator
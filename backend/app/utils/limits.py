@@ -0,0 +1,228 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+from flask import g, request, jsonify
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+RATE_UNITS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Buckets idle this long are full again and can be forgotten
+IDLE_BUCKET_SECONDS = 3600
+
+def parse_rate(limit):
+    """'10/minute' -> (10, 60)"""
+    count, unit = limit.split('/')
+    return int(count), RATE_UNITS[unit.strip().rstrip('s')]
+
+class MemoryBucketStore:
+    """Token buckets of this process"""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def take(self, key, rate, burst):
+        """Take one token; returns seconds until one is available (0 if it was taken)"""
+        now = time.time()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            if tokens >= 1:
+                wait = 0.0
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            if len(self._buckets) >= self.max_keys and key not in self._buckets:
+                self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < IDLE_BUCKET_SECONDS}
+            self._buckets[key] = (tokens, now)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+class SQLiteBucketStore:
+    """Token buckets in a local SQLite file shared by every worker on the host"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._takes = 0
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL,
+                    updated_at REAL
+                )
+            """)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, rate, burst):
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT tokens, updated_at FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+            tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+            if tokens >= 1:
+                wait = 0.0
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            conn.execute("INSERT OR REPLACE INTO rate_buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                         (key, tokens, now))
+            self._takes += 1
+            if self._takes % 1000 == 0:
+                conn.execute("DELETE FROM rate_buckets WHERE updated_at < ?", (now - IDLE_BUCKET_SECONDS,))
+        return wait
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM rate_buckets")
+
+class RateLimiter:
+    """
+    Token-bucket limits per route group, keyed by client IP or user.
+
+    Each group in RATE_LIMITS has a sustained rate ('10/minute'), a burst
+    (bucket size, default the rate's count) and `per`: 'ip', or 'user' (the
+    JWT identity, falling back to the IP for anonymous callers). A request
+    over its limit gets 429 with Retry-After.
+
+    Config:
+        RATE_LIMIT_ENABLED  default True
+        RATE_LIMITS         {group: {'limit': '10/minute', 'burst': 10, 'per': 'ip'}}
+        RATE_LIMIT_STORAGE  'memory' (per process, default) or 'sqlite' (shared by the workers)
+        RATE_LIMIT_PATH     SQLite file for the 'sqlite' storage
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self.limits = {}
+        self.store = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RATE_LIMIT_ENABLED', True)
+        app.config.setdefault('RATE_LIMITS', {
+            'auth': {'limit': '10/minute', 'per': 'ip'},
+            'search': {'limit': '60/minute', 'burst': 20, 'per': 'user'},
+            'stats': {'limit': '120/minute', 'burst': 30, 'per': 'ip'}
+        })
+        app.config.setdefault('RATE_LIMIT_STORAGE', 'memory')
+        app.config.setdefault('RATE_LIMIT_PATH', os.path.join(app.instance_path, 'rate_limits.db'))
+
+        self.enabled = bool(app.config['RATE_LIMIT_ENABLED'])
+        self.limits = {}
+        for group, rule in app.config['RATE_LIMITS'].items():
+            count, period = parse_rate(rule['limit'])
+            self.limits[group] = (count / period, float(rule.get('burst', count)), rule.get('per', 'ip'))
+
+        if app.config['RATE_LIMIT_STORAGE'] == 'sqlite':
+            os.makedirs(os.path.dirname(app.config['RATE_LIMIT_PATH']), exist_ok=True)
+            self.store = SQLiteBucketStore(app.config['RATE_LIMIT_PATH'])
+        else:
+            self.store = MemoryBucketStore()
+        app.extensions['rate_limiter'] = self
+
+    def limit(self, group):
+        """Decorator applying the RATE_LIMITS rule of `group` to a view"""
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                rule = self.limits.get(group)
+                if not self.enabled or rule is None:
+                    return f(*args, **kwargs)
+
+                rate, burst, per = rule
+                try:
+                    wait = self.store.take(f'{group}:{_client_key(per)}', rate, burst)
+                except Exception as e:
+                    # Fail open: a broken limiter store must not take the API down
+                    print(f"Rate limiter failed: {str(e)}")
+                    wait = 0.0
+                if wait > 0:
+                    retry_after = max(1, math.ceil(wait))
+                    response = jsonify({'message': 'Too many requests, please slow down',
+                                        'retry_after': retry_after})
+                    response.status_code = 429
+                    response.headers['Retry-After'] = str(retry_after)
+                    return response
+                return f(*args, **kwargs)
+
+            return decorated_function
+        return decorator
+
+class LoadShedder:
+    """
+    Caps the requests this process handles at once. Past MAX_IN_FLIGHT_REQUESTS
+    new requests get an immediate 503 with Retry-After instead of queuing
+    behind the busy ones until the client times out.
+
+    Config:
+        MAX_IN_FLIGHT_REQUESTS  per process; 0 disables shedding (default 64)
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.limit = 64
+        self.shed = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('MAX_IN_FLIGHT_REQUESTS', 64)
+        self.limit = int(app.config['MAX_IN_FLIGHT_REQUESTS'])
+        app.extensions['load_shedder'] = self
+        if self.limit > 0:
+            app.before_request(self._enter)
+            app.teardown_request(self._leave)
+
+    def _enter(self):
+        with self._lock:
+            if self.in_flight >= self.limit:
+                self.shed += 1
+                shed = True
+            else:
+                self.in_flight += 1
+                shed = False
+        if shed:
+            response = jsonify({'message': 'Server is busy, please try again shortly'})
+            response.status_code = 503
+            response.headers['Retry-After'] = '1'
+            return response
+        g.counted_in_flight = True
+
+    def _leave(self, error=None):
+        if g.pop('counted_in_flight', False):
+            with self._lock:
+                self.in_flight -= 1
+
+def _client_key(per):
+    if per == 'user':
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except Exception:
+            identity = None
+        if identity:
+            return f'user:{identity}'
+    return f'ip:{request.remote_addr}'
+
+rate_limiter = RateLimiter()
+load_shedder = LoadShedder()
@@ -0,0 +1,282 @@
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from flask import g, request, make_response
+
+# Request latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_HELP = {
+    'cookeasy_http_requests_total': ('counter', 'HTTP requests by route and status'),
+    'cookeasy_http_request_duration_seconds': ('histogram', 'HTTP request latency by route'),
+    'cookeasy_db_queries_total': ('counter', 'SQL statements issued by route'),
+    'cookeasy_db_duration_seconds_total': ('counter', 'Time spent in SQL by route'),
+    'cookeasy_response_cache_hits_total': ('counter', 'Response cache hits'),
+    'cookeasy_response_cache_misses_total': ('counter', 'Response cache misses'),
+    'cookeasy_response_cache_evictions_total': ('counter', 'Response cache entries evicted by tag'),
+    'cookeasy_response_cache_hit_ratio': ('gauge', 'Response cache hits / lookups'),
+    'cookeasy_view_buffer_depth': ('gauge', 'Recipe views waiting to be written'),
+}
+
+class MetricsRegistry:
+    """
+    Request metrics aggregated across threads and worker processes.
+
+    Each process accumulates in memory under a lock and periodically writes a
+    snapshot to METRICS_DIR/<pid>.json (atomically, via rename); /metrics
+    merges the snapshots of every process. Counters and histograms of exited
+    workers are kept until the next app start, gauges only count for live ones.
+
+    Config:
+        METRICS_ENABLED         record requests and serve /metrics (default True)
+        METRICS_DIR             directory shared by the workers (default instance/metrics)
+        METRICS_FLUSH_INTERVAL  seconds between snapshots (default 5)
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._last_flush = 0.0
+        self._flush_registered = False
+        self.directory = None
+        self.flush_interval = 5.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('METRICS_ENABLED', True)
+        app.config.setdefault('METRICS_DIR', os.environ.get('COOKEASY_METRICS_DIR') or
+                              os.path.join(app.instance_path, 'metrics'))
+        app.config.setdefault('METRICS_FLUSH_INTERVAL', 5.0)
+        app.extensions['metrics'] = self
+        if not app.config['METRICS_ENABLED']:
+            return
+
+        self.directory = app.config['METRICS_DIR']
+        self.flush_interval = float(app.config['METRICS_FLUSH_INTERVAL'])
+        os.makedirs(self.directory, exist_ok=True)
+        self._reset()
+        if not self._flush_registered:
+            atexit.register(self.flush)
+            self._flush_registered = True
+
+        app.before_request(_start_timer)
+        app.after_request(self._record_request)
+        app.add_url_rule('/metrics', 'metrics', self._metrics_view, methods=['GET'])
+
+    def _reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+        # Drop snapshots left by processes of an earlier run; scrapers see a counter reset
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            try:
+                pid = int(os.path.basename(path).split('.')[0])
+            except ValueError:
+                continue
+            if pid == os.getpid() or not _process_alive(pid):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # One count per bucket, then +Inf, then the sum
+                histogram = self._histograms[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    histogram[i] += 1
+            histogram[len(LATENCY_BUCKETS)] += 1
+            histogram[-1] += value
+
+    def flush(self):
+        """Write this process's snapshot so other workers' /metrics see it"""
+        if self.directory is None:
+            return
+        snapshot = self._snapshot()
+        path = os.path.join(self.directory, f'{os.getpid()}.json')
+        temp_path = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Metrics flush failed: {str(e)}")
+        self._last_flush = time.time()
+
+    def render(self):
+        """All processes' metrics in the Prometheus text exposition format"""
+        self.flush()
+        counters, histograms, gauges = {}, {}, {}
+        for snapshot in self._read_snapshots():
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(sorted(labels.items())))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, values in snapshot['histograms']:
+                key = (name, tuple(sorted(labels.items())))
+                merged = histograms.setdefault(key, [0] * len(values))
+                histograms[key] = [a + b for a, b in zip(merged, values)]
+            if snapshot['alive']:
+                for name, value in snapshot['gauges'].items():
+                    gauges[name] = gauges.get(name, 0) + value
+
+        hits = counters.get(('cookeasy_response_cache_hits_total', ()), 0)
+        misses = counters.get(('cookeasy_response_cache_misses_total', ()), 0)
+        gauges['cookeasy_response_cache_hit_ratio'] = hits / (hits + misses) if hits + misses else 0.0
+
+        lines = []
+        for name, (metric_type, help_text) in METRIC_HELP.items():
+            samples = []
+            if metric_type == 'counter':
+                samples = [(name, labels, value) for (n, labels), value in sorted(counters.items()) if n == name]
+            elif metric_type == 'gauge':
+                if name in gauges:
+                    samples = [(name, (), gauges[name])]
+            else:
+                for (n, labels), values in sorted(histograms.items()):
+                    if n != name:
+                        continue
+                    for bound, count in zip(LATENCY_BUCKETS, values):
+                        samples.append((f'{name}_bucket', labels + (('le', str(bound)),), count))
+                    samples.append((f'{name}_bucket', labels + (('le', '+Inf'),), values[len(LATENCY_BUCKETS)]))
+                    samples.append((f'{name}_count', labels, values[len(LATENCY_BUCKETS)]))
+                    samples.append((f'{name}_sum', labels, values[-1]))
+            if not samples:
+                continue
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            lines.extend(f'{sample}{_format_labels(labels)} {_format_value(value)}'
+                         for sample, labels, value in samples)
+        return '\n'.join(lines) + '\n'
+
+    def _snapshot(self):
+        from app.services.view_counter import view_counter
+        from app.utils.response_cache import response_cache
+
+        with self._lock:
+            counters = [[name, dict(labels), value] for (name, labels), value in self._counters.items()]
+            histograms = [[name, dict(labels), list(values)] for (name, labels), values in self._histograms.items()]
+
+        # Cache counters live on the cache itself; they only grow, so they are exported as counters
+        cache = response_cache.stats()
+        counters.append(['cookeasy_response_cache_hits_total', {}, cache['hits']])
+        counters.append(['cookeasy_response_cache_misses_total', {}, cache['misses']])
+        counters.append(['cookeasy_response_cache_evictions_total', {}, cache['evictions']])
+
+        return {
+            'pid': os.getpid(),
+            'counters': counters,
+            'histograms': histograms,
+            'gauges': {'cookeasy_view_buffer_depth': view_counter.depth}
+        }
+
+    def _read_snapshots(self):
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            snapshot['alive'] = _process_alive(snapshot.get('pid'))
+            yield snapshot
+
+    def _record_request(self, response):
+        started = g.pop('metrics_started_at', None)
+        if started is None:
+            return response
+
+        labels = {
+            'blueprint': request.blueprint or '',
+            'endpoint': request.endpoint or 'unmatched',
+            'method': request.method
+        }
+        self.inc('cookeasy_http_requests_total', dict(labels, status=str(response.status_code)))
+        self.observe('cookeasy_http_request_duration_seconds', labels, time.perf_counter() - started)
+
+        sql_stats = g.get('sql_stats')
+        if sql_stats is not None:
+            self.inc('cookeasy_db_queries_total', labels, sql_stats.count)
+            self.inc('cookeasy_db_duration_seconds_total', labels, sql_stats.duration)
+
+        if time.time() - self._last_flush > self.flush_interval:
+            self.flush()
+        return response
+
+    def _metrics_view(self):
+        response = make_response(self.render(), 200)
+        response.mimetype = 'text/plain'
+        response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+        return response
+
+def _start_timer():
+    g.metrics_started_at = time.perf_counter()
+
+def _process_alive(pid):
+    if not pid:
+        return False
+    if pid == os.getpid():
+        return True
+    if os.name == 'nt':
+        # os.kill(pid, 0) would send CTRL_C_EVENT there
+        return _windows_process_alive(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+def _windows_process_alive(pid):
+    import ctypes
+    from ctypes import wintypes
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    ERROR_ACCESS_DENIED = 5
+    STILL_ACTIVE = 259
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    kernel32.GetExitCodeProcess.argtypes = (wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD))
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # A process we may not open still exists
+        return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+    try:
+        exit_code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            return True
+        return exit_code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape_label(value)}"' for key, value in labels) + '}'
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+metrics = MetricsRegistry()
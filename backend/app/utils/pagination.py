@@ -0,0 +1,63 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import tuple_, literal
+
+MAX_CURSOR_PAGE_SIZE = 100
+
+def encode_cursor(sort_by, values):
+    """Encode the sort key of the last row on a page into an opaque cursor"""
+    payload = {
+        's': sort_by,
+        'v': [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor, sort_by, columns):
+    """
+    Decode a cursor produced by encode_cursor for the same sort order.
+    Raises ValueError if the cursor is malformed or belongs to another sort.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = payload['v']
+    except (ValueError, TypeError, KeyError):
+        raise ValueError('Invalid cursor')
+
+    if payload.get('s') != sort_by or len(values) != len(columns):
+        raise ValueError('Cursor does not match sort order')
+
+    decoded = []
+    for column, value in zip(columns, values):
+        if value is not None and column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+        decoded.append(value)
+    return decoded
+
+def keyset_paginate(query, columns, sort_by, cursor=None, per_page=12):
+    """
+    Return one page of `query` ordered by `columns` descending, seeking past
+    `cursor` instead of using OFFSET, plus the cursor for the next page.
+
+    The last column must be unique (normally the primary key) so the order is total.
+    Cost is the same for every page as long as an index covers the filter and columns.
+    """
+    per_page = max(1, min(per_page, MAX_CURSOR_PAGE_SIZE))
+
+    if cursor:
+        last_values = decode_cursor(cursor, sort_by, columns)
+        bound = [literal(value, type_=column.type) for column, value in zip(columns, last_values)]
+        query = query.filter(tuple_(*columns) < tuple_(*bound))
+
+    rows = query.order_by(*[column.desc() for column in columns]).limit(per_page + 1).all()
+
+    has_next = len(rows) > per_page
+    items = rows[:per_page]
+    next_cursor = None
+    if has_next:
+        last = items[-1]
+        next_cursor = encode_cursor(sort_by, [getattr(last, column.key) for column in columns])
+
+    return items, next_cursor
@@ -0,0 +1,253 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from flask import g, request, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
+from app.utils.db_engine import READ_METHODS, is_memory_sqlite, tune_sqlite_engine
+
+# Bound the pin table; expired pins are dropped once it grows past this
+MAX_PINS = 10000
+
+class RoutingSession(Session):
+    """
+    db.session that sends the reads of a routed request (see ReadRouter) to
+    the read-only engine. Flushes, INSERT/UPDATE/DELETE statements and raw SQL
+    that is not a SELECT always go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context():
+            engine = g.get('db_read_engine')
+            if engine is not None and not _is_write(clause):
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+class ReadRouter:
+    """
+    Routes the reads of GET/HEAD requests in DB_READ_BLUEPRINTS to a
+    read-only engine.
+
+    The engine is either a replica (DATABASE_READ_URL) or, for a SQLite
+    primary, a snapshot copy refreshed by a background thread and opened
+    with mode=ro&immutable=1, so readers take no locks at all. Every
+    successful write pins the client (by Authorization header, else IP) to
+    the primary for DB_READ_AFTER_WRITE_PIN seconds so it reads its own
+    writes. Pins live in the worker process that handled the write.
+
+    Config:
+        DATABASE_READ_URL           replica URL; takes precedence over the snapshot
+        DB_READ_SNAPSHOT            serve reads from a snapshot of the SQLite primary (default off)
+        DB_READ_SNAPSHOT_PATH       snapshot file (default instance/read_snapshot.db)
+        DB_READ_SNAPSHOT_INTERVAL   seconds between refreshes; 0 only refreshes on refresh()
+        DB_READ_REPLICA_LAG         assumed lag of DATABASE_READ_URL in seconds (default 1)
+        DB_READ_AFTER_WRITE_PIN     seconds a writer's reads stay on the primary (default 10)
+        DB_READ_BLUEPRINTS          blueprints whose reads are routed (default recipes, auth)
+
+    The engine is kept out of SQLALCHEMY_BINDS so create_all()/drop_all()
+    never touch it; call init_app after configure_engine_options.
+    """
+
+    def __init__(self, app=None):
+        self.mode = None
+        self.blueprints = set()
+        self.pin_seconds = 10
+        self.replica_lag = 1.0
+        self.interval = 5.0
+        self.primary_path = None
+        self.snapshot_path = None
+        self.engine = None
+        self._lock = threading.Lock()
+        self._pins = {}
+        self._snapshot_id = None
+        self._thread = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('DATABASE_READ_URL', None)
+        app.config.setdefault('DB_READ_SNAPSHOT', False)
+        app.config.setdefault('DB_READ_SNAPSHOT_PATH', os.path.join(app.instance_path, 'read_snapshot.db'))
+        app.config.setdefault('DB_READ_SNAPSHOT_INTERVAL', 5.0)
+        app.config.setdefault('DB_READ_REPLICA_LAG', 1.0)
+        app.config.setdefault('DB_READ_AFTER_WRITE_PIN', 10)
+        app.config.setdefault('DB_READ_BLUEPRINTS', ('recipes', 'auth'))
+
+        self.blueprints = set(app.config['DB_READ_BLUEPRINTS'])
+        self.pin_seconds = float(app.config['DB_READ_AFTER_WRITE_PIN'])
+        self.replica_lag = float(app.config['DB_READ_REPLICA_LAG'])
+        self.interval = float(app.config['DB_READ_SNAPSHOT_INTERVAL'])
+        self.mode = None
+        self._snapshot_id = None
+        with self._lock:
+            self._pins.clear()
+
+        if self.engine is not None:
+            self.engine.dispose()
+            self.engine = None
+
+        url = None
+        if app.config['DATABASE_READ_URL']:
+            self.mode = 'replica'
+            url = app.config['DATABASE_READ_URL']
+        elif app.config['DB_READ_SNAPSHOT']:
+            self.primary_path = _sqlite_file(app.config['SQLALCHEMY_DATABASE_URI'], app.instance_path)
+            if self.primary_path is None:
+                print("DB_READ_SNAPSHOT needs a file-backed SQLite primary; reads stay on the primary")
+            else:
+                self.mode = 'snapshot'
+                self.snapshot_path = os.path.abspath(app.config['DB_READ_SNAPSHOT_PATH'])
+                url = f'sqlite:///file:{self.snapshot_path}?mode=ro&immutable=1&uri=true'
+
+        if url is not None:
+            # Creating the engine does not connect; the snapshot file may not exist yet
+            self.engine = create_engine(url, **(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}))
+            tune_sqlite_engine(app, self.engine)
+            app.before_request(self._route_request)
+            app.after_request(self._pin_writer)
+            app.teardown_request(_unroute_request)
+        app.extensions['read_router'] = self
+
+    def refresh(self, force=False):
+        """
+        Copy the primary into the snapshot file with SQLite's online backup.
+        Skipped when the snapshot is younger than the interval (another worker
+        may have just refreshed it) or the primary has not changed since.
+        Returns True if a new snapshot was written.
+        """
+        if self.mode != 'snapshot':
+            return False
+        taken = _mtime(self.snapshot_path)
+        if not force and taken is not None:
+            if time.time() - taken < self.interval:
+                return False
+            if max(filter(None, [_mtime(self.primary_path), _mtime(self.primary_path + '-wal')]), default=0) <= taken:
+                return False
+
+        started = time.time()
+        temporary = f'{self.snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        source = sqlite3.connect(self.primary_path)
+        target = sqlite3.connect(temporary)
+        try:
+            source.backup(target)
+            # A rollback-journal file opens read-only without -wal/-shm companions
+            target.execute('PRAGMA journal_mode=DELETE')
+        finally:
+            target.close()
+            source.close()
+        # The mtime doubles as the snapshot's as-of time for every worker
+        os.utime(temporary, (started, started))
+        os.replace(temporary, self.snapshot_path)
+        return True
+
+    def pin(self, key=None):
+        """Keep a client's reads on the primary for DB_READ_AFTER_WRITE_PIN seconds"""
+        now = time.time()
+        with self._lock:
+            if len(self._pins) >= MAX_PINS:
+                self._pins = {k: until for k, until in self._pins.items() if until > now}
+            self._pins[key or _client_key()] = now + self.pin_seconds
+
+    def is_pinned(self, key=None):
+        with self._lock:
+            until = self._pins.get(key or _client_key())
+        return until is not None and until > time.time()
+
+    def _route_request(self):
+        if request.method not in READ_METHODS or request.blueprint not in self.blueprints:
+            return
+        if self.is_pinned():
+            return
+        engine, as_of = self._replica()
+        if engine is not None:
+            g.db_read_engine = engine
+            g.db_replica_as_of = as_of
+
+    def _pin_writer(self, response):
+        if request.method not in READ_METHODS and response.status_code < 400:
+            self.pin()
+        return response
+
+    def _replica(self):
+        """(engine, as_of) for the read engine, or (None, None) while no snapshot exists yet"""
+        engine = self.engine
+        if self.mode == 'replica':
+            return engine, time.time() - self.replica_lag
+
+        if self._thread is None and self.interval > 0:
+            self._start()
+        try:
+            stat = os.stat(self.snapshot_path)
+        except FileNotFoundError:
+            return None, None
+
+        snapshot_id = (stat.st_ino, stat.st_mtime_ns)
+        if snapshot_id != self._snapshot_id:
+            with self._lock:
+                if snapshot_id != self._snapshot_id:
+                    # Pooled connections still read the replaced file; new ones open the new snapshot
+                    engine.dispose()
+                    self._snapshot_id = snapshot_id
+        return engine, stat.st_mtime
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='read-snapshot-refresh', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Read snapshot refresh failed: {str(e)}")
+            time.sleep(self.interval)
+
+@contextmanager
+def on_primary():
+    """Run the block's reads against the primary, even inside a routed request"""
+    engine = g.pop('db_read_engine', None) if has_app_context() else None
+    try:
+        yield
+    finally:
+        if engine is not None:
+            g.db_read_engine = engine
+
+def _unroute_request(error=None):
+    # g outlives the request when the app context was pushed by the caller (tests, scripts)
+    g.pop('db_read_engine', None)
+    g.pop('db_replica_as_of', None)
+
+def _is_write(clause):
+    if isinstance(clause, UpdateBase):
+        return True
+    if isinstance(clause, TextClause):
+        words = clause.text.split(None, 1)
+        return not words or words[0].upper() not in ('SELECT', 'WITH')
+    return False
+
+def _client_key():
+    return request.headers.get('Authorization') or request.remote_addr
+
+def _sqlite_file(uri, instance_path):
+    """Absolute path of a file-backed SQLite database URI, else None"""
+    url = make_url(uri)
+    if url.get_backend_name() != 'sqlite' or is_memory_sqlite(uri):
+        return None
+    path = url.database[5:] if url.query.get('uri') else url.database
+    return path if os.path.isabs(path) else os.path.join(instance_path, path)
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except FileNotFoundError:
+        return None
+
+read_router = ReadRouter()
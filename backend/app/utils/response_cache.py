@@ -0,0 +1,343 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import g, request, make_response
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+class MemoryCacheBackend:
+    """In-process LRU store; evictions are only seen by this worker"""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, tags, value)
+        self._tags = {}  # tag -> set of keys
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, value, tags, ttl):
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.time() + ttl, tuple(tags), value)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def evict_tags(self, tags):
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[1]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+class SQLiteCacheBackend:
+    """
+    LRU store in a local SQLite file shared by every worker on the host, so an
+    eviction in one worker is seen by all of them
+    """
+
+    def __init__(self, path, max_entries=1000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    mimetype TEXT,
+                    body BLOB,
+                    expires_at REAL,
+                    accessed_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed ON cache_entries (accessed_at);
+                CREATE TABLE IF NOT EXISTS cache_tags (
+                    tag TEXT,
+                    key TEXT,
+                    PRIMARY KEY (tag, key)
+                );
+                CREATE INDEX IF NOT EXISTS ix_cache_tags_key ON cache_tags (key);
+            """)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute(
+            "SELECT mimetype, body FROM cache_entries WHERE key = ? AND expires_at >= ?", (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0], row[1]
+
+    def set(self, key, value, tags, ttl):
+        conn = self._connect()
+        now = time.time()
+        mimetype, body = value
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, mimetype, body, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)", (key, mimetype, body, now + ttl, now)
+            )
+            conn.executemany("INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)",
+                             [(tag, key) for tag in tags])
+            overflow = conn.execute("SELECT count(*) FROM cache_entries").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                stale = conn.execute(
+                    "SELECT key FROM cache_entries ORDER BY accessed_at LIMIT ?", (overflow,)
+                ).fetchall()
+                conn.executemany("DELETE FROM cache_entries WHERE key = ?", stale)
+                conn.executemany("DELETE FROM cache_tags WHERE key = ?", stale)
+
+    def evict_tags(self, tags):
+        conn = self._connect()
+        tags = list(tags)
+        placeholders = ', '.join('?' for _ in tags)
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            keys = conn.execute(
+                f"SELECT DISTINCT key FROM cache_tags WHERE tag IN ({placeholders})", tags
+            ).fetchall()
+            conn.executemany("DELETE FROM cache_entries WHERE key = ?", keys)
+            conn.executemany("DELETE FROM cache_tags WHERE key = ?", keys)
+        return len(keys)
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM cache_entries")
+            conn.execute("DELETE FROM cache_tags")
+
+    def __len__(self):
+        return self._connect().execute("SELECT count(*) FROM cache_entries").fetchone()[0]
+
+class ResponseCache:
+    """
+    Server-side cache of serialized JSON responses with tag-based invalidation.
+
+    Config:
+        RESPONSE_CACHE_BACKEND      'memory' (default), 'sqlite' (shared across workers) or 'none'
+        RESPONSE_CACHE_MAX_ENTRIES  LRU bound (default 1000)
+        RESPONSE_CACHE_TTL          default entry lifetime in seconds (default 300)
+        RESPONSE_CACHE_PATH         SQLite file for the 'sqlite' backend
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.default_ttl = 300
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.last_evicted_at = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RESPONSE_CACHE_BACKEND', 'memory')
+        app.config.setdefault('RESPONSE_CACHE_MAX_ENTRIES', 1000)
+        app.config.setdefault('RESPONSE_CACHE_TTL', 300)
+        app.config.setdefault('RESPONSE_CACHE_PATH', os.path.join(app.instance_path, 'response_cache.db'))
+
+        backend = app.config['RESPONSE_CACHE_BACKEND']
+        max_entries = int(app.config['RESPONSE_CACHE_MAX_ENTRIES'])
+        if backend == 'sqlite':
+            os.makedirs(os.path.dirname(app.config['RESPONSE_CACHE_PATH']), exist_ok=True)
+            self.backend = SQLiteCacheBackend(app.config['RESPONSE_CACHE_PATH'], max_entries)
+        elif backend == 'memory':
+            self.backend = MemoryCacheBackend(max_entries)
+        else:
+            self.backend = None
+        self.default_ttl = int(app.config['RESPONSE_CACHE_TTL'])
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+        app.extensions['response_cache'] = self
+
+    def evict(self, *tags):
+        """Drop every cached response carrying any of the tags (call after commit)"""
+        tags = [tag for tag in tags if tag]
+        if self.backend is None or not tags:
+            return 0
+        self.last_evicted_at = time.time()
+        try:
+            evicted = self.backend.evict_tags(tags)
+        except Exception as e:
+            print(f"Response cache eviction failed: {str(e)}")
+            return 0
+        with self._lock:
+            self.evictions += evicted
+        return evicted
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'entries': len(self.backend) if self.backend is not None else 0
+            }
+
+    def _record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def cached(self, tags, vary=None, ttl=None):
+        """
+        Decorator caching a view's 200 JSON response.
+
+        `tags(view_kwargs, payload)` returns the tags for an entry, e.g.
+        ['recipe:1', 'user:2']. `vary` is None, 'user' or 'role' and adds the
+        caller's identity or role to the key. The key also covers path and query string.
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                if self.backend is None:
+                    return f(*args, **kwargs)
+
+                key = self._make_key(vary)
+                try:
+                    cached_value = self.backend.get(key)
+                except Exception as e:
+                    print(f"Response cache read failed: {str(e)}")
+                    cached_value = None
+
+                if cached_value is not None:
+                    self._record(hit=True)
+                    mimetype, body = cached_value
+                    response = make_response(body, 200)
+                    response.mimetype = mimetype
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                self._record(hit=False)
+                response = make_response(f(*args, **kwargs))
+                if response.status_code == 200 and response.is_json and not self._is_stale_read():
+                    try:
+                        entry_tags = list(tags(kwargs, response.get_json()))
+                        self.backend.set(key, (response.mimetype, response.get_data()),
+                                         entry_tags, ttl or self.default_ttl)
+                    except Exception as e:
+                        print(f"Response cache write failed: {str(e)}")
+                response.headers['X-Cache'] = 'MISS'
+                return response
+
+            return decorated_function
+        return decorator
+
+    def _is_stale_read(self):
+        # A response read from a replica older than the last eviction may
+        # predate that write; caching it would outlive the eviction
+        as_of = g.get('db_replica_as_of')
+        return as_of is not None and as_of < self.last_evicted_at
+
+    def _make_key(self, vary):
+        query = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+        key = f'{request.path}?{query}'
+        if vary:
+            identity = None
+            try:
+                verify_jwt_in_request(optional=True)
+                identity = get_jwt_identity()
+            except Exception:
+                pass
+            if vary == 'role':
+                key += f'|role:{_role_for(identity)}'
+            else:
+                key += f'|user:{identity or "anonymous"}'
+        return key
+
+def _role_for(identity):
+    if not identity:
+        return 'anonymous'
+    from app.services.auth_cache import auth_cache
+    user = auth_cache.get(int(identity))
+    return user.role if user else 'anonymous'
+
+def recipe_list_tags(view_kwargs, payload):
+    """Tags for a response listing recipes: the list itself, each recipe and each author"""
+    tags = {'recipe-list'}
+    for recipe in payload.get('recipes', []):
+        tags.add(f"recipe:{recipe['id']}")
+        if recipe.get('user_id'):
+            tags.add(f"user:{recipe['user_id']}")
+    if payload.get('user'):
+        tags.add(f"user:{payload['user']['id']}")
+    if 'user_id' in view_kwargs:
+        tags.add(f"user:{view_kwargs['user_id']}")
+    return tags
+
+def similar_recipe_tags(view_kwargs, payload):
+    """Tags for a recipe's similar recipes; the similar-recipes job evicts 'recipe-similar'"""
+    return recipe_list_tags(view_kwargs, payload) | {'recipe-similar', f"recipe:{view_kwargs['recipe_id']}"}
+
+def user_profile_tags(view_kwargs, payload):
+    """Tags for a public profile, which also shows the user's recipe counts"""
+    return {f"user:{view_kwargs['user_id']}", 'recipe-list'}
+
+def category_list_tags(view_kwargs, payload):
+    """Tags for the category list: every category plus the list itself"""
+    tags = {'categories'}
+    for category in payload.get('categories', []):
+        tags.add(f"category:{category['id']}")
+    return tags
+
+def recipe_cache_tags(recipe, category_ids=()):
+    """Tags to evict after a write that changes `recipe` (and possibly its listing or counts)"""
+    tags = {f'recipe:{recipe.id}', f'user:{recipe.user_id}', 'recipe-list'}
+    category_ids = set(category_ids) | {category.id for category in recipe.categories}
+    if recipe.category_id:
+        category_ids.add(recipe.category_id)
+    tags.update(f'category:{category_id}' for category_id in category_ids)
+    return tags
+
+response_cache = ResponseCache()
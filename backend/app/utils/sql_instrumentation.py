@@ -0,0 +1,141 @@
+import re
+import time
+from collections import Counter
+from functools import wraps
+from flask import g, request, current_app, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_WHITESPACE = re.compile(r'\s+')
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a request issues more queries than its budget allows (strict mode only)"""
+
+def normalize_sql(statement):
+    """Reduce a statement to its shape so repeats with different parameters compare equal"""
+    statement = _STRING_LITERAL.sub('?', statement)
+    statement = _NUMBER_LITERAL.sub('?', statement)
+    statement = _PLACEHOLDER_LIST.sub('(?)', statement)
+    return _WHITESPACE.sub(' ', statement).strip()
+
+class RequestQueryStats:
+    """Queries issued while serving one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+        self.started_at = time.perf_counter()
+
+    def record(self, statement, duration):
+        self.count += 1
+        self.duration += duration
+        self.statements[normalize_sql(statement)] += 1
+
+    def repeated(self, threshold):
+        """Normalized statements that ran more than `threshold` times"""
+        return [(statement, count) for statement, count in self.statements.most_common()
+                if count > threshold]
+
+class SQLInstrumentation:
+    """
+    Counts the SQL statements and database time of every request from
+    SQLAlchemy engine events, reports them in a Server-Timing header and
+    warns about N+1 patterns.
+
+    Config:
+        SQL_INSTRUMENTATION           enable the hooks (default True)
+        SQL_REPEAT_THRESHOLD          warn when one normalized statement runs more
+                                      than this many times in a request (default 5)
+        SQL_QUERY_BUDGET              default per-request query budget (default None)
+        SQL_QUERY_BUDGET_STRICT       raise QueryBudgetExceeded instead of logging
+                                      (defaults to app.testing, so tests fail)
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SQL_INSTRUMENTATION', True)
+        app.config.setdefault('SQL_REPEAT_THRESHOLD', 5)
+        app.config.setdefault('SQL_QUERY_BUDGET', None)
+        app.config.setdefault('SQL_QUERY_BUDGET_STRICT', app.testing)
+        app.extensions['sql_instrumentation'] = self
+        if not app.config['SQL_INSTRUMENTATION']:
+            return
+
+        # Listen on the Engine class so every engine the app creates is covered
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+        app.before_request(_start_request)
+        app.after_request(_finish_request)
+
+    @staticmethod
+    def current():
+        """Query stats of the request being served, or None outside a request"""
+        if not has_request_context():
+            return None
+        return g.get('sql_stats')
+
+def query_budget(max_queries):
+    """
+    Decorator declaring how many queries an endpoint may issue per request.
+    Usage: @query_budget(10)
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            g.sql_query_budget = max_queries
+            return f(*args, **kwargs)
+
+        return decorated_function
+    return decorator
+
+# The start time lives on the statement's execution context, which is dropped
+# with the statement, so one that raises leaves nothing behind on the connection
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.query_start_time = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, 'query_start_time', None)
+    if started is None:
+        return
+    stats = SQLInstrumentation.current()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+def _start_request():
+    g.sql_stats = RequestQueryStats()
+
+def _finish_request(response):
+    stats = g.get('sql_stats')
+    if stats is None:
+        return response
+
+    total = (time.perf_counter() - stats.started_at) * 1000
+    response.headers.add('Server-Timing', f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"')
+    response.headers.add('Server-Timing', f'app;dur={total:.2f}')
+
+    config = current_app.config
+    for statement, count in stats.repeated(config['SQL_REPEAT_THRESHOLD']):
+        current_app.logger.warning(
+            'Possible N+1 in %s %s: statement ran %d times: %s',
+            request.method, request.path, count, statement
+        )
+
+    budget = g.pop('sql_query_budget', config['SQL_QUERY_BUDGET'])
+    if budget is not None and stats.count > budget:
+        message = f'{request.method} {request.path} issued {stats.count} queries (budget {budget})'
+        if config['SQL_QUERY_BUDGET_STRICT']:
+            raise QueryBudgetExceeded(message)
+        current_app.logger.warning('Query budget exceeded: %s', message)
+    return response
+
+sql_instrumentation = SQLInstrumentation()
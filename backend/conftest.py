@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures for the backend tests.
+
+`app` is a fresh app with the sample data on an in-memory database, with an
+app context pushed for the test. Config comes from `app_config`; a module
+changes it for all its tests by overriding that fixture:
+
+    @pytest.fixture
+    def app_config(app_config, tmp_path):
+        return dict(app_config, METRICS_DIR=str(tmp_path))
+
+and a single test with a marker:
+
+    @pytest.mark.app_config(RATE_LIMITS={'search': {'limit': '2/minute', 'per': 'ip'}})
+
+Tests whose requests must push their own app context (and session), as in
+a server, use `server_app` instead.
+"""
+
+import pytest
+
+from app import create_app, db
+from app.cli import bootstrap_database
+from app.services.view_counter import view_counter
+
+TEST_CONFIG = {
+    'TESTING': True,
+    'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+    # Tests add rows straight through the ORM, which does not evict cached responses
+    'RESPONSE_CACHE_BACKEND': 'none'
+}
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'app_config(**config): extra app config for one test')
+
+@pytest.fixture
+def app_config(request):
+    config = dict(TEST_CONFIG)
+    for marker in reversed(list(request.node.iter_markers('app_config'))):
+        config.update(marker.kwargs)
+    return config
+
+@pytest.fixture
+def server_app(app_config):
+    app = create_app(test_config=app_config)
+    with app.app_context():
+        bootstrap_database(seed=True)
+        db.session.remove()
+    yield app
+    # Write recorded views here rather than into a later test's database
+    view_counter.flush()
+    with app.app_context():
+        db.drop_all()
+        db.session.remove()
+
+@pytest.fixture
+def app(server_app):
+    with server_app.app_context():
+        yield server_app
+        db.session.remove()
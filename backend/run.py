@@ -1,10 +1,15 @@
 import os
 from app import create_app
+from app.cli import bootstrap_database
 
 # Get config from environment or use default
 config_name = os.getenv('FLASK_ENV', 'development')
 app = create_app(config_name)
 
 if __name__ == '__main__':
+    # The development server sets up its own database; production runs `flask bootstrap` once
+    with app.app_context():
+        bootstrap_database(seed=True)
+    
     # Run the app
     app.run(host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Script to add the auth_version column to the users table
+"""
+
+import sys
+import os
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app, db
+from sqlalchemy import text
+
+def add_auth_version():
+    """Add users.auth_version (bumped whenever a user's role or flags change)"""
+    app = create_app()
+
+    with app.app_context():
+        try:
+            with db.engine.connect() as conn:
+                result = conn.execute(text("PRAGMA table_info(users)"))
+                columns = [row[1] for row in result.fetchall()]
+
+                if 'auth_version' in columns:
+                    print("✅ auth_version already exists in users table")
+                    return
+
+                print("📝 Adding auth_version to users table...")
+                conn.execute(text("ALTER TABLE users ADD COLUMN auth_version INTEGER NOT NULL DEFAULT 1"))
+                conn.commit()
+
+                print("✅ Successfully added auth_version to users table")
+
+        except Exception as e:
+            print(f"❌ Error adding auth_version: {str(e)}")
+            raise
+
+if __name__ == '__main__':
+    add_auth_version()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Script to add the composite indexes used by keyset (cursor) pagination
+of the recipe feeds, and the foreign key indexes used by recipe detail,
+ratings and search indexing, to an existing database
+"""
+
+import sys
+import os
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app, db
+from sqlalchemy import text
+
+FEED_INDEXES = {
+    'ix_recipes_published_created': '(is_published, created_at, id)',
+    'ix_recipes_published_views': '(is_published, view_count, id)',
+    'ix_recipes_published_rating': '(is_published, rating_avg, id)',
+    'ix_recipes_user_created': '(user_id, created_at, id)',
+}
+
+FOREIGN_KEY_INDEXES = {
+    'ix_recipe_ingredients_recipe_id': 'recipe_ingredients (recipe_id)',
+    'ix_ratings_recipe_id': 'ratings (recipe_id)',
+    'ix_recipe_categories_category_id': 'recipe_categories (category_id)',
+}
+
+def add_feed_indexes():
+    """Create missing feed and foreign key indexes"""
+    app = create_app()
+
+    with app.app_context():
+        try:
+            with db.engine.connect() as conn:
+                for name, columns in FEED_INDEXES.items():
+                    print(f"📝 Ensuring index {name} on recipes {columns}...")
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON recipes {columns}"))
+
+                for name, target in FOREIGN_KEY_INDEXES.items():
+                    print(f"📝 Ensuring index {name} on {target}...")
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {target}"))
+
+                conn.execute(text("ANALYZE"))
+                conn.commit()
+
+            print("✅ Feed indexes are in place")
+
+        except Exception as e:
+            print(f"❌ Error adding feed indexes: {str(e)}")
+            raise
+
+if __name__ == '__main__':
+    add_feed_indexes()
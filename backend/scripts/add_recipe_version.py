@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Script to add the version column to the recipes table
+"""
+
+import sys
+import os
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app, db
+from sqlalchemy import text
+
+def add_recipe_version():
+    """Add recipes.version (the optimistic concurrency counter behind PATCH If-Match)"""
+    app = create_app()
+
+    with app.app_context():
+        try:
+            with db.engine.connect() as conn:
+                result = conn.execute(text("PRAGMA table_info(recipes)"))
+                columns = [row[1] for row in result.fetchall()]
+
+                if 'version' in columns:
+                    print("✅ version already exists in recipes table")
+                    return
+
+                print("📝 Adding version to recipes table...")
+                conn.execute(text("ALTER TABLE recipes ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+                conn.commit()
+
+                print("✅ Successfully added version to recipes table")
+
+        except Exception as e:
+            print(f"❌ Error adding version: {str(e)}")
+            raise
+
+if __name__ == '__main__':
+    add_recipe_version()
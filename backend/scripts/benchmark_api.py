@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Load benchmark replaying a weighted mix of the frontend's API calls
+(recipesAPI.getAll, getById, getFeatured, getPopular, search, toggleFavorite)
+and reporting p50/p95/p99 latency per endpoint.
+
+    # In-process through the Flask test client, against a generated dataset
+    python scripts/generate_dataset.py --database sqlite:////tmp/bench.db
+    python scripts/benchmark_api.py --database sqlite:////tmp/bench.db --requests 5000
+
+    # Against a running server
+    python scripts/benchmark_api.py --base-url http://localhost:5000 --threads 8
+
+Results are written as JSON (--output); pass an earlier result with --compare
+to print per-endpoint deltas and exit non-zero when a p95 regresses by more
+than --max-regression percent.
+"""
+
+import argparse
+import json
+import random
+import sys
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+SEARCH_TERMS = ['nasi', 'ayam', 'goreng', 'sambal', 'soto', 'rendang', 'mie', 'kue', 'sate', 'pedas']
+SORTS = ['newest', 'popular', 'rating']
+
+# (name, weight, request builder); weights roughly follow how often the pages call them
+CALL_MIX = [
+    ('getAll', 30, lambda rng, ids: ('GET', f"/api/recipes/?page={rng.randint(1, 5)}&per_page=12&sort_by={rng.choice(SORTS)}")),
+    ('getById', 30, lambda rng, ids: ('GET', f"/api/recipes/{rng.choice(ids)}")),
+    ('getFeatured', 10, lambda rng, ids: ('GET', '/api/recipes/featured')),
+    ('getPopular', 10, lambda rng, ids: ('GET', '/api/recipes/popular?limit=6')),
+    ('search', 15, lambda rng, ids: ('GET', f"/api/recipes/search?q={rng.choice(SEARCH_TERMS)}")),
+    ('toggleFavorite', 5, lambda rng, ids: ('POST', f"/api/recipes/{rng.choice(ids)}/favorite")),
+]
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(samples):
+    """samples: {name: [(duration_ms, status), ...]} -> per-endpoint statistics"""
+    endpoints = {}
+    for name, results in sorted(samples.items()):
+        durations = sorted(duration for duration, _ in results)
+        endpoints[name] = {
+            'count': len(results),
+            'errors': sum(1 for _, status in results if status >= 400),
+            'mean_ms': round(sum(durations) / len(durations), 3),
+            'p50_ms': round(percentile(durations, 50), 3),
+            'p95_ms': round(percentile(durations, 95), 3),
+            'p99_ms': round(percentile(durations, 99), 3),
+            'max_ms': round(durations[-1], 3)
+        }
+    return endpoints
+
+class TestClientTarget:
+    """Sends requests through the Flask test client of an in-process app"""
+
+    def __init__(self, database_uri=None):
+        from app import create_app, db
+        from app.models import User, Recipe
+        from flask_jwt_extended import create_access_token
+
+        # One client replays the whole mix, which the per-IP rate limits would throttle
+        config = {'RATE_LIMIT_ENABLED': False}
+        if database_uri:
+            config['SQLALCHEMY_DATABASE_URI'] = database_uri
+        self.app = create_app(test_config=config)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            self.recipe_ids = [row[0] for row in db.session.query(Recipe.id).filter_by(is_published=True)]
+            user = User.query.filter_by(role='user').first() or User.query.first()
+            self.headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+            db.session.remove()
+        self.description = f"test client ({self.app.config['SQLALCHEMY_DATABASE_URI']})"
+
+    def send(self, method, path):
+        response = self.client.open(path, method=method, headers=self.headers)
+        return response.status_code
+
+class ServerTarget:
+    """Sends requests to a running server over HTTP"""
+
+    def __init__(self, base_url, email, password):
+        import requests
+
+        self.base_url = base_url.rstrip('/')
+        self._local = threading.local()
+        self._requests = requests
+        login = requests.post(f'{self.base_url}/api/auth/login', json={'email': email, 'password': password})
+        login.raise_for_status()
+        self.headers = {'Authorization': f"Bearer {login.json()['access_token']}"}
+        recipes = requests.get(f'{self.base_url}/api/recipes/?per_page=100').json()['recipes']
+        self.recipe_ids = [recipe['id'] for recipe in recipes]
+        self.description = f'server ({self.base_url})'
+
+    def send(self, method, path):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+        response = session.request(method, f'{self.base_url}{path}', headers=self.headers)
+        return response.status_code
+
+def run_benchmark(target, total_requests, warmup, threads, seed):
+    if not target.recipe_ids:
+        raise RuntimeError('No published recipes to request; generate a dataset first')
+
+    names = [name for name, _, _ in CALL_MIX]
+    weights = [weight for _, weight, _ in CALL_MIX]
+    builders = {name: builder for name, _, builder in CALL_MIX}
+
+    rng = random.Random(seed)
+    plan = [rng.choices(names, weights)[0] for _ in range(warmup + total_requests)]
+    requests_plan = [(name, *builders[name](rng, target.recipe_ids)) for name in plan]
+
+    for name, method, path in requests_plan[:warmup]:
+        target.send(method, path)
+
+    samples = defaultdict(list)
+    lock = threading.Lock()
+    measured = requests_plan[warmup:]
+
+    def worker(offset):
+        local = defaultdict(list)
+        for name, method, path in measured[offset::threads]:
+            started = time.perf_counter()
+            status = target.send(method, path)
+            local[name].append(((time.perf_counter() - started) * 1000, status))
+        with lock:
+            for name, results in local.items():
+                samples[name].extend(results)
+
+    started = time.perf_counter()
+    if threads == 1:
+        worker(0)
+    else:
+        pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'timestamp': datetime.utcnow().isoformat(),
+        'target': target.description,
+        'requests': total_requests,
+        'threads': threads,
+        'seed': seed,
+        'duration_s': round(elapsed, 3),
+        'throughput_rps': round(total_requests / elapsed, 1) if elapsed else None,
+        'endpoints': summarize(samples)
+    }
+
+def print_report(result, baseline=None):
+    print(f"\n📊 {result['requests']} requests against {result['target']} "
+          f"in {result['duration_s']}s ({result['throughput_rps']} req/s)")
+    print(f"{'endpoint':<16}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'Δp95':>10}")
+    for name, stats in result['endpoints'].items():
+        delta = ''
+        previous = (baseline or {}).get('endpoints', {}).get(name)
+        if previous and previous['p95_ms']:
+            delta = f"{(stats['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] * 100:+.0f}%"
+        print(f"{name:<16}{stats['count']:>7}{stats['errors']:>8}{stats['p50_ms']:>10.2f}"
+              f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{delta:>10}")
+
+def find_regressions(result, baseline, max_regression):
+    """Endpoints whose p95 grew by more than max_regression percent"""
+    regressions = []
+    for name, stats in result['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(name)
+        if previous and previous['p95_ms'] and \
+                (stats['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] * 100 > max_regression:
+            regressions.append(name)
+    return regressions
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay a weighted mix of frontend API calls')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database', help='SQLAlchemy URI for the in-process app (default: the app database)')
+    parser.add_argument('--base-url', help='benchmark a running server instead of the test client')
+    parser.add_argument('--email', default='sari@example.com', help='login for --base-url')
+    parser.add_argument('--password', default='sari123', help='password for --base-url')
+    parser.add_argument('--output', help='where to write the JSON result')
+    parser.add_argument('--compare', help='earlier JSON result to compare against')
+    parser.add_argument('--max-regression', type=float, default=20.0, help='allowed p95 growth in percent')
+    args = parser.parse_args()
+
+    if args.base_url:
+        target = ServerTarget(args.base_url, args.email, args.password)
+    else:
+        target = TestClientTarget(args.database)
+
+    result = run_benchmark(target, args.requests, args.warmup, args.threads, args.seed)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    output = args.output or f"benchmark-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"\n💾 Results written to {output}")
+
+    if baseline:
+        regressions = find_regressions(result, baseline, args.max_regression)
+        if regressions:
+            print(f"❌ p95 regressed more than {args.max_regression}% on: {', '.join(regressions)}")
+            sys.exit(1)
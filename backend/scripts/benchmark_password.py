@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Login throughput against password hash cost.
+
+For every cost in --costs and every pool size in --pool-workers, builds an
+app on a fresh SQLite file whose sample users are hashed at that cost, then
+for --seconds runs login threads (POST /api/auth/login) next to reader
+threads (GET /api/recipes/<id>) and reports throughput and p95 of both, so
+the effect of hashing on unrelated reads is visible too.
+
+    python scripts/benchmark_password.py --algorithm scrypt --costs 4096 16384 32768
+    python scripts/benchmark_password.py --pool-workers 0 2 --login-threads 8
+
+Results are written as JSON (--output) like the other benchmarks.
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmark_api import percentile
+
+LOGIN = {'email': 'sari@example.com', 'password': 'sari123'}
+
+def build_app(directory, algorithm, cost, pool_workers):
+    from app import create_app, db
+    from app.cli import bootstrap_database
+    from app.models import Recipe
+
+    database = os.path.join(directory, f'{algorithm.replace(":", "-")}-{cost}-{pool_workers}.db')
+    app = create_app(test_config={
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{database}',
+        'PASSWORD_HASH_ALGORITHM': algorithm,
+        'PASSWORD_HASH_COST': cost,
+        'PASSWORD_POOL_WORKERS': pool_workers,
+        'RESPONSE_CACHE_BACKEND': 'none',
+        'METRICS_ENABLED': False,
+        'RATE_LIMIT_ENABLED': False
+    })
+    with app.app_context():
+        bootstrap_database(seed=True)
+        recipe_ids = [row[0] for row in db.session.query(Recipe.id).filter_by(is_published=True)]
+        db.session.remove()
+    return app, recipe_ids
+
+def run_case(app, recipe_ids, login_threads, reader_threads, seconds):
+    results = {'login': [], 'read': []}
+    errors = {'login': 0, 'read': 0}
+    lock = threading.Lock()
+    deadline = time.time() + seconds
+
+    def worker(kind, index):
+        client = app.test_client()
+        latencies, failed = [], 0
+        while time.time() < deadline:
+            started = time.perf_counter()
+            if kind == 'login':
+                response = client.post('/api/auth/login', json=LOGIN)
+            else:
+                response = client.get(f'/api/recipes/{recipe_ids[index % len(recipe_ids)]}')
+                index += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                failed += 1
+        with lock:
+            results[kind].extend(latencies)
+            errors[kind] += failed
+
+    threads = [threading.Thread(target=worker, args=('login', i)) for i in range(login_threads)]
+    threads += [threading.Thread(target=worker, args=('read', i)) for i in range(reader_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    summary = {}
+    for kind, latencies in results.items():
+        latencies.sort()
+        summary[kind] = {
+            'requests': len(latencies),
+            'per_second': round(len(latencies) / seconds, 1),
+            'errors': errors[kind],
+            'p50_ms': round(percentile(latencies, 50), 3) if latencies else None,
+            'p95_ms': round(percentile(latencies, 95), 3) if latencies else None
+        }
+    return summary
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure login throughput against password hash cost')
+    parser.add_argument('--algorithm', default='scrypt', help="'scrypt', 'pbkdf2:sha256' or 'pbkdf2:sha512'")
+    parser.add_argument('--costs', type=int, nargs='+', default=[4096, 16384, 32768],
+                        help='scrypt N or pbkdf2 iterations')
+    parser.add_argument('--pool-workers', type=int, nargs='+', default=[0, 2],
+                        help='PASSWORD_POOL_WORKERS values to compare (0 = hash on the request thread)')
+    parser.add_argument('--login-threads', type=int, default=4)
+    parser.add_argument('--reader-threads', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--output', help='where to write the JSON result')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='cookeasy-password-')
+    result = {
+        'timestamp': datetime.utcnow().isoformat(),
+        'algorithm': args.algorithm,
+        'login_threads': args.login_threads,
+        'reader_threads': args.reader_threads,
+        'seconds': args.seconds,
+        'cases': []
+    }
+
+    print(f"\n🔐 {args.algorithm}: {args.login_threads} login + {args.reader_threads} reader threads, {args.seconds}s per case")
+    print(f"{'cost':>10}{'pool':>6}{'logins/s':>10}{'login p95':>11}{'reads/s':>9}{'read p95':>10}{'503s':>6}")
+    try:
+        for cost in args.costs:
+            for pool_workers in args.pool_workers:
+                app, recipe_ids = build_app(directory, args.algorithm, cost, pool_workers)
+                summary = run_case(app, recipe_ids, args.login_threads, args.reader_threads, args.seconds)
+                result['cases'].append({'cost': cost, 'pool_workers': pool_workers, **summary})
+                login, read = summary['login'], summary['read']
+                print(f"{cost:>10}{pool_workers:>6}{login['per_second']:>10}{login['p95_ms'] or 0:>11.1f}"
+                      f"{read['per_second']:>9}{read['p95_ms'] or 0:>10.1f}{login['errors']:>6}")
+    finally:
+        from app.services.password_service import password_service
+        password_service.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    output = args.output or f"benchmark-password-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"\n💾 Results written to {output}")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Read/write concurrency benchmark for the SQLite tuning profile.
+
+Copies a database twice and runs the same workload against each copy for
+--seconds: reader processes fetch recipe details while writer processes
+toggle favorites, each through its own app and Flask test client.
+    baseline  rollback journal, default pragmas, no BEGIN IMMEDIATE / retries
+    tuned     SQLITE_PRAGMAS from config.py (WAL, synchronous=NORMAL, ...)
+
+    python scripts/generate_dataset.py --database sqlite:////tmp/bench.db
+    python scripts/benchmark_sqlite_concurrency.py --source /tmp/bench.db --readers 8 --writers 2
+
+Reports throughput, lock errors and p95 latency per mode as JSON (--output).
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sqlite3
+import sys
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmark_api import percentile
+
+def prepare_copy(source, directory, name, journal_mode):
+    path = os.path.join(directory, f'{name}.db')
+    shutil.copyfile(source, path)
+    conn = sqlite3.connect(path)
+    conn.execute(f'PRAGMA journal_mode={journal_mode}')
+    conn.close()
+    return path
+
+def run_worker(path, tuned, kind, index, start_at, seconds, seed):
+    """One reader or writer process; returns (latencies_ms, server_errors)"""
+    from app import create_app, db
+    from app.models import User, Recipe
+    from flask_jwt_extended import create_access_token
+
+    config = {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'RESPONSE_CACHE_BACKEND': 'none',
+              'METRICS_ENABLED': False}
+    if not tuned:
+        config['SQLITE_TUNING'] = False
+    app = create_app(test_config=config)
+
+    with app.app_context():
+        recipe_ids = [row[0] for row in db.session.query(Recipe.id).filter_by(is_published=True).limit(5000)]
+        user_id = db.session.query(User.id).order_by(User.id).offset(index).limit(1).scalar()
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(user_id))}'}
+        db.session.remove()
+
+    rng = random.Random(seed + index)
+    client = app.test_client()
+    latencies, failed = [], 0
+    time.sleep(max(0.0, start_at - time.time()))
+    deadline = start_at + seconds
+    while time.time() < deadline:
+        recipe_id = rng.choice(recipe_ids)
+        started = time.perf_counter()
+        if kind == 'read':
+            response = client.get(f'/api/recipes/{recipe_id}')
+        else:
+            response = client.post(f'/api/recipes/{recipe_id}/favorite', headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 500:
+            failed += 1
+    return latencies, failed
+
+def run_mode(path, tuned, readers, writers, seconds, seed):
+    """Run readers and writers as separate processes, like workers of a multi-process server"""
+    jobs = [('read', i) for i in range(readers)] + [('write', readers + i) for i in range(writers)]
+    # Give every process time to import and build its app before the clock starts
+    start_at = time.time() + 5.0
+    with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+        futures = [(kind, pool.submit(run_worker, path, tuned, kind, index, start_at, seconds, seed))
+                   for kind, index in jobs]
+        results = {'read': [], 'write': []}
+        errors = {'read': 0, 'write': 0}
+        for kind, future in futures:
+            latencies, failed = future.result()
+            results[kind].extend(latencies)
+            errors[kind] += failed
+
+    summary = {}
+    for kind, latencies in results.items():
+        latencies.sort()
+        summary[kind] = {
+            'requests': len(latencies),
+            'per_second': round(len(latencies) / seconds, 1),
+            'errors': errors[kind],
+            'p50_ms': round(percentile(latencies, 50), 3) if latencies else None,
+            'p95_ms': round(percentile(latencies, 95), 3) if latencies else None
+        }
+    return summary
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare SQLite read/write concurrency with and without tuning')
+    parser.add_argument('--source', required=True, help='SQLite database file to copy')
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='where to write the JSON result')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='cookeasy-concurrency-')
+    modes = {
+        'baseline': (prepare_copy(args.source, directory, 'baseline', 'DELETE'), False),
+        'tuned': (prepare_copy(args.source, directory, 'tuned', 'WAL'), True)
+    }
+
+    result = {
+        'timestamp': datetime.utcnow().isoformat(),
+        'source': args.source,
+        'readers': args.readers,
+        'writers': args.writers,
+        'seconds': args.seconds,
+        'modes': {}
+    }
+    print(f"\n⚙️  {args.readers} readers + {args.writers} writers for {args.seconds}s per mode")
+    print(f"{'mode':<10}{'kind':<7}{'req/s':>9}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, (path, tuned) in modes.items():
+        summary = run_mode(path, tuned, args.readers, args.writers, args.seconds, args.seed)
+        result['modes'][name] = summary
+        for kind, stats in summary.items():
+            print(f"{name:<10}{kind:<7}{stats['per_second']:>9}{stats['errors']:>8}"
+                  f"{stats['p50_ms'] or 0:>10.2f}{stats['p95_ms'] or 0:>10.2f}")
+
+    shutil.rmtree(directory, ignore_errors=True)
+
+    output = args.output or f"benchmark-concurrency-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"\n💾 Results written to {output}")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: what a fresh worker process pays before it can serve.
+
+Each run starts a new interpreter and measures, in milliseconds,
+    import_ms        importing the app package (extensions, models)
+    create_app_ms    create_app()
+    first_request_ms the first request (GET /api/recipes/featured)
+
+    python scripts/benchmark_startup.py --runs 20 --output startup.json
+    python scripts/benchmark_startup.py --compare startup.json
+
+Results are written as JSON like scripts/benchmark_api.py; --compare prints
+deltas and exits non-zero when a median regresses by more than --max-regression percent.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import os
+from datetime import datetime
+
+from benchmark_api import percentile
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Runs in the child interpreter; prints one JSON line of timings
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app(test_config={'SQLALCHEMY_DATABASE_URI': sys.argv[1]} if sys.argv[1] else None)
+created = time.perf_counter()
+app.test_client().get('/api/recipes/featured')
+served = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (served - created) * 1000
+}))
+"""
+
+PHASES = ['import_ms', 'create_app_ms', 'first_request_ms']
+
+def run_once(database_uri):
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE, database_uri or ''],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def run_benchmark(runs, database_uri):
+    samples = [run_once(database_uri) for _ in range(runs)]
+    phases = {}
+    for phase in PHASES + ['total_ms']:
+        if phase == 'total_ms':
+            values = sorted(sum(sample[p] for p in PHASES) for sample in samples)
+        else:
+            values = sorted(sample[phase] for sample in samples)
+        phases[phase] = {
+            'p50_ms': round(percentile(values, 50), 3),
+            'p95_ms': round(percentile(values, 95), 3),
+            'max_ms': round(values[-1], 3)
+        }
+    return {
+        'timestamp': datetime.utcnow().isoformat(),
+        'python': sys.version.split()[0],
+        'runs': runs,
+        'phases': phases
+    }
+
+def print_report(result, baseline=None):
+    print(f"\n🚀 Cold start over {result['runs']} fresh processes")
+    print(f"{'phase':<18}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'Δp50':>10}")
+    for phase, stats in result['phases'].items():
+        delta = ''
+        previous = (baseline or {}).get('phases', {}).get(phase)
+        if previous and previous['p50_ms']:
+            delta = f"{(stats['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] * 100:+.0f}%"
+        print(f"{phase:<18}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['max_ms']:>10.1f}{delta:>10}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure per-worker cold-start time')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--database', help='SQLAlchemy URI (default: the app database)')
+    parser.add_argument('--output', help='where to write the JSON result')
+    parser.add_argument('--compare', help='earlier JSON result to compare against')
+    parser.add_argument('--max-regression', type=float, default=20.0, help='allowed p50 growth in percent')
+    args = parser.parse_args()
+
+    result = run_benchmark(args.runs, args.database)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    output = args.output or f"benchmark-startup-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"\n💾 Results written to {output}")
+
+    if baseline:
+        regressed = [
+            phase for phase, stats in result['phases'].items()
+            if baseline.get('phases', {}).get(phase, {}).get('p50_ms')
+            and (stats['p50_ms'] - baseline['phases'][phase]['p50_ms'])
+            / baseline['phases'][phase]['p50_ms'] * 100 > args.max_regression
+        ]
+        if regressed:
+            print(f"❌ p50 regressed more than {args.max_regression}% on: {', '.join(regressed)}")
+            sys.exit(1)
@@ -4,6 +4,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import create_app, db
 from app.models import Category, Recipe, User, Ingredient, Rating
+from app.services.rating_service import RatingService
+from app.services.search_service import SearchService
+from app.services.slug_service import slugify
 from datetime import datetime
 from werkzeug.security import generate_password_hash
 
@@ -116,7 +119,6 @@ def create_sample_data():
         recipes_data = [
             {
                 'title': 'Nasi Goreng Spesial',
-                'slug': 'nasi-goreng-spesial',
                 'description': 'Nasi goreng dengan bumbu rahasia yang menggugah selera',
                 'instructions': 'Panaskan minyak, tumis bumbu, masukkan nasi, aduk rata.',
                 'prep_time': 15,
@@ -133,7 +135,6 @@ def create_sample_data():
             },
             {
                 'title': 'Rendang Daging Sapi',
-                'slug': 'rendang-daging-sapi', 
                 'description': 'Rendang autentik dengan rempah-rempah pilihan',
                 'instructions': 'Rebus daging dengan bumbu halus hingga empuk dan bumbu meresap.',
                 'prep_time': 30,
@@ -150,7 +151,6 @@ def create_sample_data():
             },
             {
                 'title': 'Gado-Gado Jakarta',
-                'slug': 'gado-gado-jakarta',
                 'description': 'Salad sayuran segar dengan bumbu kacang yang nikmat',
                 'instructions': 'Rebus sayuran, buat bumbu kacang, campur dan sajikan.',
                 'prep_time': 20,
@@ -167,7 +167,6 @@ def create_sample_data():
             },
             {
                 'title': 'Es Cendol',
-                'slug': 'es-cendol',
                 'description': 'Minuman tradisional yang menyegarkan',
                 'instructions': 'Buat cendol, siapkan santan dan gula merah, sajikan dengan es.',
                 'prep_time': 30,
@@ -184,7 +183,6 @@ def create_sample_data():
             },
             {
                 'title': 'Ayam Bakar Taliwang',
-                'slug': 'ayam-bakar-taliwang',
                 'description': 'Ayam bakar pedas khas Lombok yang menggugah selera',
                 'instructions': 'Marinasi ayam dengan bumbu, bakar hingga matang dan berkulit keemasan.',
                 'prep_time': 45,
@@ -201,7 +199,6 @@ def create_sample_data():
             },
             {
                 'title': 'Sate Ayam Madura',
-                'slug': 'sate-ayam-madura',
                 'description': 'Sate ayam dengan bumbu kacang khas Madura yang autentik',
                 'instructions': 'Potong ayam, tusuk, bakar sambil olesi bumbu, sajikan dengan bumbu kacang.',
                 'prep_time': 60,
@@ -219,6 +216,7 @@ def create_sample_data():
         ]
         
         for recipe_data in recipes_data:
+            recipe_data['slug'] = slugify(recipe_data['title'])
             existing_recipe = Recipe.query.filter_by(slug=recipe_data['slug']).first()
             if not existing_recipe:
                 recipe = Recipe(**recipe_data)
@@ -239,8 +237,12 @@ def create_sample_data():
                     is_verified=True
                 )
                 db.session.add(rating)
+                RatingService.apply_rating_change(recipe.id, None, rating.rating)
         
         db.session.commit()
+        
+        # Make the new recipes searchable
+        SearchService.rebuild_index()
         print("Sample data created successfully!")
 
 if __name__ == '__main__':
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Script to bulk-load a synthetic dataset of configurable size, e.g.
+
+    python scripts/generate_dataset.py --users 100000 --recipes 1000000 --ratings 10000000
+
+Rows are written with Core insert() executemany in chunks (one transaction
+per chunk) with ids assigned up front, so links between tables never need a
+round trip. Rating aggregates and the search index are rebuilt at the end.
+Adds to whatever is already in the database; run it against a copy.
+"""
+
+import argparse
+import random
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app, db
+from app.cli import bootstrap_database
+from app.models import User, Recipe, Category, Rating, Ingredient, RecipeIngredient, recipe_categories
+from app.services.rating_service import RatingService
+from app.services.search_service import SearchService
+from app.services.version_service import bump_versions
+from sqlalchemy import func, insert
+from app.services.password_service import password_service
+
+DIFFICULTIES = ['Easy', 'Medium', 'Hard']
+UNITS = ['gram', 'ml', 'piece', 'cup', 'tablespoon', 'teaspoon', 'clove']
+INGREDIENT_CATEGORIES = ['protein', 'vegetable', 'grain', 'spice', 'condiment', 'dairy', 'fruit', 'oil']
+TITLE_WORDS = [
+    'Nasi', 'Mie', 'Ayam', 'Sapi', 'Ikan', 'Udang', 'Tahu', 'Tempe', 'Sayur', 'Sambal',
+    'Goreng', 'Bakar', 'Rebus', 'Kuah', 'Pedas', 'Manis', 'Spesial', 'Kampung', 'Padang', 'Bali',
+    'Soto', 'Rendang', 'Sate', 'Gulai', 'Opor', 'Pepes', 'Bakso', 'Martabak', 'Es', 'Kue'
+]
+# Skewed star distribution, closer to real reviews than uniform
+STAR_WEIGHTS = [0.05, 0.07, 0.18, 0.35, 0.35]
+
+def chunked_insert(table, rows, chunk_size):
+    """Insert an iterable of row dicts in executemany chunks; returns the number of rows"""
+    total = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            total += _insert_chunk(table, chunk)
+            chunk = []
+    if chunk:
+        total += _insert_chunk(table, chunk)
+    return total
+
+def _insert_chunk(table, chunk):
+    with db.engine.begin() as conn:
+        conn.execute(insert(table), chunk)
+    return len(chunk)
+
+def next_id(model):
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+def generate_users(count, start_id, now):
+    # Hashing is deliberately slow, so every synthetic user shares one hash ('password123')
+    password_hash = password_service.hash('password123')
+    for i in range(count):
+        user_id = start_id + i
+        yield {
+            'id': user_id,
+            'username': f'synthetic_user_{user_id}',
+            'email': f'synthetic_user_{user_id}@example.com',
+            'password_hash': password_hash,
+            'full_name': f'Synthetic User {user_id}',
+            'role': 'chef' if i % 20 == 0 else 'user',
+            'is_active': True,
+            'is_verified': i % 3 == 0,
+            'created_at': now - timedelta(minutes=i),
+            'updated_at': now
+        }
+
+def generate_ingredients(count, start_id, now):
+    for i in range(count):
+        ingredient_id = start_id + i
+        yield {
+            'id': ingredient_id,
+            'name': f'Synthetic Ingredient {ingredient_id}',
+            'unit': UNITS[i % len(UNITS)],
+            'category': INGREDIENT_CATEGORIES[i % len(INGREDIENT_CATEGORIES)],
+            'is_active': True,
+            'created_at': now,
+            'updated_at': now
+        }
+
+def generate_recipes(count, start_id, author_ids, category_ids, rng, now):
+    for i in range(count):
+        recipe_id = start_id + i
+        title = ' '.join(rng.sample(TITLE_WORDS, 3))
+        prep_time, cook_time = rng.randint(5, 60), rng.randint(5, 120)
+        created_at = now - timedelta(minutes=count - i)
+        yield {
+            'id': recipe_id,
+            'title': title,
+            'slug': f'synthetic-{recipe_id}',
+            'description': f'{title} made the synthetic way',
+            'instructions': '1. Prepare the ingredients\n2. Cook\n3. Serve',
+            'prep_time': prep_time,
+            'cook_time': cook_time,
+            'total_time': prep_time + cook_time,
+            'servings': rng.randint(1, 8),
+            'difficulty': rng.choice(DIFFICULTIES),
+            'is_published': rng.random() < 0.9,
+            'is_featured': rng.random() < 0.01,
+            'view_count': int(rng.paretovariate(1.2) * 10),
+            'like_count': 0,
+            'user_id': rng.choice(author_ids),
+            'category_id': rng.choice(category_ids) if category_ids else None,
+            'created_at': created_at,
+            'updated_at': created_at
+        }
+
+def generate_recipe_categories(recipe_ids, category_ids, rng):
+    for recipe_id in recipe_ids:
+        for category_id in rng.sample(category_ids, min(len(category_ids), rng.randint(1, 2))):
+            yield {'recipe_id': recipe_id, 'category_id': category_id}
+
+def generate_recipe_ingredients(recipe_ids, ingredient_ids, per_recipe, rng):
+    for recipe_id in recipe_ids:
+        count = min(len(ingredient_ids), rng.randint(max(1, per_recipe // 2), per_recipe * 3 // 2))
+        for order, ingredient_id in enumerate(rng.sample(ingredient_ids, count)):
+            yield {
+                'recipe_id': recipe_id,
+                'ingredient_id': ingredient_id,
+                'quantity': round(rng.uniform(0.5, 500), 1),
+                'unit': rng.choice(UNITS),
+                'notes': '',
+                'order': order
+            }
+
+def generate_ratings(count, recipe_ids, user_ids, rng, now):
+    """
+    Ratings spread round-robin over recipes. Recipe r gets users
+    (j + 7r) mod |users| on round j, so (user, recipe) pairs never repeat.
+    """
+    stars = [1, 2, 3, 4, 5]
+    for k in range(count):
+        round_number, recipe_index = divmod(k, len(recipe_ids))
+        yield {
+            'user_id': user_ids[(round_number + 7 * recipe_index) % len(user_ids)],
+            'recipe_id': recipe_ids[recipe_index],
+            'rating': rng.choices(stars, STAR_WEIGHTS)[0],
+            'review': '',
+            'is_verified': False,
+            'helpful_count': 0,
+            'created_at': now,
+            'updated_at': now
+        }
+
+def generate_dataset(users, recipes, ratings, ingredients, ingredients_per_recipe, chunk_size, seed,
+                     database_uri=None):
+    app = create_app(test_config={'SQLALCHEMY_DATABASE_URI': database_uri} if database_uri else None)
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    with app.app_context():
+        try:
+            # A fresh database gets the schema plus the sample categories and ingredients
+            bootstrap_database(seed=True)
+            started = time.perf_counter()
+
+            def report(label, count, since):
+                elapsed = time.perf_counter() - since
+                print(f"✅ {label}: {count} rows in {elapsed:.1f}s ({count / elapsed if elapsed else 0:.0f} rows/s)")
+
+            step = time.perf_counter()
+            first_user = next_id(User)
+            report('users', chunked_insert(User.__table__, generate_users(users, first_user, now), chunk_size), step)
+
+            step = time.perf_counter()
+            first_ingredient = next_id(Ingredient)
+            report('ingredients', chunked_insert(
+                Ingredient.__table__, generate_ingredients(ingredients, first_ingredient, now), chunk_size
+            ), step)
+
+            # The session's transaction began before the inserts above (next_id); under WAL
+            # it would still read that snapshot and only see the pre-existing rows
+            db.session.remove()
+            user_ids = [row[0] for row in db.session.query(User.id)]
+            author_ids = [row[0] for row in db.session.query(User.id).filter(User.role.in_(['chef', 'admin']))] or user_ids
+            category_ids = [row[0] for row in db.session.query(Category.id)]
+            ingredient_ids = [row[0] for row in db.session.query(Ingredient.id)]
+            db.session.remove()
+
+            step = time.perf_counter()
+            first_recipe = next_id(Recipe)
+            report('recipes', chunked_insert(
+                Recipe.__table__, generate_recipes(recipes, first_recipe, author_ids, category_ids, rng, now), chunk_size
+            ), step)
+            recipe_ids = list(range(first_recipe, first_recipe + recipes))
+            db.session.remove()
+
+            if category_ids:
+                step = time.perf_counter()
+                report('recipe categories', chunked_insert(
+                    recipe_categories, generate_recipe_categories(recipe_ids, category_ids, rng), chunk_size
+                ), step)
+
+            if ingredient_ids and ingredients_per_recipe:
+                step = time.perf_counter()
+                report('recipe ingredients', chunked_insert(
+                    RecipeIngredient.__table__,
+                    generate_recipe_ingredients(recipe_ids, ingredient_ids, ingredients_per_recipe, rng),
+                    chunk_size
+                ), step)
+
+            if recipe_ids and ratings:
+                ratings = min(ratings, len(recipe_ids) * len(user_ids))
+                step = time.perf_counter()
+                report('ratings', chunked_insert(
+                    Rating.__table__, generate_ratings(ratings, recipe_ids, user_ids, rng, now), chunk_size
+                ), step)
+
+            print("🔄 Rebuilding rating aggregates...")
+            RatingService.rebuild_aggregates()
+            print("🔄 Rebuilding search index...")
+            SearchService.rebuild_index()
+
+            # Core inserts bypass the ORM listeners, so invalidate cached validators explicitly
+            with db.engine.begin() as conn:
+                bump_versions(conn, [
+                    'users', 'ingredients', 'recipes', 'recipe_categories', 'recipe_ingredients', 'ratings'
+                ])
+
+            print(f"🎉 Dataset generated in {time.perf_counter() - started:.1f}s")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Error generating dataset: {str(e)}")
+            raise
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bulk-load a synthetic CookEasy dataset')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--recipes', type=int, default=10000)
+    parser.add_argument('--ratings', type=int, default=50000)
+    parser.add_argument('--ingredients', type=int, default=500, help='synthetic ingredients to add')
+    parser.add_argument('--ingredients-per-recipe', type=int, default=8)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database', help='SQLAlchemy URI to load into (default: the app database)')
+    args = parser.parse_args()
+
+    generate_dataset(args.users, args.recipes, args.ratings, args.ingredients,
+                     args.ingredients_per_recipe, args.chunk_size, args.seed, args.database)
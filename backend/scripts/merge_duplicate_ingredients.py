@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Script to add ingredients.name_key and merge ingredients whose names only
+differ in case, spacing or Unicode form ("Garlic", "garlic ", "GARLIC").
+
+For every group the oldest ingredient (lowest id) is kept; recipe lines
+pointing at the others are repointed to it, the others are deleted and the
+affected recipes are reindexed for search. Finally the unique index on
+name_key is created. Safe to run again; with --dry-run nothing is written.
+
+Restart the app workers afterwards: their ingredient caches may still hold
+ids of merged ingredients.
+"""
+
+import argparse
+import sys
+import os
+from collections import defaultdict
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app, db
+from app.models import normalize_ingredient_name
+from app.services.search_service import SearchService
+from app.services.version_service import bump_versions
+from app.utils.response_cache import response_cache
+from sqlalchemy import bindparam, text
+
+def merge_duplicate_ingredients(dry_run=False):
+    app = create_app()
+
+    with app.app_context():
+        try:
+            columns = [row[1] for row in db.session.execute(text("PRAGMA table_info(ingredients)"))]
+            if 'name_key' not in columns:
+                print("📝 Adding name_key to ingredients table...")
+                if not dry_run:
+                    db.session.execute(text("ALTER TABLE ingredients ADD COLUMN name_key VARCHAR(100)"))
+
+            rows = db.session.execute(text("SELECT id, name FROM ingredients ORDER BY id")).fetchall()
+            groups = defaultdict(list)
+            for ingredient_id, name in rows:
+                groups[normalize_ingredient_name(name)].append((ingredient_id, name))
+            duplicates = {key: members for key, members in groups.items() if len(members) > 1}
+
+            print(f"🔍 {len(rows)} ingredients, {len(duplicates)} names with duplicates")
+            for members in duplicates.values():
+                keep, merged = members[0], members[1:]
+                print(f"   {keep[1]!r} (#{keep[0]}) <- " + ', '.join(f'{name!r} (#{i})' for i, name in merged))
+            if dry_run:
+                db.session.rollback()
+                print("ℹ️  Dry run, nothing written")
+                return
+
+            # Keys must be unique before the index exists, so merge first
+            db.session.execute(text("DROP INDEX IF EXISTS ux_ingredients_name_key"))
+            merged_ids = {}
+            for members in duplicates.values():
+                for ingredient_id, _ in members[1:]:
+                    merged_ids[ingredient_id] = members[0][0]
+
+            affected_recipes = set()
+            if merged_ids:
+                affected_recipes.update(db.session.execute(
+                    text("SELECT DISTINCT recipe_id FROM recipe_ingredients WHERE ingredient_id IN :ids")
+                    .bindparams(bindparam('ids', expanding=True)),
+                    {'ids': list(merged_ids)}
+                ).scalars())
+                db.session.execute(
+                    text("UPDATE recipe_ingredients SET ingredient_id = :keep WHERE ingredient_id = :merged"),
+                    [{'keep': keep, 'merged': merged} for merged, keep in merged_ids.items()]
+                )
+                db.session.execute(
+                    text("DELETE FROM ingredients WHERE id = :merged"),
+                    [{'merged': merged} for merged in merged_ids]
+                )
+
+            db.session.execute(
+                text("UPDATE ingredients SET name_key = :key WHERE id = :id"),
+                [{'key': key, 'id': members[0][0]} for key, members in groups.items()]
+            )
+            db.session.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ux_ingredients_name_key ON ingredients (name_key)"
+            ))
+            # Recipes keep their lines but now show the surviving ingredient's name
+            has_search_index = db.session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = 'recipes_fts'")
+            ).first() is not None
+            if has_search_index:
+                SearchService.index_recipes(sorted(affected_recipes))
+            bump_versions(db.session.connection(), ['ingredients', 'recipe_ingredients'])
+            db.session.commit()
+            response_cache.evict('recipe-list', *(f'recipe:{recipe_id}' for recipe_id in affected_recipes))
+
+            print(f"✅ Merged {len(merged_ids)} duplicate ingredients, {len(affected_recipes)} recipes repointed")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Error merging ingredients: {str(e)}")
+            raise
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Add ingredients.name_key and merge duplicate ingredients')
+    parser.add_argument('--dry-run', action='store_true', help='only list the duplicates')
+    args = parser.parse_args()
+
+    merge_duplicate_ingredients(dry_run=args.dry_run)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Script to add the denormalized rating aggregate columns to the recipes table
+(if missing) and rebuild them from the ratings table.
+
+Safe to re-run at any time to repair drifted aggregates.
+"""
+
+import sys
+import os
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app, db
+from app.services.rating_service import RatingService
+from sqlalchemy import text
+
+AGGREGATE_COLUMNS = [
+    ('rating_sum', 'INTEGER DEFAULT 0'),
+    ('rating_count', 'INTEGER DEFAULT 0'),
+    ('rating_avg', 'FLOAT DEFAULT 0.0'),
+    ('rating_1_count', 'INTEGER DEFAULT 0'),
+    ('rating_2_count', 'INTEGER DEFAULT 0'),
+    ('rating_3_count', 'INTEGER DEFAULT 0'),
+    ('rating_4_count', 'INTEGER DEFAULT 0'),
+    ('rating_5_count', 'INTEGER DEFAULT 0'),
+]
+
+def add_aggregate_columns():
+    """Add missing aggregate columns and the rating sort index (SQLite specific)"""
+    with db.engine.connect() as conn:
+        result = conn.execute(text("PRAGMA table_info(recipes)"))
+        columns = [row[1] for row in result.fetchall()]
+
+        for name, ddl in AGGREGATE_COLUMNS:
+            if name not in columns:
+                print(f"📝 Adding column recipes.{name}...")
+                conn.execute(text(f"ALTER TABLE recipes ADD COLUMN {name} {ddl}"))
+
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_recipes_published_rating "
+            "ON recipes (is_published, rating_avg, id)"
+        ))
+        conn.commit()
+
+def rebuild_rating_aggregates():
+    app = create_app()
+
+    with app.app_context():
+        try:
+            add_aggregate_columns()
+
+            print("🔄 Rebuilding rating aggregates from ratings table...")
+            updated = RatingService.rebuild_aggregates()
+            print(f"✅ Rebuilt aggregates for {updated} rated recipes")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Error rebuilding rating aggregates: {str(e)}")
+            raise
+
+if __name__ == '__main__':
+    rebuild_rating_aggregates()
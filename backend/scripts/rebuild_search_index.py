@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Script to (re)build the FTS5 full-text search index over recipes.
+
+Run once after upgrading an existing database, or any time the index
+is suspected to be out of sync with the recipes tables.
+"""
+
+import sys
+import os
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app, db
+from app.services.search_service import SearchService
+
+def rebuild_search_index():
+    app = create_app()
+
+    with app.app_context():
+        try:
+            print("🔄 Rebuilding recipe search index...")
+            indexed = SearchService.rebuild_index()
+            print(f"✅ Indexed {indexed} recipes")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Error rebuilding search index: {str(e)}")
+            raise
+
+if __name__ == '__main__':
+    rebuild_search_index()
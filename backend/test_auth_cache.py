@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Checks for the cached authorization state behind role_required.
+"""
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import db
+from app.models import User
+from app.services.auth_cache import auth_cache, auth_claims
+
+def bearer(user):
+    return {'Authorization': f'Bearer {create_access_token(identity=str(user.id), additional_claims=auth_claims(user))}'}
+
+def test_cached_auth_state_needs_no_query(app):
+    user = User.query.filter_by(role='user').first()
+    auth_cache.get(user.id)
+    statements = []
+    event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+    state = auth_cache.get(user.id, min_version=user.auth_version)
+
+    assert state.role == 'user'
+    assert statements == []
+
+def test_role_change_applies_to_existing_tokens(app):
+    admin = User.query.filter_by(role='admin').first()
+    user = User.query.filter_by(role='user').first()
+    admin_headers, user_headers = bearer(admin), bearer(user)
+    client = app.test_client()
+
+    assert client.get('/api/auth/users', headers=user_headers).status_code == 403
+    client.patch(f'/api/auth/users/{user.id}/role', json={'role': 'admin'}, headers=admin_headers)
+    assert client.get('/api/auth/users', headers=user_headers).status_code == 200
+    client.patch(f'/api/auth/users/{user.id}/status', json={'is_active': False}, headers=admin_headers)
+    assert client.get('/api/auth/users', headers=user_headers).status_code == 401
+    assert db.session.get(User, user.id).auth_version == 3
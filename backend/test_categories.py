@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Checks for the category list and its published recipe counts.
+"""
+
+from app import db
+from app.models import User, Recipe, Category
+
+def add_linked_recipes():
+    """Recipes linked to categories through recipe_categories, the legacy category_id, both, or neither"""
+    chef = User.query.filter_by(role='chef').first()
+    first, second, third = Category.query.filter_by(is_active=True).order_by(Category.id).limit(3).all()
+    links = [
+        ([first], None, True),
+        ([first, second], None, True),
+        ([], second, True),
+        ([second], second, True),     # both ways to one category counts once
+        ([third], first, True),       # both ways to different categories counts for each
+        ([first, third], third, False),
+        ([], None, True)
+    ]
+    for i, (categories, legacy_category, published) in enumerate(links):
+        db.session.add(Recipe(
+            title=f'Category Count Recipe {i}',
+            slug=f'category-count-recipe-{i}',
+            instructions='Mix and serve',
+            is_published=published,
+            user_id=chef.id,
+            category_id=legacy_category.id if legacy_category else None,
+            categories=categories
+        ))
+    db.session.commit()
+
+def per_category_count(category):
+    """The count the categories endpoint made with one query per category"""
+    return db.session.query(Recipe).filter(
+        db.or_(
+            Recipe.categories.any(Category.id == category.id),
+            Recipe.category_id == category.id
+        ),
+        Recipe.is_published == True
+    ).distinct().count()
+
+def test_grouped_counts_match_per_category_counts(app):
+    first, second, third = Category.query.filter_by(is_active=True).order_by(Category.id).limit(3).all()
+    before = {category.id: per_category_count(category) for category in (first, second, third)}
+    add_linked_recipes()
+
+    categories = app.test_client().get('/api/recipes/categories').get_json()['categories']
+    expected = {category.id: per_category_count(category)
+                for category in Category.query.filter_by(is_active=True)}
+
+    assert {category['id']: category['recipe_count'] for category in categories} == expected
+    assert Category.get_published_recipe_counts() == {
+        category_id: count for category_id, count in expected.items() if count
+    }
+    assert {category_id: expected[category_id] - count for category_id, count in before.items()} == {
+        first.id: 3, second.id: 3, third.id: 1
+    }
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Checks for the batched ingredient find-or-create.
+"""
+
+from sqlalchemy import event
+
+from app import db
+from app.models import Ingredient
+from app.services.ingredient_resolver import ingredient_resolver
+
+def test_spellings_of_one_name_resolve_to_one_ingredient(app):
+    garlic = Ingredient.query.filter_by(name='Garlic').first()
+
+    resolved = ingredient_resolver.resolve([
+        {'name': 'garlic '}, {'name': 'GARLIC'}, {'name': 'Daun  Jeruk', 'unit': 'piece'}, {'name': 'daun jeruk'}
+    ])
+    db.session.commit()
+
+    assert resolved['garlic'] == (garlic.id, 'clove')
+    assert Ingredient.query.filter_by(name_key='daun jeruk').one().name == 'Daun Jeruk'
+    assert resolved['daun jeruk'][1] == 'piece'
+
+def test_a_recipe_resolves_all_its_ingredients_with_one_lookup(app):
+    ingredient_resolver.clear()
+    statements = []
+    event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+    resolved = ingredient_resolver.resolve([{'name': name} for name in ('Rice', 'Chicken', 'Onion', 'Kecap Manis')])
+    db.session.commit()
+    ingredient_resolver.resolve([{'name': 'rice'}, {'name': 'kecap manis'}])
+
+    lookups = [statement for statement in statements if statement.startswith('SELECT') and 'ingredients' in statement]
+    inserts = [statement for statement in statements if statement.startswith('INSERT INTO ingredients')]
+    assert len(resolved) == 4
+    assert len(lookups) == 1
+    assert len(inserts) == 1
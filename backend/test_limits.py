@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Checks for the route-group rate limits and the in-flight request cap.
+"""
+
+import pytest
+
+from app.utils.limits import load_shedder
+
+@pytest.mark.app_config(RATE_LIMITS={'search': {'limit': '2/minute', 'per': 'ip'}})
+def test_route_group_limit_returns_429_with_retry_after(app):
+    client = app.test_client()
+
+    statuses = [client.get('/api/recipes/search?q=nasi').status_code for _ in range(3)]
+    throttled = client.get('/api/recipes/search?q=nasi')
+
+    assert statuses == [200, 200, 429]
+    assert 0 < int(throttled.headers['Retry-After']) <= 30
+    assert client.get('/api/recipes/featured').status_code == 200
+
+@pytest.mark.app_config(MAX_IN_FLIGHT_REQUESTS=4)
+def test_requests_past_the_in_flight_cap_are_shed(app):
+    client = app.test_client()
+    load_shedder.in_flight = load_shedder.limit
+    try:
+        response = client.get('/api/recipes/featured')
+    finally:
+        load_shedder.in_flight = 0
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert client.get('/api/recipes/featured').status_code == 200
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Checks for the /metrics endpoint.
+
+Runs against an in-memory database and a temporary metrics directory.
+"""
+
+import json
+import os
+
+import pytest
+
+from app.utils import metrics
+
+@pytest.fixture
+def app_config(app_config, tmp_path):
+    # The cache hit ratio is one of the reported metrics
+    return dict(app_config, METRICS_DIR=str(tmp_path), RESPONSE_CACHE_BACKEND='memory')
+
+def test_metrics_report_requests_by_route(app):
+    client = app.test_client()
+    client.get('/api/recipes/featured')
+    client.get('/api/recipes/featured')
+
+    body = client.get('/metrics').get_data(as_text=True)
+
+    assert ('cookeasy_http_requests_total{blueprint="recipes",endpoint="recipes.get_featured_recipes",'
+            'method="GET",status="200"} 2') in body
+    assert 'cookeasy_http_request_duration_seconds_bucket{' in body
+    assert 'cookeasy_response_cache_hit_ratio 0.5' in body
+
+def test_metrics_merge_other_worker_snapshots(app):
+    other_worker = {
+        'pid': 0,
+        'counters': [['cookeasy_http_requests_total',
+                      {'blueprint': 'recipes', 'endpoint': 'recipes.get_featured_recipes',
+                       'method': 'GET', 'status': '200'}, 5]],
+        'histograms': [],
+        'gauges': {'cookeasy_view_buffer_depth': 7}
+    }
+    with open(os.path.join(app.config['METRICS_DIR'], '999999.json'), 'w') as f:
+        json.dump(other_worker, f)
+
+    client = app.test_client()
+    client.get('/api/recipes/featured')
+    body = client.get('/metrics').get_data(as_text=True)
+
+    assert ('cookeasy_http_requests_total{blueprint="recipes",endpoint="recipes.get_featured_recipes",'
+            'method="GET",status="200"} 6') in body
+    # Gauges of exited workers are not summed
+    assert 'cookeasy_view_buffer_depth 0' in body
+
+def test_worker_liveness_never_signals_on_windows(monkeypatch):
+    def kill(pid, sig):
+        raise AssertionError('signal 0 is CTRL_C_EVENT on Windows')
+    monkeypatch.setattr(metrics.os, 'name', 'nt')
+    monkeypatch.setattr(metrics.os, 'kill', kill)
+    monkeypatch.setattr(metrics, '_windows_process_alive', lambda pid: pid == 4242)
+
+    assert metrics._process_alive(4242)
+    assert not metrics._process_alive(4243)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Checks for keyset (cursor) pagination of the recipe lists.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app import db
+from app.models import User, Recipe
+from app.utils.pagination import MAX_CURSOR_PAGE_SIZE, encode_cursor
+
+@pytest.fixture
+def chef(app):
+    """A chef with seven published recipes and one draft, with ties on every sort key"""
+    chef = User.query.filter_by(role='chef').first()
+    created_at = datetime(2026, 1, 1)
+    for i in range(8):
+        db.session.add(Recipe(
+            title=f'Cursor Recipe {i}',
+            slug=f'cursor-recipe-{i}',
+            instructions='Mix and serve',
+            is_published=i != 3,
+            view_count=i % 3,
+            created_at=created_at,
+            user_id=chef.id
+        ))
+    db.session.commit()
+    return chef
+
+def walk(client, url, per_page, **params):
+    """Follow next_cursor from the first page to the last, returning the ids in order"""
+    ids, cursor = [], ''
+    while cursor is not None:
+        body = client.get(url, query_string=dict(params, cursor=cursor, per_page=per_page)).get_json()
+        assert len(body['recipes']) <= per_page
+        ids += [recipe['id'] for recipe in body['recipes']]
+        cursor = body['pagination']['next_cursor']
+    return ids
+
+@pytest.mark.parametrize('sort_by', ['newest', 'popular', 'rating'])
+def test_cursor_pages_match_the_offset_listing(app, chef, sort_by):
+    client = app.test_client()
+    offset_ids = [recipe['id'] for recipe in client.get(f'/api/recipes?sort_by={sort_by}&per_page=100').get_json()['recipes']]
+
+    assert len(offset_ids) == Recipe.query.filter_by(is_published=True).count()
+    assert walk(client, '/api/recipes', 3, sort_by=sort_by) == offset_ids
+
+def test_cursor_pages_of_a_users_recipes(app, chef):
+    client = app.test_client()
+    url = f'/api/auth/users/{chef.id}/recipes'
+    offset_ids = [recipe['id'] for recipe in client.get(f'{url}?per_page=100').get_json()['recipes']]
+
+    assert walk(client, url, 2) == offset_ids
+    assert len(offset_ids) == len(set(offset_ids)) == Recipe.query.filter_by(user_id=chef.id, is_published=True).count()
+
+@pytest.mark.parametrize('cursor', [
+    'not-a-cursor',
+    encode_cursor('popular', [3, 1]),
+    encode_cursor('newest', [datetime(2026, 1, 1)])
+], ids=['garbage', 'other-sort', 'short'])
+def test_bad_cursors_are_rejected(app, chef, cursor):
+    response = app.test_client().get('/api/recipes', query_string={'cursor': cursor, 'sort_by': 'newest'})
+
+    assert response.status_code == 400
+
+@pytest.mark.parametrize('url', ['/api/recipes', '/api/auth/users/{id}/recipes'])
+@pytest.mark.parametrize('requested, used', [('1000', MAX_CURSOR_PAGE_SIZE), ('0', 1), ('-5', 1)])
+def test_page_size_is_clamped_and_echoed(app, chef, url, requested, used):
+    client = app.test_client()
+    url = url.format(id=chef.id)
+
+    for cursor in ({}, {'cursor': ''}):
+        body = client.get(url, query_string=dict(cursor, per_page=requested)).get_json()
+        assert body['pagination']['per_page'] == used
+        assert len(body['recipes']) <= used
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Checks for configurable password hashing and rehash on login.
+"""
+
+import sqlite3
+
+import pytest
+from flask_jwt_extended import create_access_token
+from werkzeug.security import generate_password_hash
+
+from app import db
+from app.models import User
+from app.services.auth_cache import auth_claims
+from app.services.password_service import password_service, PasswordPoolBusy
+
+@pytest.fixture
+def app_config(app_config, tmp_path):
+    # A file database, so another connection can write while a request runs
+    return dict(app_config, SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'auth.db'}",
+                PASSWORD_HASH_ALGORITHM='pbkdf2:sha256', PASSWORD_HASH_COST=1000)
+
+def test_new_hashes_use_the_configured_parameters(app):
+    user = User.query.filter_by(email='sari@example.com').first()
+
+    assert user.password_hash.startswith('pbkdf2:sha256:1000$')
+    assert user.check_password('sari123')
+
+def test_login_upgrades_hashes_made_with_other_parameters(app):
+    user = User.query.filter_by(email='sari@example.com').first()
+    user.password_hash = generate_password_hash('sari123', method='scrypt:1024:8:1')
+    db.session.commit()
+
+    response = app.test_client().post('/api/auth/login', json={'email': 'sari@example.com', 'password': 'sari123'})
+
+    assert response.status_code == 200
+    db.session.expire_all()
+    assert db.session.get(User, user.id).password_hash.startswith('pbkdf2:sha256:1000$')
+
+def test_login_holds_no_write_lock_while_checking_the_password(server_app, tmp_path, monkeypatch):
+    with server_app.app_context():
+        user = User.query.filter_by(email='sari@example.com').first()
+        user.password_hash = generate_password_hash('sari123', method='scrypt:1024:8:1')
+        db.session.commit()
+        user_id = user.id
+
+    # Another writer commits while the login request verifies the password
+    concurrent_writes = []
+    check_password = User.check_password
+    def check_password_while_another_writer_commits(self, password):
+        if not concurrent_writes:
+            other = sqlite3.connect(tmp_path / 'auth.db', timeout=0)
+            with other:
+                other.execute("UPDATE users SET bio = 'busy' WHERE id != ?", (self.id,))
+            other.close()
+            concurrent_writes.append(self.id)
+        return check_password(self, password)
+    monkeypatch.setattr(User, 'check_password', check_password_while_another_writer_commits)
+
+    response = server_app.test_client().post('/api/auth/login', json={'email': 'sari@example.com', 'password': 'sari123'})
+
+    assert response.status_code == 200
+    # The rehash began its own IMMEDIATE transaction instead of upgrading the stale read
+    with server_app.app_context():
+        assert db.session.get(User, user_id).password_hash.startswith('pbkdf2:sha256:1000$')
+
+def test_every_hashing_route_answers_busy_when_the_pool_is_full(app, monkeypatch):
+    admin = User.query.filter_by(role='admin').first()
+    token = create_access_token(identity=str(admin.id), additional_claims=auth_claims(admin))
+    client = app.test_client()
+    def full_pool(*args):
+        raise PasswordPoolBusy()
+    monkeypatch.setattr(password_service, '_run', full_pool)
+    new_user = {'username': 'dewi', 'email': 'dewi@example.com', 'password': 'dewi123'}
+
+    responses = [
+        client.post('/api/auth/register', json=new_user),
+        client.post('/api/auth/register-admin', json=dict(new_user, role='chef'),
+                    headers={'Authorization': f'Bearer {token}'})
+    ]
+
+    assert [(response.status_code, response.headers.get('Retry-After')) for response in responses] == [(503, '1')] * 2
+    assert User.query.filter_by(username='dewi').count() == 0
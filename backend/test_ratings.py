@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Checks for rating recipes.
+"""
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import func
+
+from app import db
+from app.models import User, Recipe, Rating
+from app.services.rating_service import RatingService
+
+def test_ratings_must_be_integers_from_one_to_five(app):
+    user = User.query.filter_by(role='user').first()
+    recipe = Recipe.query.filter_by(is_published=True).first()
+    headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+    client = app.test_client()
+
+    for rating in (True, 0, 6, 4.5, '5', None):
+        response = client.post(f'/api/recipes/{recipe.id}/ratings', json={'rating': rating}, headers=headers)
+        assert response.status_code == 400, rating
+
+    assert client.post(f'/api/recipes/{recipe.id}/ratings', json={'rating': 5}, headers=headers).status_code < 300
+    assert Rating.query.filter_by(user_id=user.id, recipe_id=recipe.id).one().rating == 5
+
+def stored_aggregates(recipe_id):
+    db.session.commit()
+    recipe = db.session.get(Recipe, recipe_id)
+    db.session.refresh(recipe)
+    return (recipe.rating_sum, recipe.rating_count, recipe.average_rating,
+            [getattr(recipe, f'rating_{star}_count') for star in range(1, 6)])
+
+def aggregates_from_ratings(recipe_id):
+    ratings = [rating for (rating,) in db.session.query(Rating.rating).filter_by(recipe_id=recipe_id)]
+    return (sum(ratings), len(ratings), sum(ratings) / len(ratings) if ratings else 0.0,
+            [ratings.count(star) for star in range(1, 6)])
+
+def test_aggregates_follow_rating_writes_and_rebuilds(app):
+    first, second = User.query.filter_by(role='user').first(), User.query.filter_by(role='chef').first()
+    recipe = Recipe.query.filter_by(is_published=True).first()
+    headers = {user.id: {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+               for user in (first, second)}
+    client = app.test_client()
+
+    def rate(user, rating):
+        response = client.post(f'/api/recipes/{recipe.id}/ratings', json={'rating': rating}, headers=headers[user.id])
+        assert response.status_code < 300
+        assert stored_aggregates(recipe.id) == aggregates_from_ratings(recipe.id)
+
+    rate(first, 2)          # created
+    rate(first, 5)          # updated
+    rate(second, 4)
+    assert client.post(f'/api/recipes/{recipe.id}/favorite', headers=headers[first.id]).status_code == 200
+    assert stored_aggregates(recipe.id) == aggregates_from_ratings(recipe.id)
+
+    rating = Rating.query.filter_by(user_id=second.id, recipe_id=recipe.id).one()
+    db.session.delete(rating)
+    RatingService.apply_rating_change(recipe.id, rating.rating, None)
+    assert stored_aggregates(recipe.id) == aggregates_from_ratings(recipe.id)
+
+    # Drifted aggregates, including on a recipe without ratings, are repaired
+    unrated = Recipe(title='Unrated', slug='unrated', instructions='Mix and serve', user_id=second.id,
+                     rating_sum=7, rating_count=2, rating_avg=3.5, rating_4_count=1)
+    db.session.add(unrated)
+    Recipe.query.update({Recipe.rating_sum: Recipe.rating_sum + 3, Recipe.rating_5_count: 9},
+                        synchronize_session=False)
+    db.session.commit()
+
+    assert RatingService.rebuild_aggregates() == db.session.query(func.count(func.distinct(Rating.recipe_id))).scalar()
+    for recipe_id, in db.session.query(Recipe.id):
+        assert stored_aggregates(recipe_id) == aggregates_from_ratings(recipe_id)
+    assert stored_aggregates(unrated.id) == (0, 0, 0.0, [0] * 5)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Checks for routing GET reads to a read-only SQLite snapshot of the primary.
+"""
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import db
+from app.models import User, Recipe
+from app.utils.read_routing import read_router
+
+@pytest.fixture
+def app_config(app_config, tmp_path):
+    return dict(app_config,
+                SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'primary.db'}",
+                DB_READ_SNAPSHOT=True,
+                DB_READ_SNAPSHOT_PATH=str(tmp_path / 'snapshot.db'),
+                DB_READ_SNAPSHOT_INTERVAL=0,
+                METRICS_ENABLED=False)
+
+@pytest.fixture
+def app(server_app):
+    # Requests push their own app context (and session), as in a server
+    return server_app
+
+def first_published_recipe_id(app):
+    with app.app_context():
+        return db.session.query(Recipe.id).filter_by(is_published=True).first()[0]
+
+def rename_on_primary(app, recipe_id, title):
+    with app.app_context():
+        db.session.get(Recipe, recipe_id).title = title
+        db.session.commit()
+
+def test_reads_come_from_the_snapshot_until_it_is_refreshed(app):
+    recipe_id = first_published_recipe_id(app)
+    assert read_router.refresh(force=True)
+    rename_on_primary(app, recipe_id, 'Renamed on the primary')
+    client = app.test_client()
+
+    stale = client.get(f'/api/recipes/{recipe_id}').get_json()['recipe']['title']
+    read_router.refresh(force=True)
+    fresh = client.get(f'/api/recipes/{recipe_id}').get_json()['recipe']['title']
+
+    assert stale != 'Renamed on the primary'
+    assert fresh == 'Renamed on the primary'
+
+def test_writers_read_their_own_writes_from_the_primary(app):
+    recipe_id = first_published_recipe_id(app)
+    with app.app_context():
+        user = User.query.filter_by(role='user').first()
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+    read_router.refresh(force=True)
+    client = app.test_client()
+
+    assert client.post(f'/api/recipes/{recipe_id}/favorite', headers=headers).status_code == 200
+    rename_on_primary(app, recipe_id, 'Renamed on the primary')
+
+    writer = client.get(f'/api/recipes/{recipe_id}', headers=headers).get_json()['recipe']['title']
+    other = client.get(f'/api/recipes/{recipe_id}').get_json()['recipe']['title']
+
+    assert writer == 'Renamed on the primary'
+    assert other != 'Renamed on the primary'
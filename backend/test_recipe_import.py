@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Checks for the NDJSON bulk recipe import and the streaming exports.
+"""
+
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import db
+from app.models import User, Recipe, Ingredient, Rating
+from app.services.auth_cache import auth_claims
+from app.services.data_export import export_rows, render
+from app.services.recipe_import import RecipeImporter
+from app.services.search_service import SearchService
+
+def admin_headers():
+    admin = User.query.filter_by(role='admin').first()
+    token = create_access_token(identity=str(admin.id), additional_claims=auth_claims(admin))
+    return {'Authorization': f'Bearer {token}', 'Content-Type': 'application/x-ndjson'}
+
+def recipe_line(title, **fields):
+    recipe = {
+        'title': title,
+        'description': f'{title} for the import test',
+        'instructions': '1. Cook\n2. Serve',
+        'is_published': True,
+        'categories': ['Indonesian'],
+        'ingredients': [{'name': 'Rice', 'quantity': 2}, {'name': 'Daun Salam', 'quantity': 3, 'unit': 'piece'}]
+    }
+    recipe.update(fields)
+    return json.dumps(recipe)
+
+def test_import_reports_bad_lines_and_keeps_the_rest(app):
+    body = '\n'.join([
+        recipe_line('Sayur Asem'),
+        '{"title": "broken"',
+        recipe_line('Sayur Asem', author='chef@cookeasy.com'),
+        recipe_line('Pecel', categories=['No Such Category']),
+        ''
+    ])
+
+    response = app.test_client().post('/api/admin/recipes/import?chunk_size=2',
+                                      data=gzip.compress(body.encode()),
+                                      headers={**admin_headers(), 'Content-Encoding': 'gzip'})
+
+    assert response.status_code == 200
+    report = response.get_json()
+    assert (report['imported'], report['failed']) == (2, 2)
+    assert [error['line'] for error in report['errors']] == [2, 4]
+
+    recipes = Recipe.query.filter(Recipe.title == 'Sayur Asem').order_by(Recipe.id).all()
+    assert [recipe.slug for recipe in recipes] == ['sayur-asem', 'sayur-asem-2']
+    assert recipes[1].user.email == 'chef@cookeasy.com'
+    assert [category.name for category in recipes[0].categories] == ['Indonesian']
+    assert Ingredient.query.filter_by(name='Daun Salam').count() == 1
+    assert recipes[0].recipe_ingredients.count() == 2
+
+    search = app.test_client().get('/api/recipes/search?q=asem').get_json()
+    assert search['pagination']['total'] == 2
+
+def test_recipe_export_streams_lines_the_import_accepts(app):
+    client = app.test_client()
+    headers = admin_headers()
+    client.post('/api/admin/recipes/import', data=recipe_line('Gado Gado'), headers=headers)
+
+    response = client.get('/api/admin/export/recipes?status=published', headers=headers)
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    lines = response.get_data(as_text=True).splitlines()
+    exported = [json.loads(line) for line in lines]
+    assert exported and all(recipe['is_published'] for recipe in exported)
+    gado_gado = next(recipe for recipe in exported if recipe['title'] == 'Gado Gado')
+    assert gado_gado['categories'] == ['Indonesian']
+    assert [item['name'] for item in gado_gado['ingredients']] == ['Rice', 'Daun Salam']
+
+    before = Recipe.query.count()
+    report = client.post('/api/admin/recipes/import', data='\n'.join(lines), headers=headers).get_json()
+    assert report['imported'] == len(exported)
+    assert Recipe.query.count() == before + len(exported)
+
+def test_user_export_as_gzipped_csv_leaves_out_password_hashes(app):
+    response = app.test_client().get('/api/admin/export/users?format=csv&gzip=1', headers=admin_headers())
+
+    assert response.headers['Content-Disposition'].endswith('.csv.gz"')
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.get_data()).decode())))
+    assert len(rows) == User.query.count()
+    assert 'password_hash' not in rows[0]
+    assert rows[0]['is_active'] == 'true'
+
+def add_dated_ratings():
+    """Replace the ratings with ones created on 1, 2 and 3 January, returning their ids by day"""
+    Rating.query.delete()
+    recipe = Recipe.query.filter_by(is_published=True).first()
+    ids = {}
+    for day, user in zip((1, 2, 3), User.query.order_by(User.id).limit(3)):
+        rating = Rating(user_id=user.id, recipe_id=recipe.id, rating=day, review=f'Day {day}, "quoted"',
+                        created_at=datetime(2026, 1, day))
+        db.session.add(rating)
+        db.session.flush()
+        ids[day] = rating.id
+    db.session.commit()
+    return ids
+
+@pytest.mark.parametrize('query, days', [
+    ('since=2026-01-02', [2, 3]),
+    ('until=2026-01-02', [1]),
+    ('since=2026-01-01T12:00&until=2026-01-03', [2])
+])
+def test_exports_filter_on_created_at(app, query, days):
+    ids = add_dated_ratings()
+
+    # Read each stream before the next request: it holds the request context open
+    ndjson = app.test_client().get(f'/api/admin/export/ratings?{query}', headers=admin_headers())
+    lines = [json.loads(line) for line in ndjson.get_data(as_text=True).splitlines()]
+    csv_export = app.test_client().get(f'/api/admin/export/ratings?format=csv&{query}', headers=admin_headers())
+    rows = list(csv.DictReader(io.StringIO(csv_export.get_data(as_text=True))))
+
+    assert ndjson.mimetype == 'application/x-ndjson' and csv_export.mimetype == 'text/csv'
+    assert [line['id'] for line in lines] == [int(row['id']) for row in rows] == [ids[day] for day in days]
+    assert [line['review'] for line in lines] == [row['review'] for row in rows] == [f'Day {day}, "quoted"' for day in days]
+    assert [line['created_at'] for line in lines] == [row['created_at'] for row in rows] == [
+        f'2026-01-0{day}T00:00:00' for day in days
+    ]
+
+def test_csv_export_has_one_header_over_many_batches(app):
+    add_dated_ratings()
+
+    text = ''.join(render(export_rows('ratings', batch_size=1), 'csv'))
+
+    rows = list(csv.reader(io.StringIO(text)))
+    assert rows[0][:2] == ['id', 'user_id']
+    assert len(rows) == Rating.query.count() + 1
+    assert [row for row in rows[1:] if row[0] == 'id'] == []
+
+def test_gzipped_ndjson_export_matches_the_plain_one(app):
+    client = app.test_client()
+    plain = client.get('/api/admin/export/recipes', headers=admin_headers()).get_data()
+    compressed = client.get('/api/admin/export/recipes?gzip=1', headers=admin_headers())
+
+    assert compressed.mimetype == 'application/gzip'
+    assert compressed.headers['Content-Disposition'].endswith('.ndjson.gz"')
+    assert gzip.decompress(compressed.get_data()) == plain
+    assert len(plain.splitlines()) == Recipe.query.count()
+
+@pytest.mark.parametrize('url, status', [
+    ('/api/admin/export/passwords', 404),
+    ('/api/admin/export/users?format=xml', 400),
+    ('/api/admin/export/users?since=last-week', 400)
+])
+def test_bad_export_requests_are_rejected(app, url, status):
+    assert app.test_client().get(url, headers=admin_headers()).status_code == status
+
+def test_search_highlights_escape_recipe_text(app):
+    title = 'Asem <script>alert(1)</script> & Co'
+    app.test_client().post('/api/admin/recipes/import', data=recipe_line(title), headers=admin_headers())
+
+    search = app.test_client().get('/api/recipes/search?q=script').get_json()
+    highlight = search['recipes'][0]['search_highlight']
+
+    assert highlight['title'] == 'Asem &lt;<mark>script</mark>&gt;alert(1)&lt;/<mark>script</mark>&gt; &amp; Co'
+    assert '<script>' not in highlight['snippet']
+
+def test_slugs_of_a_failed_chunk_are_free_for_its_retry(app, monkeypatch):
+    # The chunk fails in the database and is retried line by line
+    index_recipes = SearchService.index_recipes
+    def fail_for_chunks(recipe_ids):
+        if len(recipe_ids) > 1:
+            raise RuntimeError('index unavailable')
+        index_recipes(recipe_ids)
+    monkeypatch.setattr(SearchService, 'index_recipes', fail_for_chunks)
+    admin = User.query.filter_by(role='admin').first()
+
+    report = RecipeImporter(admin.id).run([recipe_line('Rawon'), recipe_line('Pecel Lele')])
+
+    assert report['imported'] == 2
+    assert sorted(recipe.slug for recipe in Recipe.query.filter(Recipe.title.in_(['Rawon', 'Pecel Lele']))) == \
+        ['pecel-lele', 'rawon']
+
+def test_import_takes_only_json_booleans_and_chef_authors(app):
+    client = app.test_client()
+    body = '\n'.join([recipe_line('Rawon', is_published='false'), recipe_line('Pecel Lele', is_published=False)])
+
+    report = client.post('/api/admin/recipes/import', data=body, headers=admin_headers()).get_json()
+
+    assert (report['imported'], report['failed']) == (1, 1)
+    assert report['errors'] == [{'line': 1, 'error': 'is_published must be true or false'}]
+    assert Recipe.query.filter_by(title='Pecel Lele').one().is_published is False
+
+    member = User.query.filter_by(role='user').first()
+    response = client.post(f'/api/admin/recipes/import?user_id={member.id}', data=body, headers=admin_headers())
+    assert response.status_code == 400
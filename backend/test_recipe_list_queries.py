@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Query-count checks for the recipe list endpoints.
+
+Runs against an in-memory database, so it does not touch instance/cookeasy.db.
+"""
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from app import db
+from app.models import User, Recipe, Rating
+from app.utils.sql_instrumentation import QueryBudgetExceeded
+
+def add_favorited_recipes(user, author, count):
+    """Create `count` published recipes from different authors, all favorited by `user`"""
+    for i in range(count):
+        recipe_author = author if i % 2 else user
+        recipe = Recipe(
+            title=f'Query Count Recipe {i}',
+            slug=f'query-count-recipe-{Recipe.query.count()}',
+            instructions='Mix and serve',
+            is_published=True,
+            user_id=recipe_author.id
+        )
+        db.session.add(recipe)
+        db.session.flush()
+        db.session.add(Rating(user_id=user.id, recipe_id=recipe.id, rating=5))
+    db.session.commit()
+
+def count_queries(client, url, headers):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+    assert response.status_code == 200
+    return len(statements), response.get_json()
+
+@pytest.mark.parametrize('url', [
+    '/api/recipes/favorites',
+    '/api/recipes/user/{user_id}',
+    '/api/auth/users/me/recipes',
+])
+def test_list_query_count_does_not_grow_with_page_size(app, url):
+    client = app.test_client()
+    user = User.query.filter_by(username='chef_budi').first()
+    author = User.query.filter_by(username='admin').first()
+    headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+    url = url.format(user_id=user.id)
+
+    add_favorited_recipes(user, author, 2)
+    small_count, small_body = count_queries(client, url, headers)
+
+    add_favorited_recipes(user, author, 10)
+    large_count, large_body = count_queries(client, url, headers)
+
+    assert len(large_body['recipes']) > len(small_body['recipes'])
+    assert large_count == small_count
+
+def test_favorites_page_marks_every_card_favorited(app):
+    client = app.test_client()
+    user = User.query.filter_by(username='chef_budi').first()
+    author = User.query.filter_by(username='admin').first()
+    headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+    add_favorited_recipes(user, author, 4)
+    _, body = count_queries(client, '/api/recipes/favorites', headers)
+
+    assert body['recipes']
+    assert all(recipe['is_favorited'] for recipe in body['recipes'])
+
+def test_list_responses_report_query_count(app):
+    client = app.test_client()
+
+    response = client.get('/api/recipes/featured')
+
+    assert response.status_code == 200
+    assert any('queries' in value for value in response.headers.getlist('Server-Timing'))
+
+def test_query_budget_fails_request_in_strict_mode(app):
+    client = app.test_client()
+    app.config['SQL_QUERY_BUDGET'] = 0
+
+    with pytest.raises(QueryBudgetExceeded):
+        client.get('/api/recipes/stats')
+
+def test_a_failing_statement_leaves_no_timing_state_on_the_connection(app):
+    connection = db.session.connection()
+    info = {key: repr(value) for key, value in connection.info.items()}
+    with pytest.raises(OperationalError):
+        connection.execute(text('SELECT * FROM no_such_table'))
+    db.session.rollback()
+
+    assert {key: repr(value) for key, value in db.session.connection().info.items()} == info
+    response = app.test_client().get('/api/recipes/featured')
+    database, total = [float(value.split('dur=')[1].split(';')[0]) for value in response.headers.getlist('Server-Timing')]
+    assert 0 < database <= total
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Checks for recipe slug allocation.
+"""
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import text
+
+from app import db
+from app.models import User
+from app.services import slug_service
+from app.services.auth_cache import auth_claims
+from app.services.slug_service import slugify
+
+RECIPE = {
+    'title': 'Soto Ayam Bétawi',
+    'description': 'Chicken soup with coconut milk',
+    'instructions': '1. Boil\n2. Serve'
+}
+
+@pytest.fixture
+def headers(app):
+    chef = User.query.filter_by(role='chef').first()
+    token = create_access_token(identity=str(chef.id), additional_claims=auth_claims(chef))
+    return {'Authorization': f'Bearer {token}'}
+
+def test_slugify_folds_accents_and_punctuation():
+    assert slugify('Soto Ayam Bétawi') == 'soto-ayam-betawi'
+    assert slugify('  Nasi Goreng, Spesial!!  ') == 'nasi-goreng-spesial'
+    assert slugify('Gado-Gado (Jakarta) ½ porsi') == 'gado-gado-jakarta-1-2-porsi'
+    assert slugify('?!') == 'recipe'
+
+def test_same_titles_get_increasing_suffixes(app, headers):
+    client = app.test_client()
+    create = lambda: client.post('/api/recipes', json=RECIPE, headers=headers).get_json()['recipe']
+
+    first, second = create(), create()
+    db.session.execute(text("UPDATE recipes SET slug = 'soto-ayam-betawi-7' WHERE id = :id"), {'id': second['id']})
+    db.session.commit()
+    third = create()
+
+    assert first['slug'] == 'soto-ayam-betawi'
+    assert second['slug'] == 'soto-ayam-betawi-2'
+    assert third['slug'] == 'soto-ayam-betawi-8'
+
+    # Retitling to something that maps to the same slug keeps it
+    renamed = client.put(f"/api/recipes/{third['id']}", json={'title': 'Soto ayam betawi'}, headers=headers)
+    assert renamed.get_json()['recipe']['slug'] == 'soto-ayam-betawi-8'
+
+def test_slug_taken_by_a_concurrent_save_is_retried(app, headers, monkeypatch):
+    client = app.test_client()
+    client.post('/api/recipes', json=RECIPE, headers=headers)
+
+    # Simulate another worker taking the slug between our lookup and our insert
+    next_free_slug = slug_service.next_free_slug
+    answers = iter(['soto-ayam-betawi'])
+    monkeypatch.setattr(slug_service, 'next_free_slug',
+                        lambda base, exclude_id=None: next(answers, None) or next_free_slug(base, exclude_id))
+
+    response = client.post('/api/recipes', json=RECIPE, headers=headers)
+    assert response.status_code == 201
+    assert response.get_json()['recipe']['slug'] == 'soto-ayam-betawi-2'
+
+def test_suffix_lookup_is_an_index_range_scan(app):
+    plan = db.session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT slug FROM recipes WHERE slug >= :base AND slug < :base || '.'"
+    ), {'base': 'soto'}).fetchall()
+    assert 'USING COVERING INDEX' in plan[0][-1]
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Checks for recipe updates that only write what changed.
+"""
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import db
+from app.models import User, Recipe, Category, TableVersion
+from app.services import version_service
+from app.services.auth_cache import auth_claims
+from app.services.view_counter import view_counter
+
+RECIPE = {
+    'title': 'Sayur Lodeh',
+    'description': 'Vegetables in coconut milk',
+    'instructions': '1. Boil\n2. Serve',
+    'ingredients': [
+        {'name': 'Garlic', 'quantity': 2},
+        {'name': 'Onion', 'quantity': 1},
+        {'name': 'Salt', 'quantity': 1, 'notes': 'to taste'}
+    ]
+}
+
+@pytest.fixture
+def recipe(app):
+    chef = User.query.filter_by(role='chef').first()
+    token = create_access_token(identity=str(chef.id), additional_claims=auth_claims(chef))
+    headers = {'Authorization': f'Bearer {token}'}
+    category_ids = [category.id for category in Category.query.order_by(Category.id).limit(2)]
+    body = dict(RECIPE, category_ids=category_ids)
+    created = app.test_client().post('/api/recipes', json=body, headers=headers).get_json()['recipe']
+    return created['id'], body, headers
+
+def writes_during(action):
+    statements = []
+    listener = lambda *args: statements.append(args[2].strip())
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        response = action()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    writes = [statement.split(' SET ')[0].split(' (')[0] for statement in statements
+              if statement.split()[0] in ('INSERT', 'UPDATE', 'DELETE')]
+    return response, [write for write in writes if 'table_versions' not in write]
+
+def test_editing_one_field_is_one_update(app, recipe):
+    recipe_id, body, headers = recipe
+    client = app.test_client()
+
+    unchanged, unchanged_writes = writes_during(lambda: client.put(f'/api/recipes/{recipe_id}', json=body, headers=headers))
+    edited, edited_writes = writes_during(lambda: client.put(
+        f'/api/recipes/{recipe_id}', json=dict(body, servings=6), headers=headers
+    ))
+
+    assert unchanged.status_code == edited.status_code == 200
+    assert unchanged_writes == []
+    assert edited_writes == ['UPDATE recipes']
+
+def test_ingredient_and_category_changes_are_diffed(app, recipe):
+    recipe_id, body, headers = recipe
+    ingredients = [
+        {'name': 'Onion', 'quantity': 1},
+        {'name': 'Garlic', 'quantity': 3},
+        {'name': 'Coconut Milk', 'quantity': 200, 'unit': 'ml'}
+    ]
+
+    response, writes = writes_during(lambda: app.test_client().put(
+        f'/api/recipes/{recipe_id}', json=dict(body, ingredients=ingredients, category_ids=body['category_ids'][:1]),
+        headers=headers
+    ))
+
+    assert response.status_code == 200
+    saved = response.get_json()['recipe']
+    assert [(line['ingredient_name'], line['quantity']) for line in saved['ingredients']] == \
+        [('Onion', 1.0), ('Garlic', 3.0), ('Coconut Milk', 200.0)]
+    assert [category['id'] for category in saved['categories']] == body['category_ids'][:1]
+    assert 'DELETE FROM recipe_ingredients WHERE recipe_ingredients.recipe_id = ?' not in writes
+    assert writes.count('DELETE FROM recipe_ingredients WHERE recipe_ingredients.id = ?') == 1
+    assert writes.count('INSERT INTO recipe_ingredients') == 1
+
+def test_merge_patch_needs_current_version(app, recipe):
+    recipe_id, _, headers = recipe
+    client = app.test_client()
+    version = client.get(f'/api/recipes/{recipe_id}/edit', headers=headers).get_json()['recipe']['version']
+
+    assert client.patch(f'/api/recipes/{recipe_id}', json={'servings': 6}, headers=headers).status_code == 428
+
+    patched, writes = writes_during(lambda: client.patch(
+        f'/api/recipes/{recipe_id}', json={'servings': 6, 'nutrition': {'protein': 12}},
+        headers=dict(headers, **{'If-Match': f'"{version}"', 'Content-Type': 'application/merge-patch+json'})
+    ))
+    assert patched.status_code == 204
+    assert patched.headers['ETag'] == f'"{version + 1}"'
+    assert writes == ['UPDATE recipes']
+
+    stale = client.patch(f'/api/recipes/{recipe_id}', json={'nutrition': None},
+                         headers=dict(headers, **{'If-Match': f'"{version}"'}))
+    assert stale.status_code == 412
+    assert stale.headers['ETag'] == f'"{version + 1}"'
+
+    cleared = client.patch(f'/api/recipes/{recipe_id}', json={'description': None, 'nutrition': None},
+                           headers=dict(headers, **{'If-Match': stale.headers['ETag']}))
+    assert cleared.status_code == 204
+    saved = client.get(f'/api/recipes/{recipe_id}/edit', headers=headers).get_json()['recipe']
+    assert saved['servings'] == 6 and saved['description'] is None
+    assert saved['version'] == version + 2
+
+def test_recipe_etag_is_also_the_patch_precondition(app, recipe):
+    recipe_id, _, headers = recipe
+    client = app.test_client()
+    edit_etag = client.get(f'/api/recipes/{recipe_id}/edit', headers=headers).headers['ETag']
+    published = client.patch(f'/api/recipes/{recipe_id}', json={'is_published': True},
+                             headers=dict(headers, **{'If-Match': edit_etag}))
+    assert published.status_code == 204
+
+    shown = client.get(f'/api/recipes/{recipe_id}', headers=headers)
+    assert shown.headers['ETag'].startswith(published.headers['ETag'][:-1] + '.')
+    assert client.get(f'/api/recipes/{recipe_id}', headers=dict(headers, **{'If-None-Match': shown.headers['ETag']})).status_code == 304
+
+    # The detail ETag carries the version, so an editor may send it back as If-Match
+    patched = client.patch(f'/api/recipes/{recipe_id}', json={'servings': 8},
+                           headers=dict(headers, **{'If-Match': shown.headers['ETag']}))
+    assert patched.status_code == 204
+    stale = client.patch(f'/api/recipes/{recipe_id}', json={'servings': 9},
+                         headers=dict(headers, **{'If-Match': shown.headers['ETag']}))
+    assert stale.status_code == 412
+
+def test_revalidating_a_hidden_recipe_is_not_found(app, recipe):
+    recipe_id, _, headers = recipe
+    client = app.test_client()
+
+    # If-None-Match: * matches any current representation, so only the row decides
+    for hidden in (recipe_id, recipe_id + 1000):
+        response = client.get(f'/api/recipes/{hidden}', headers={'If-None-Match': '*'})
+        assert response.status_code == 404
+        assert view_counter.pending(hidden) == 0
+
+@pytest.mark.parametrize('upsert', [True, False], ids=['upsert', 'update-then-insert'])
+def test_tables_are_bumped_once_per_commit(app, recipe, monkeypatch, upsert):
+    if not upsert:
+        monkeypatch.setattr(version_service, 'UPSERT_INSERTS', {})
+    recipe_id = recipe[0]
+    db.session.commit()
+    before = {name: version for name, (version, _) in TableVersion.get_versions(['recipes', 'categories']).items()}
+
+    def edit():
+        db.session.get(Recipe, recipe_id).servings = 7
+        db.session.flush()
+        db.session.get(Recipe, recipe_id).servings = 8
+        db.session.flush()
+        Recipe.query.filter_by(id=recipe_id).update({'cook_time': 40})
+        db.session.add(Category(name='Sambal', slug='sambal'))
+        db.session.commit()
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        edit()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    after = {name: version for name, (version, _) in TableVersion.get_versions(['recipes', 'categories']).items()}
+    version_writes = [statement.split(' SET ')[0].split(' (')[0] for statement in statements
+                      if 'table_versions' in statement.split(' SET ')[0] and not statement.startswith('SELECT')]
+
+    assert after == {'recipes': before['recipes'] + 1, 'categories': before['categories'] + 1}
+    # Both tables in one statement, once, for two flushes and a bulk update
+    assert version_writes == (['INSERT INTO table_versions'] if upsert else ['UPDATE table_versions'])
+
+    Recipe.query.filter_by(id=recipe_id).update({'cook_time': 50})
+    db.session.rollback()
+    db.session.commit()
+    assert TableVersion.get_versions(['recipes'])['recipes'][0] == after['recipes']
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Checks for the server-side response cache and its tag-based eviction.
+"""
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app.models import User, Recipe, Category
+from app.services.auth_cache import auth_claims
+from app.utils.response_cache import MemoryCacheBackend, SQLiteCacheBackend, response_cache
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def app_config(request, app_config, tmp_path):
+    return dict(app_config, RESPONSE_CACHE_BACKEND=request.param,
+                RESPONSE_CACHE_PATH=str(tmp_path / 'response_cache.db'))
+
+def headers_for(user):
+    token = create_access_token(identity=str(user.id), additional_claims=auth_claims(user))
+    return {'Authorization': f'Bearer {token}'}
+
+def fetch(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.headers['X-Cache'], response.get_json()
+
+def test_recipe_writes_evict_the_lists_showing_them(app):
+    client = app.test_client()
+    chef = User.query.filter_by(role='chef').first()
+    member = User.query.filter_by(role='user').first()
+    recipe = Recipe.query.filter_by(user_id=chef.id, is_published=True).first()
+    url = f'/api/recipes/user/{chef.id}'
+
+    assert fetch(client, url)[0] == 'MISS'
+    assert fetch(client, url)[0] == 'HIT'
+
+    # Another user's write leaves the entry alone
+    assert client.put('/api/auth/profile', json={'bio': 'Home cook'}, headers=headers_for(member)).status_code == 200
+    assert fetch(client, url)[0] == 'HIT'
+
+    assert client.put(f'/api/recipes/{recipe.id}', json={'title': 'Rendang Padang'},
+                      headers=headers_for(chef)).status_code == 200
+    cache, body = fetch(client, url)
+    assert cache == 'MISS'
+    assert 'Rendang Padang' in [listed['title'] for listed in body['recipes']]
+    assert response_cache.stats()['evictions'] >= 1
+
+def test_category_writes_evict_the_category_list(app):
+    client = app.test_client()
+    admin = User.query.filter_by(role='admin').first()
+    category = Category.query.filter_by(is_active=True).first()
+
+    assert fetch(client, '/api/recipes/categories')[0] == 'MISS'
+    assert fetch(client, '/api/recipes/categories')[0] == 'HIT'
+
+    assert client.put(f'/api/admin/categories/{category.id}', json={'name': 'Sambal'},
+                      headers=headers_for(admin)).status_code == 200
+    cache, body = fetch(client, '/api/recipes/categories')
+    assert cache == 'MISS'
+    assert 'Sambal' in [listed['name'] for listed in body['categories']]
+
+@pytest.fixture
+def backend(request, tmp_path):
+    if request.param == 'sqlite':
+        return SQLiteCacheBackend(str(tmp_path / 'backend.db'), max_entries=2)
+    return MemoryCacheBackend(max_entries=2)
+
+@pytest.mark.parametrize('backend', ['memory', 'sqlite'], indirect=True)
+def test_backends_evict_by_tag_and_stay_bounded(backend):
+    backend.set('a', ('application/json', b'1'), ['recipe:1', 'recipe-list'], 60)
+    backend.set('b', ('application/json', b'2'), ['recipe:2', 'recipe-list'], 60)
+
+    assert backend.evict_tags(['recipe:1']) == 1
+    assert backend.get('a') is None
+    assert backend.get('b') == ('application/json', b'2')
+
+    backend.set('c', ('application/json', b'3'), ['recipe:3'], 60)
+    backend.set('d', ('application/json', b'4'), ['recipe:4'], 60)
+    # The least recently used entry made room
+    assert len(backend) == 2
+    assert backend.get('b') is None
+    assert backend.evict_tags(['recipe-list']) == 0
+
+    backend.set('e', ('application/json', b'5'), ['recipe:5'], -1)
+    assert backend.get('e') is None
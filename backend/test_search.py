@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Checks for full-text recipe search over the FTS5 index.
+"""
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app.models import User
+from app.services.auth_cache import auth_claims
+from app.utils.pagination import MAX_CURSOR_PAGE_SIZE
+
+@pytest.fixture
+def chef(app):
+    chef = User.query.filter_by(role='chef').first()
+    token = create_access_token(identity=str(chef.id), additional_claims=auth_claims(chef))
+    return {'Authorization': f'Bearer {token}'}
+
+def add_recipe(client, headers, title, description='A home dish', instructions='Mix and serve', ingredients=('Water',)):
+    response = client.post('/api/recipes', json={
+        'title': title,
+        'description': description,
+        'instructions': instructions,
+        'ingredients': [{'name': name, 'quantity': 1} for name in ingredients],
+        'is_published': True
+    }, headers=headers)
+    assert response.status_code == 201
+    return response.get_json()['recipe']['id']
+
+def search(client, query, **params):
+    response = client.get('/api/recipes/search', query_string=dict(params, q=query))
+    assert response.status_code == 200
+    return response.get_json()
+
+def test_title_matches_rank_above_other_fields(app, chef):
+    client = app.test_client()
+    in_instructions = add_recipe(client, chef, 'Nasi Uduk', instructions='Serve with kemangi leaves')
+    in_title = add_recipe(client, chef, 'Pepes Kemangi')
+    in_ingredients = add_recipe(client, chef, 'Tumis Kangkung', ingredients=('Kemangi', 'Garlic'))
+
+    body = search(client, 'kemangi')
+
+    assert [recipe['id'] for recipe in body['recipes']] == [in_title, in_ingredients, in_instructions]
+    assert body['recipes'][0]['search_highlight']['title'] == 'Pepes <mark>Kemangi</mark>'
+    # The last word matches as a prefix
+    assert [recipe['id'] for recipe in search(client, 'pepes kema')['recipes']] == [in_title]
+
+@pytest.mark.parametrize('query', ['"kemangi', '(kemangi', 'kemangi"*', '^kemangi', "kemangi' --", 'kemangi:'])
+def test_search_syntax_in_queries_is_inert(app, chef, query):
+    client = app.test_client()
+    recipe_id = add_recipe(client, chef, 'Pepes Kemangi')
+
+    assert [recipe['id'] for recipe in search(client, query)['recipes']] == [recipe_id]
+    # Operators are plain words that every match must contain
+    assert search(client, f'{query} OR tahu')['total'] == 0
+    assert search(client, f'NOT {query}')['total'] == 0
+
+def test_index_follows_updates_and_deletes(app, chef):
+    client = app.test_client()
+    recipe_id = add_recipe(client, chef, 'Pepes Kemangi', ingredients=('Tempeh',))
+
+    response = client.put(f'/api/recipes/{recipe_id}', json={
+        'title': 'Pepes Tahu',
+        'ingredients': [{'name': 'Tofu', 'quantity': 1}]
+    }, headers=chef)
+    assert response.status_code == 200
+    assert search(client, 'kemangi')['total'] == 0
+    assert search(client, 'tempeh')['total'] == 0
+    assert [recipe['id'] for recipe in search(client, 'tahu')['recipes']] == [recipe_id]
+    assert [recipe['id'] for recipe in search(client, 'tofu')['recipes']] == [recipe_id]
+
+    assert client.delete(f'/api/recipes/{recipe_id}', headers=chef).status_code == 200
+    assert search(client, 'tahu')['total'] == 0
+
+@pytest.mark.parametrize('requested, used', [('1000', MAX_CURSOR_PAGE_SIZE), ('0', 1)])
+def test_search_page_size_is_clamped_and_echoed(app, chef, requested, used):
+    client = app.test_client()
+    add_recipe(client, chef, 'Pepes Kemangi')
+
+    for params in ({'q': 'kemangi'}, {'difficulty': 'Medium'}):
+        body = client.get('/api/recipes/search', query_string=dict(params, per_page=requested)).get_json()
+        assert body['pagination']['per_page'] == used
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Checks for the precomputed similar-recipes lists.
+"""
+
+import json
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app import db
+from app.models import User, Recipe, recipe_similar
+from app.services.recipe_import import RecipeImporter
+from app.services.similar_service import SimilarRecipeService
+
+def recipe(title, *ingredients):
+    return json.dumps({
+        'title': title,
+        'description': title,
+        'instructions': '1. Cook',
+        'is_published': True,
+        'ingredients': [{'name': name, 'quantity': 1} for name in ingredients]
+    })
+
+@pytest.fixture
+def app_config(app_config, tmp_path):
+    # A file database: the job works on its own connection, which an in-memory one would share
+    return dict(app_config, SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'similar.db'}")
+
+@pytest.fixture(autouse=True)
+def recipes(app):
+    chef = User.query.filter_by(role='chef').first()
+    RecipeImporter(chef.id).run([
+        recipe('Soto Ayam', 'Chicken', 'Turmeric', 'Lemongrass', 'Garlic'),
+        recipe('Opor Ayam', 'Chicken', 'Coconut Milk', 'Lemongrass', 'Garlic'),
+        recipe('Es Teler', 'Avocado', 'Jackfruit', 'Coconut Milk'),
+        recipe('Kolak', 'Banana', 'Palm Sugar', 'Coconut Milk')
+    ])
+
+def ids(*titles):
+    return [Recipe.query.filter_by(title=title).one().id for title in titles]
+
+def test_similar_recipes_are_ranked_by_shared_ingredients(app):
+    report = SimilarRecipeService.refresh()
+    soto, opor, es_teler, kolak = ids('Soto Ayam', 'Opor Ayam', 'Es Teler', 'Kolak')
+
+    response = app.test_client().get(f'/api/recipes/{soto}/similar')
+    similar = [item['id'] for item in response.get_json()['recipes']]
+
+    assert report['recomputed'] == report['recipes']
+    assert similar[0] == opor
+    assert es_teler not in similar and kolak not in similar
+    assert [item['id'] for item in app.test_client().get(f'/api/recipes/{kolak}/similar').get_json()['recipes']][0] == es_teler
+
+def test_similar_lookup_reads_one_primary_key_range(app):
+    SimilarRecipeService.refresh()
+    soto, = ids('Soto Ayam')
+    statements = []
+    listener = lambda *args: statements.append((args[2], args[3]))
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        app.test_client().get(f'/api/recipes/{soto}/similar')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    lookup, params = next((statement, params) for statement, params in statements
+                          if statement.startswith('SELECT recipes.id') and 'recipe_similar' in statement)
+    plan = [row[-1] for row in db.session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + lookup, params)]
+
+    # The primary key index already returns the list in rank order
+    assert plan[0].startswith('SEARCH recipe_similar USING INDEX') and plan[0].endswith('(recipe_id=?)')
+    assert not any(step.startswith('SCAN') or 'TEMP B-TREE' in step for step in plan)
+
+def test_only_changed_recipes_are_recomputed(app):
+    SimilarRecipeService.refresh()
+    assert SimilarRecipeService.refresh()['recomputed'] == 0
+
+    chef = User.query.filter_by(role='chef').first()
+    RecipeImporter(chef.id).run([recipe('Gulai Ayam', 'Chicken', 'Turmeric', 'Coconut Milk')])
+    assert SimilarRecipeService.refresh()['recomputed'] == 1
+    soto, opor, gulai = ids('Soto Ayam', 'Opor Ayam', 'Gulai Ayam')
+    assert SimilarRecipeService.similar_to(gulai)[0].id == soto
+
+    # A deleted recipe leaves the lists it appeared in at once; they are recomputed next run
+    SimilarRecipeService.remove_recipe(opor)
+    db.session.delete(db.session.get(Recipe, opor))
+    db.session.commit()
+
+    assert opor not in [item.id for item in SimilarRecipeService.similar_to(soto)]
+    assert db.session.execute(select(func.count()).where(recipe_similar.c.similar_recipe_id == opor)).scalar() == 0
+    # End the read transaction, whose snapshot would not show the job's writes
+    db.session.commit()
+    assert SimilarRecipeService.refresh()['recomputed'] == 4
+    assert SimilarRecipeService.similar_to(soto)[0].id == gulai
+
+def test_similar_recipes_of_a_hidden_recipe_are_not_found(app):
+    SimilarRecipeService.refresh()
+    soto, = ids('Soto Ayam')
+    client = app.test_client()
+    assert client.get('/api/recipes/999999/similar').status_code == 404
+
+    db.session.get(Recipe, soto).is_published = False
+    db.session.commit()
+    assert client.get(f'/api/recipes/{soto}/similar').status_code == 404
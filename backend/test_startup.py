@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Checks for app creation (no database I/O) and the database engine setup.
+"""
+
+import sqlite3
+
+from sqlalchemy.exc import OperationalError
+
+from app import create_app, db
+from app.cli import bootstrap_database
+from app.models import User
+from app.utils.db_engine import run_write_transaction
+
+def test_create_app_does_not_touch_the_database(tmp_path):
+    database = tmp_path / 'startup.db'
+
+    create_app(test_config={'SQLALCHEMY_DATABASE_URI': f'sqlite:///{database}'})
+
+    assert not database.exists()
+
+def test_bootstrap_creates_schema_and_seeds_once(tmp_path):
+    app = create_app(test_config={'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'bootstrap.db'}"})
+
+    with app.app_context():
+        bootstrap_database(seed=True)
+        users = User.query.count()
+        bootstrap_database(seed=True)
+
+        assert users > 0
+        assert User.query.count() == users
+        db.session.remove()
+
+def test_sqlite_connections_use_the_tuning_pragmas(tmp_path):
+    app = create_app(test_config={'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'tuned.db'}"})
+
+    with app.app_context():
+        with db.engine.connect() as conn:
+            assert conn.exec_driver_sql('PRAGMA journal_mode').scalar() == 'wal'
+            assert conn.exec_driver_sql('PRAGMA synchronous').scalar() == 1  # NORMAL
+            assert conn.exec_driver_sql('PRAGMA busy_timeout').scalar() == app.config['SQLITE_PRAGMAS']['busy_timeout']
+
+def test_write_transactions_lock_at_begin_and_are_retried(tmp_path):
+    database = tmp_path / 'unit.db'
+    app = create_app(test_config={'SQLALCHEMY_DATABASE_URI': f'sqlite:///{database}', 'DB_LOCK_RETRY_BACKOFF': 0})
+    attempts = []
+
+    def rename():
+        user = User.query.filter_by(role='user').first()
+        # The unit began IMMEDIATE, so even after only reading it holds the write lock
+        other = sqlite3.connect(database, timeout=0)
+        try:
+            other.execute('BEGIN IMMEDIATE')
+            attempts.append('unlocked')
+        except sqlite3.OperationalError:
+            attempts.append('locked')
+        finally:
+            other.close()
+        if len(attempts) == 1:
+            raise OperationalError('UPDATE users', {}, sqlite3.OperationalError('database is locked'))
+        user.full_name = 'Renamed'
+        db.session.commit()
+        return user.id
+
+    with app.app_context():
+        bootstrap_database(seed=True)
+        user_id = run_write_transaction(db.session, rename)
+
+        assert attempts == ['locked', 'locked']
+        assert db.session.get(User, user_id).full_name == 'Renamed'
+        db.session.remove()
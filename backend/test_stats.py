@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Checks for the incrementally maintained platform statistics.
+"""
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app.models import User
+from app.services.auth_cache import auth_claims
+from app.services.stats_service import StatsSnapshot, stats_snapshot
+
+@pytest.fixture
+def app_config(app_config):
+    # Only committed deltas move the snapshot during a test
+    return dict(app_config, STATS_REFRESH_INTERVAL=3600)
+
+def headers_for(role):
+    user = User.query.filter_by(role=role).first()
+    token = create_access_token(identity=str(user.id), additional_claims=auth_claims(user))
+    return {'Authorization': f'Bearer {token}'}
+
+def snapshot_matching_a_recompute():
+    counters, _, as_of = stats_snapshot.get()
+    fresh = StatsSnapshot()
+    fresh.recompute()
+
+    assert counters == fresh._counters
+    return counters, as_of
+
+def test_deltas_match_a_fresh_aggregate(app):
+    client = app.test_client()
+    chef, member = headers_for('chef'), headers_for('user')
+    start, as_of = snapshot_matching_a_recompute()
+
+    def changes():
+        counters, snapshot_as_of = snapshot_matching_a_recompute()
+        # Still the snapshot taken at the start: the deltas did the work
+        assert snapshot_as_of == as_of
+        return dict(counters - start)
+
+    response = client.post('/api/recipes', json={
+        'title': 'Soto Betawi',
+        'description': 'Beef soup with coconut milk',
+        'instructions': '1. Simmer\n2. Serve',
+        'ingredients': [{'name': 'Beef', 'quantity': 1}],
+        'is_published': False
+    }, headers=chef)
+    recipe_id = response.get_json()['recipe']['id']
+    assert changes() == {'recipes_total': 1}
+
+    assert client.put(f'/api/recipes/{recipe_id}', json={'is_published': True, 'is_featured': True},
+                      headers=chef).status_code == 200
+    assert changes() == {'recipes_total': 1, 'recipes_published': 1, 'recipes_featured': 1}
+
+    assert client.post(f'/api/recipes/{recipe_id}/ratings', json={'rating': 4}, headers=member).status_code == 200
+    assert client.post(f'/api/recipes/{recipe_id}/ratings', json={'rating': 2}, headers=member).status_code == 200
+    assert changes() == {'recipes_total': 1, 'recipes_published': 1, 'recipes_featured': 1,
+                         'ratings_total': 1, 'ratings_sum': 2}
+
+    assert client.post('/api/auth/register', json={
+        'username': 'dewi', 'email': 'dewi@example.com', 'password': 'dewi123'
+    }).status_code == 201
+    assert changes() == {'recipes_total': 1, 'recipes_published': 1, 'recipes_featured': 1,
+                         'ratings_total': 1, 'ratings_sum': 2,
+                         'users_total': 1, 'users_active': 1, 'users_recent': 1, 'role:user': 1}
+
+    assert client.delete(f'/api/recipes/{recipe_id}', headers=chef).status_code == 200
+    assert changes() == {'users_total': 1, 'users_active': 1, 'users_recent': 1, 'role:user': 1}
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Checks for the write-behind recipe view counter.
+"""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models import Recipe, TableVersion
+from app.services import view_counter as view_counter_module
+from app.services.view_counter import view_counter
+
+@pytest.fixture
+def app_config(app_config, tmp_path):
+    # A file database: the flush writes through its own connection, as in a server
+    return dict(app_config, SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'views.db'}")
+
+def stored_view_count(recipe_id):
+    db.session.commit()
+    return db.session.query(Recipe.view_count).filter_by(id=recipe_id).scalar() or 0
+
+def test_views_are_buffered_then_written(app):
+    recipe_id = Recipe.query.filter_by(is_published=True).first().id
+    view_counter.flush()
+    before = stored_view_count(recipe_id)
+    version = TableVersion.get_versions(['recipe_views'])['recipe_views'][0]
+    client = app.test_client()
+
+    # Only this thread's statements; the background flush may run at any time
+    request_writes = []
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if threading.current_thread() is threading.main_thread() and statement.startswith('UPDATE recipes'):
+            request_writes.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        shown = [client.get(f'/api/recipes/{recipe_id}').get_json()['recipe']['view_count'] for _ in range(3)]
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+    assert request_writes == []
+    # Each reader sees their own view, written or not
+    assert shown == [before + 1, before + 2, before + 3]
+    assert stored_view_count(recipe_id) + view_counter.pending(recipe_id) == before + 3
+
+    view_counter.flush()
+
+    assert view_counter.pending(recipe_id) == view_counter.depth == 0
+    assert stored_view_count(recipe_id) == before + 3
+    # View-ordered responses revalidate
+    assert TableVersion.get_versions(['recipe_views'])['recipe_views'][0] > version
+
+@pytest.mark.app_config(VIEW_COUNT_FLUSH_THRESHOLD=2)
+def test_reaching_the_threshold_wakes_the_flush(app):
+    recipe_id = Recipe.query.filter_by(is_published=True).first().id
+    view_counter.flush()
+    before = stored_view_count(recipe_id)
+
+    view_counter.record(recipe_id)
+    view_counter.record(recipe_id)
+
+    deadline = time.monotonic() + 2
+    while view_counter.depth and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert view_counter.depth == 0
+    # The flush commits from its own session; wait for the row rather than the buffer
+    while stored_view_count(recipe_id) != before + 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stored_view_count(recipe_id) == before + 2
+
+def test_a_failed_flush_keeps_the_views(app, monkeypatch):
+    recipe_id = Recipe.query.filter_by(is_published=True).first().id
+    view_counter.flush()
+    before = stored_view_count(recipe_id)
+    def unavailable(connection, table_names):
+        raise RuntimeError('database unavailable')
+
+    with monkeypatch.context() as patched:
+        patched.setattr(view_counter_module, 'bump_versions', unavailable)
+        view_counter.record(recipe_id)
+        assert view_counter.flush() == 0
+        assert view_counter.pending(recipe_id) == 1
+        assert stored_view_count(recipe_id) == before
+
+    assert view_counter.flush() == 1
+    assert stored_view_count(recipe_id) == before + 1
@@ -32,6 +32,8 @@ export const recipesAPI = {
 
     getPopular: (limit = 6) => apiClient.get(`/recipes/popular?limit=${limit}`),
 
+    getSimilar: (id, limit = 6) => apiClient.get(`/recipes/${id}/similar?limit=${limit}`),
+
     search: (params = {}) => {
         const queryParams = new URLSearchParams();
 
@@ -46,6 +48,13 @@ export const recipesAPI = {
 
     update: (id, data) => apiClient.put(`/recipes/${id}`, data),
 
+    // Partial save (JSON merge patch). Sends If-Match: "<version>" with the recipe's
+    // `version` field; the ETag of getById or GET /recipes/:id/edit (which starts with the version)
+    // works too. Resolves with the new version in the ETag header.
+    patch: (id, changes, version) => apiClient.patch(`/recipes/${id}`, changes, {
+        headers: { 'Content-Type': 'application/merge-patch+json', 'If-Match': `"${version}"` },
+    }),
+
     delete: (id) => apiClient.delete(`/recipes/${id}`),
 
     // Favorites